@@ -1,13 +1,16 @@
 import sys
+import atexit
 import pygame
 import json
+import uuid
 from pathlib import Path
 from typing import List
-from src.models.CityMap import CityMap
 from src.models.ClimaData import ClimaData
 from src.game.button import Button
 from src.game.package_notifier import NotificadorPedidos
 from src.api.ManejadorAPI import ManejadorAPI
+from src.api.cache_confiable import CacheConfiable
+from src.models.MapaCompilado import MapaCompilado
 from src.game.events import Events
 from src.game.save import Save
 from src.game.inventory import InventarioPedidos  # Importar InventarioPedidos
@@ -32,7 +35,13 @@ from src.game.reputation import Reputation
 from src.game.player import Player
 from src.game.weather_system import SistemaClima
 from src.game.undo import UndoSystem
-from src.game.game_state_manager import GameStateManager
+from src.game.move_journal import MoveJournal
+from src.game.game_state_manager import GameStateManager, GameState
+from src.game.profiler import FrameProfiler
+from src.game.autosave import AutoSaveService
+from src.game.scoreboard import ScoreBoard
+from src.game.sqlite_store import SQLiteStore
+from src.game.score_events import ScoreEventLog
 
 # Inicializar pygame antes de usar cualquier función de pygame
 pygame.init()
@@ -41,6 +50,25 @@ BG = pygame.image.load("./sprites/Background.png")
 BASE_DIR = Path(__file__).resolve().parent
 CACHE_DIR = BASE_DIR / "cache"
 SPRITES_DIR = BASE_DIR / "sprites"
+JOURNAL_DIR = BASE_DIR / "src" / "game" / "saves" / "journal"
+
+# Backend opcional: con True las partidas, puntajes y eventos de score se guardan
+# en SQLite (saves/courier.db) en lugar de archivos sueltos
+USAR_SQLITE = False
+if USAR_SQLITE:
+    SQLiteStore.activar(BASE_DIR / "src" / "game" / "saves" / "courier.db")
+
+# Perfilador de frames: overlay con F3 y CSV de percentiles al salir
+PROFILER = FrameProfiler(out_dir=BASE_DIR / "profiling")
+atexit.register(PROFILER.exportar_csv)
+
+# Autosave incremental en segundo plano: un delta cada 5 s de juego y un
+# checkpoint completo cada 12 deltas (conserva los 3 autosaves más recientes)
+AUTOSAVE = AutoSaveService(intervalo=5, conservar=3, checkpoint_cada=12)
+atexit.register(AUTOSAVE.detener)
+
+# Bitácoras de eventos de score: se conservan las de las últimas partidas
+ScoreEventLog.limpiar_antiguas(BASE_DIR / "src" / "game" / "saves" / "events")
 
 def get_font(size): # Returns Press-Start-2P in the desired size
     return pygame.font.Font("./sprites/font.ttf", size)
@@ -123,20 +151,12 @@ def select_save_file():
     """Pantalla para seleccionar una partida guardada"""
     pygame.display.set_caption("Courier Quest - Seleccionar Partida")
     
-    # Buscar todos los archivos de guardado usando GameStateManager
-    game_state_manager = GameStateManager()
-    save_files = []
-    saves_dir = Path("src/game/saves")
-    
-    if saves_dir.exists():
-        for file in saves_dir.glob("*.json"):
-            # Excluir el archivo savedScores.json que es solo para puntuaciones
-            if file.name != "savedScores.json":
-                save_info = game_state_manager.get_save_info(file)
-                if save_info:
-                    save_files.append(save_info)
+    # Solo se lee el índice de partidas (no se parsea cada guardado), una vez al entrar:
+    # en esta pantalla no se guarda ni se borra nada, así que la lista no cambia
+    partidas = GameStateManager().listar_partidas()
+    total_saves = len(partidas)
     
-    if not save_files:
+    if not total_saves:
         # No hay partidas guardadas, mostrar mensaje
         show_no_saves_message()
         return None
@@ -157,11 +177,11 @@ def select_save_file():
                     if selected_index < scroll_offset:
                         scroll_offset = selected_index
                 elif event.key == pygame.K_DOWN:
-                    selected_index = min(len(save_files) - 1, selected_index + 1)
+                    selected_index = min(total_saves - 1, selected_index + 1)
                     if selected_index >= scroll_offset + max_visible:
                         scroll_offset = selected_index - max_visible + 1
                 elif event.key == pygame.K_RETURN:
-                    return save_files[selected_index]['file']
+                    return partidas[selected_index]['file']
                 elif event.key == pygame.K_ESCAPE:
                     return None
         
@@ -178,12 +198,9 @@ def select_save_file():
         list_font = get_font(16)
         y_start = 120
         
-        for i in range(max_visible):
+        # Página visible, ordenada de la más reciente a la más antigua
+        for i, save_info in enumerate(partidas[scroll_offset:scroll_offset + max_visible]):
             file_index = scroll_offset + i
-            if file_index >= len(save_files):
-                break
-                
-            save_info = save_files[file_index]
             
             # Color de fondo para la selección actual
             if file_index == selected_index:
@@ -205,7 +222,7 @@ def select_save_file():
             up_arrow = list_font.render("↑ Más arriba", True, (255, 255, 255))
             SCREEN.blit(up_arrow, (WINDOW_WIDTH // 2 - 50, 100))
         
-        if scroll_offset + max_visible < len(save_files):
+        if scroll_offset + max_visible < total_saves:
             down_arrow = list_font.render("↓ Más abajo", True, (255, 255, 255))
             SCREEN.blit(down_arrow, (WINDOW_WIDTH // 2 - 50, y_start + max_visible * 60))
         
@@ -258,12 +275,13 @@ def es_adyacente(pos1, pos2):
     x2, y2 = pos2
     return (abs(x1 - x2) == 1 and y1 == y2) or (abs(y1 - y2) == 1 and x1 == x2)
 
-def mostrar_pantalla_victoria(player, tiempo_actual, player_name):
+def mostrar_pantalla_victoria(player, tiempo_actual, player_name, ciudad=None, guardar_score=True):
     """Muestra la pantalla de victoria"""
     pygame.display.set_caption("Courier Quest - ¡VICTORIA!")
     
     # Guardar automáticamente el scoreboard
-    player.score.save_scoreboard(player_name)
+    if guardar_score:
+        player.score.save_scoreboard(player_name, ciudad=ciudad)
     
     while True:
         SCREEN.blit(BG, (0, 0))
@@ -304,12 +322,13 @@ def mostrar_pantalla_victoria(player, tiempo_actual, player_name):
         
         pygame.display.update()
 
-def mostrar_pantalla_derrota(player, tiempo_actual, razon, player_name):
+def mostrar_pantalla_derrota(player, tiempo_actual, razon, player_name, ciudad=None, guardar_score=True):
     """Muestra la pantalla de derrota"""
     pygame.display.set_caption("Courier Quest - Derrota")
     
     # Guardar automáticamente el scoreboard
-    player.score.save_scoreboard(player_name)
+    if guardar_score:
+        player.score.save_scoreboard(player_name, ciudad=ciudad)
     
     while True:
         SCREEN.blit(BG, (0, 0))
@@ -386,15 +405,14 @@ def game(new_game=False, save_file=None):
         # Continuar partida: cargar desde archivo específico si se proporciona
         if save_file:
             try:
-                # Detectar si es un archivo de GameStateManager o Save básico
-                with open(save_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                # Detectar si es un archivo de GameStateManager (JSON o snapshot .cqsave) o Save básico
+                game_state_manager = GameStateManager()
+                data = game_state_manager.leer_datos(save_file)
                 
                 # Verificar si tiene campos del GameStateManager
                 if 'tiempo_actual_segundos' in data and 'active_orders' in data:
-                    # Es un guardado completo de GameStateManager
-                    game_state_manager = GameStateManager()
-                    loaded_game_state = game_state_manager.load_game_state(save_file)
+                    # Es un guardado completo de GameStateManager (los datos ya se leyeron)
+                    loaded_game_state = GameState(**data)
                     
                     player_name = loaded_game_state.player_name
                     save_data_to_use = None  # No usar Save básico
@@ -437,9 +455,8 @@ def game(new_game=False, save_file=None):
 
     # --- cargar mapa ---
     try:
-        with open(CACHE_DIR / "map.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        city_map = CityMap(**data)
+        # Grilla compilada (.cqmap) mapeada en memoria; se genera desde map.json si falta o quedó vieja
+        city_map = MapaCompilado.cargar(CACHE_DIR / "map.json")
 
     except Exception as e:
         print(f"Error cargando mapa: {e}")
@@ -447,9 +464,7 @@ def game(new_game=False, save_file=None):
 
     # --- cargar clima ---
     try:
-        with open(CACHE_DIR / "TigerCity_weather.json", "r", encoding="utf-8") as f:
-            clima_data = json.load(f)
-        clima = ClimaData(**clima_data)
+        clima = CacheConfiable.cargar(CACHE_DIR / "TigerCity_weather.json", ClimaData)
         sistema_clima = SistemaClima(clima)
     except Exception as e:
         print(f"Error cargando clima: {e}")
@@ -479,7 +494,7 @@ def game(new_game=False, save_file=None):
 
     # --- inicializar entidades ---
     renderer = MapRenderer(city_map, SPRITES_DIR, TILE_WIDTH, TILE_HEIGHT, viewport_size=(MAP_WIDTH, MAP_HEIGHT))
-    map_logic = MapLogic(city_map, TILE_WIDTH, TILE_HEIGHT)
+    map_logic = MapLogic(city_map, TILE_WIDTH, TILE_HEIGHT, cache_dir=CACHE_DIR)
     stats = Stats()
     rep = Reputation()
     
@@ -496,12 +511,23 @@ def game(new_game=False, save_file=None):
                     start_y=start_y,
                     save_data=save_data_to_use,
                     player_name=player_name)
+    # Pedidos sin camino desde la zona del jugador se marcan al liberarse
+    notificador.configurar_mapa(map_logic, map_logic.get_player_tile_pos(player.rect))
 
     # --- Inicializar sistema de deshacer ---
-    undo_system = UndoSystem(10000)  # Permite deshacer hasta 50 movimientos
+    # La bitácora en disco permite rebobinar toda la jornada (tecla T) con memoria constante
+    MoveJournal.limpiar_antiguas(JOURNAL_DIR)
+    journal = MoveJournal(JOURNAL_DIR / f"{uuid.uuid4()}.journal")
+    undo_system = UndoSystem(10000, journal=journal)  # Permite deshacer hasta 50 movimientos
     # Guardar estado inicial
     undo_system.save_state(player, 0, [])
 
+    def terminar_partida():
+        """Cierra la bitácora y el mapa y escribe los eventos de score pendientes; se llama en cada salida de la partida"""
+        journal.cerrar()
+        player.score.events.flush()
+        city_map.cerrar()
+
     # --- Inicializar inventario ---
     inventario = InventarioPedidos(max_weight=10, screen_width=WINDOW_WIDTH, screen_height=WINDOW_HEIGHT)
 
@@ -531,7 +557,7 @@ def game(new_game=False, save_file=None):
         
         if pedido_a_entregar in pedidos_en_inventario:
             # Calcular puntualidad de la entrega
-            tiempo_limite = pedido_a_entregar.release_time + pedido_a_entregar.duration
+            tiempo_limite = pedido_a_entregar.deadline
             delay_seconds = tiempo_actual_segundos - tiempo_limite
             
             # Determinar el estado de la entrega
@@ -600,286 +626,320 @@ def game(new_game=False, save_file=None):
     tiempo_inicio_pausa = None  # Momento cuando comenzó la pausa actual
     juego_pausado = False  # Estado de pausa
     
+    # Manejador de eventos persistente: las listas de pedidos se comparten por referencia
+    pedidos_data = {
+        'pedidos': pedidos,
+        'pedidos_recogidos': pedidos_recogidos,
+        'pedidos_entregados': pedidos_entregados,
+        'es_adyacente_func': es_adyacente
+    }
+    AUTOSAVE.reiniciar()
+    
+    event_handler = Events(
+        player, gestor, notificador, undo_system, inventario,
+        recoger_callback=recoger_paquete,
+        entregar_callback=entregar_paquete,
+        pedidos_data=pedidos_data,
+        map_logic=map_logic,
+        sistema_clima=sistema_clima,
+        profiler=PROFILER
+    )
+    
     while running:
         dt = clock.tick(60) / 1000.0  # delta seconds
+        with PROFILER.frame():
         
-        # Determinar si el juego debe estar pausado
-        hay_notificacion_activa = notificador.activo
-        
-        # Manejar transiciones de pausa
-        if hay_notificacion_activa and not juego_pausado:
-            # Comenzar pausa por notificación
-            juego_pausado = True
-            tiempo_inicio_pausa = pygame.time.get_ticks()
-        elif not hay_notificacion_activa and juego_pausado and tiempo_inicio_pausa is not None:
-            # Terminar pausa por notificación
-            juego_pausado = False
-            tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-            tiempo_inicio_pausa = None
-        
-        # Calcular tiempo actual en segundos desde el inicio (excluyendo tiempo pausado)
-        tiempo_actual_ms = pygame.time.get_ticks() - tiempo_inicio - tiempo_total_pausado
-        if juego_pausado and tiempo_inicio_pausa is not None:
-            # Si está pausado actualmente, no contar el tiempo desde que comenzó la pausa
-            tiempo_actual_ms -= (pygame.time.get_ticks() - tiempo_inicio_pausa)
-        
-        tiempo_actual_segundos = max(0, tiempo_actual_ms // 1000)
-        
-        # VERIFICAR CONDICIONES DE VICTORIA Y DERROTA
-        if not juego_pausado:
-            # Condición de DERROTA por reputación
-            if player.reputation.valor < 20:
-                mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Reputación muy baja", player_name)
-                return
+            # Determinar si el juego debe estar pausado
+            hay_notificacion_activa = notificador.activo
+        
+            # Manejar transiciones de pausa
+            if hay_notificacion_activa and not juego_pausado:
+                # Comenzar pausa por notificación
+                juego_pausado = True
+                tiempo_inicio_pausa = pygame.time.get_ticks()
+            elif not hay_notificacion_activa and juego_pausado and tiempo_inicio_pausa is not None:
+                # Terminar pausa por notificación
+                juego_pausado = False
+                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                tiempo_inicio_pausa = None
+        
+            # Calcular tiempo actual en segundos desde el inicio (excluyendo tiempo pausado)
+            tiempo_actual_ms = pygame.time.get_ticks() - tiempo_inicio - tiempo_total_pausado
+            if juego_pausado and tiempo_inicio_pausa is not None:
+                # Si está pausado actualmente, no contar el tiempo desde que comenzó la pausa
+                tiempo_actual_ms -= (pygame.time.get_ticks() - tiempo_inicio_pausa)
+        
+            tiempo_actual_segundos = max(0, tiempo_actual_ms // 1000)
+
+            # Autosave: aquí solo se copia el estado, la escritura ocurre en el hilo de autosave
+            if not juego_pausado:
+                with PROFILER.medir("autosave"):
+                    AUTOSAVE.tick(
+                        tiempo_actual_segundos,
+                        player=player,
+                        stats=stats,
+                        reputation=rep,
+                        gestor_pedidos=gestor,
+                        sistema_clima=sistema_clima,
+                        notificador=notificador,
+                        tiempo_actual=tiempo_actual_segundos,
+                        tiempo_pausado=tiempo_total_pausado,
+                        tiempo_inicio=tiempo_inicio,
+                        day=save_data_to_use.day if save_data_to_use else 1
+                    )
+        
+            # VERIFICAR CONDICIONES DE VICTORIA Y DERROTA
+            if not juego_pausado:
+                # Condición de DERROTA por reputación
+                if player.reputation.valor < 20:
+                    mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Reputación muy baja", player_name, ciudad=city_map.city_name)
+                    terminar_partida()
+                    return
+            
+                # Condición de DERROTA por tiempo agotado
+                if tiempo_actual_segundos >= TIEMPO_TOTAL_JORNADA:
+                    total_score = player.score.calcular_total()
+                    if total_score >= META_INGRESOS:
+                        mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name, ciudad=city_map.city_name)
+                    else:
+                        mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Tiempo agotado", player_name, ciudad=city_map.city_name)
+                    terminar_partida()
+                    return
             
-            # Condición de DERROTA por tiempo agotado
-            if tiempo_actual_segundos >= TIEMPO_TOTAL_JORNADA:
+                # Condición de VICTORIA por meta alcanzada
                 total_score = player.score.calcular_total()
                 if total_score >= META_INGRESOS:
-                    mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name)
-                else:
-                    mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Tiempo agotado", player_name)
-                return
-            
-            # Condición de VICTORIA por meta alcanzada
-            total_score = player.score.calcular_total()
-            if total_score >= META_INGRESOS:
-                mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name)
-                return
+                    mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name, ciudad=city_map.city_name)
+                    terminar_partida()
+                    return
         
-        # ACTUALIZAR NOTIFICADOR - Solo cuando no esté pausado
-        if not juego_pausado:
-            notificador.actualizar(tiempo_actual_segundos)
+            # ACTUALIZAR NOTIFICADOR - Solo cuando no esté pausado
+            if not juego_pausado:
+                with PROFILER.medir("notificador"):
+                    notificador.actualizar(tiempo_actual_segundos)
         
-        # Dibujo de paquetes y puntos de entrega ahora manejado por renderer.draw_package_icons()
+            # Dibujo de paquetes y puntos de entrega ahora manejado por renderer.draw_package_icons()
 
 
 
 
         
-        # Procesar eventos
-        pedidos_data = {
-            'pedidos': pedidos,
-            'pedidos_recogidos': pedidos_recogidos,
-            'pedidos_entregados': pedidos_entregados,
-            'es_adyacente_func': es_adyacente
-        }
-        event_handler = Events(
-            player, gestor, notificador, undo_system, inventario,
-            recoger_callback=recoger_paquete,
-            entregar_callback=entregar_paquete,
-            pedidos_data=pedidos_data,
-            map_logic=map_logic,
-            sistema_clima=sistema_clima,
-            tiempo_actual=lambda: tiempo_actual_segundos
-        )
-        accion = event_handler.procesar_eventos()
+            # Procesar eventos
+            event_handler.actualizar(tiempo_actual_segundos)
+            with PROFILER.medir("eventos"):
+                accion = event_handler.procesar_eventos()
 
-        if accion == "salir":
-            print("Saliendo del juego.")
-            pygame.quit()
-
-        if accion == "pausa":
-            if not juego_pausado:
-                juego_pausado = True
-                tiempo_inicio_pausa = pygame.time.get_ticks()
+            if accion == "salir":
+                print("Saliendo del juego.")
+                terminar_partida()
+                pygame.quit()
+                sys.exit()
 
-            # Preparar datos para GameStateManager
-            game_state_data = {
-                'sistema_clima': sistema_clima,
-                'notificador': notificador,
-                'tiempo_actual': tiempo_actual_segundos,
-                'tiempo_pausado': tiempo_total_pausado,
-                'tiempo_inicio': tiempo_inicio,
-                'day': save_data_to_use.day if save_data_to_use else 1
-            }
+            if accion == "pausa":
+                if not juego_pausado:
+                    juego_pausado = True
+                    tiempo_inicio_pausa = pygame.time.get_ticks()
+
+                # Preparar datos para GameStateManager
+                game_state_data = {
+                    'sistema_clima': sistema_clima,
+                    'notificador': notificador,
+                    'tiempo_actual': tiempo_actual_segundos,
+                    'tiempo_pausado': tiempo_total_pausado,
+                    'tiempo_inicio': tiempo_inicio,
+                    'day': save_data_to_use.day if save_data_to_use else 1
+                }
             
-            paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
+                paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
 
-            if juego_pausado and tiempo_inicio_pausa is not None:
-                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-                juego_pausado = False
-                tiempo_inicio_pausa = None
+                if juego_pausado and tiempo_inicio_pausa is not None:
+                    tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                    juego_pausado = False
+                    tiempo_inicio_pausa = None
 
-            if not paused:
-                return  # volver al menú principal
+                if not paused:
+                    terminar_partida()
+                    return  # volver al menú principal
                 
-        # Obtener datos del clima (siempre disponibles para el HUD)
-        condicion = sistema_clima.obtener_condicion()
-        intensidad = sistema_clima.obtener_intensidad()
-        efectos = sistema_clima.obtener_efectos()
-
-        # Obtener teclas presionadas (siempre disponible para ESC y otros controles)
-        keys = pygame.key.get_pressed()
-
-        # --- Lógica del juego ---
-        # Actualizar clima (solo cuando no esté pausado)
-        if not juego_pausado:
-            sistema_clima.actualizar()
+            # Obtener datos del clima (siempre disponibles para el HUD)
+            condicion = sistema_clima.obtener_condicion()
+            intensidad = sistema_clima.obtener_intensidad()
+            efectos = sistema_clima.obtener_efectos()
+
+            # Obtener teclas presionadas (siempre disponible para ESC y otros controles)
+            keys = pygame.key.get_pressed()
+
+            # --- Lógica del juego ---
+            # Actualizar clima (solo cuando no esté pausado)
+            if not juego_pausado:
+                with PROFILER.medir("clima"):
+                    sistema_clima.actualizar()
             
-        # Manejar movimiento del jugador usando el sistema integrado
-        moved = event_handler.manejar_movimiento(keys, dt)
+            # Manejar movimiento del jugador usando el sistema integrado
+            with PROFILER.medir("movimiento"):
+                moved = event_handler.manejar_movimiento(keys, dt)
     
 
-        # dibujar
-        SCREEN.fill((0, 0, 0))
-        renderer.draw(SCREEN)
-        
-        # Dibujar paquetes y puntos de entrega para pedidos activos con lógica inteligente
-        pedidos_activos = gestor.ver_pedidos()
-        renderer.draw_package_icons(SCREEN, pedidos_activos, pedidos_recogidos, pedidos_entregados)
-        
-        # Dibujar cuadrícula de debug (opcional)
-        # Si quieres ver los límites de las casillas, descomenta estas líneas:
-        debug_color = (200, 200, 200, 100)
-        for x in range(0, MAP_WIDTH, TILE_WIDTH):
-            pygame.draw.line(SCREEN, debug_color, (x, 0), (x, MAP_HEIGHT), 1)
-        for y in range(0, MAP_HEIGHT, TILE_HEIGHT):
-            pygame.draw.line(SCREEN, debug_color, (0, y), (MAP_WIDTH, y), 1)
-        
-        # Dibujar la posición actual del jugador
-        player.draw(SCREEN)
-        
-        # --- HUD Actualizado ---
-        px, py = map_logic.get_player_tile_pos(player.rect)
-        tiempo_total_segundos = 900
-        tiempo_restante_segundos = max(0, tiempo_total_segundos - tiempo_actual_segundos)
-        minutos = tiempo_restante_segundos // 60
-        segundos = tiempo_restante_segundos % 60
-        
-        # Calcular peso actual del inventario
-        pedidos_en_inventario = inventario.get_orders()
-        peso_actual = sum(pedido.weight for pedido in pedidos_en_inventario)
-        
-        # Calcular ingreso total para mostrar progreso hacia meta
-        total_actual = player.score.calcular_total()
-        progreso_meta = (total_actual / META_INGRESOS) * 100
-        
-        hud_lines = [
-            f"Tiempo: {tiempo_actual_segundos}s | Restante: {minutos:02d}:{segundos:02d}",
-            f"Jugador: {player.name} | Reputacion: {player.reputation.valor}",
-            f"Resistencia: {player.stats.resistencia:.1f} | Estado: {player.stats.estado_actual()}",
-            f"Ingresos: ${total_actual:.0f} / ${META_INGRESOS} ({progreso_meta:.1f}%)",
-            f"Peso: {peso_actual:.1f}kg | Velocidad: {player.velocidad_actual:.1f}px/f",
-            f"Clima: {condicion}",
-            f"Pedidos activos: {len(gestor)} | Pendientes: {notificador.obtener_pedidos_pendientes_count()}",
-            f"Estado: {'PAUSADO' if juego_pausado else 'ACTIVO'} | Notif: {'SI' if notificador.activo else 'NO'}",
-            f"Undo: {undo_system.get_undo_count()} pasos disponibles", 
-            "U=volver | (1-5)+R = volver N pasos",
-            "N=recoger paquete",
-            "M=entregar paquete",
-            "I=abrir inventario",
-            "K=ordenar inventario",
-            "", # Línea vacía para separación
-            "PEDIDOS:"
-        ]
-
-        urgentes = gestor.ordenar_por_prioridad()
-        # Filtrar pedidos que ya fueron entregados del HUD
-        urgentes_no_entregados = [p for p in urgentes if p not in pedidos_entregados]
-        
-        if urgentes_no_entregados:
-            for idx, pedido in enumerate(urgentes_no_entregados):
-                tiempo_limite = pedido.release_time + pedido.duration
-                tiempo_restante = tiempo_limite - tiempo_actual_segundos
+            # dibujar
+            SCREEN.fill((0, 0, 0))
+            with PROFILER.medir("mapa"):
+                renderer.draw(SCREEN)
+        
+            # Dibujar paquetes y puntos de entrega para pedidos activos con lógica inteligente
+            pedidos_activos = gestor.ver_pedidos()
+            with PROFILER.medir("iconos"):
+                renderer.draw_package_icons(SCREEN, pedidos_activos, pedidos_recogidos, pedidos_entregados)
+        
+            # Dibujar cuadrícula de debug (opcional)
+            # Si quieres ver los límites de las casillas, descomenta estas líneas:
+            debug_color = (200, 200, 200, 100)
+            for x in range(0, MAP_WIDTH, TILE_WIDTH):
+                pygame.draw.line(SCREEN, debug_color, (x, 0), (x, MAP_HEIGHT), 1)
+            for y in range(0, MAP_HEIGHT, TILE_HEIGHT):
+                pygame.draw.line(SCREEN, debug_color, (0, y), (MAP_WIDTH, y), 1)
+        
+            # Dibujar la posición actual del jugador
+            player.draw(SCREEN)
+        
+            # --- HUD Actualizado ---
+            with PROFILER.medir("hud"):
+                px, py = map_logic.get_player_tile_pos(player.rect)
+                tiempo_total_segundos = 900
+                tiempo_restante_segundos = max(0, tiempo_total_segundos - tiempo_actual_segundos)
+                minutos = tiempo_restante_segundos // 60
+                segundos = tiempo_restante_segundos % 60
+        
+                # Calcular peso actual del inventario
+                pedidos_en_inventario = inventario.get_orders()
+                peso_actual = sum(pedido.weight for pedido in pedidos_en_inventario)
+        
+                # Calcular ingreso total para mostrar progreso hacia meta
+                total_actual = player.score.calcular_total()
+                progreso_meta = (total_actual / META_INGRESOS) * 100
+        
+                hud_lines = [
+                    f"Tiempo: {tiempo_actual_segundos}s | Restante: {minutos:02d}:{segundos:02d}",
+                    f"Jugador: {player.name} | Reputacion: {player.reputation.valor}",
+                    f"Resistencia: {player.stats.resistencia:.1f} | Estado: {player.stats.estado_actual()}",
+                    f"Ingresos: ${total_actual:.0f} / ${META_INGRESOS} ({progreso_meta:.1f}%)",
+                    f"Peso: {peso_actual:.1f}kg | Velocidad: {player.velocidad_actual:.1f}px/f",
+                    f"Clima: {condicion}",
+                    f"Pedidos activos: {len(gestor)} | Pendientes: {notificador.obtener_pedidos_pendientes_count()}",
+                    f"Estado: {'PAUSADO' if juego_pausado else 'ACTIVO'} | Notif: {'SI' if notificador.activo else 'NO'}",
+                    f"Undo: {undo_system.get_undo_count()} pasos disponibles", 
+                    "U=volver | (1-5)+R = volver N pasos",
+                    "T=rebobinar 30s",
+                    "N=recoger paquete",
+                    "M=entregar paquete",
+                    "I=abrir inventario",
+                    "K=ordenar inventario",
+                    "F3=perfil de frames",
+                    "", # Línea vacía para separación
+                    "PEDIDOS:"
+                ]
+
+                urgentes = gestor.ordenar_por_prioridad()
+                # Filtrar pedidos que ya fueron entregados del HUD
+                urgentes_no_entregados = [p for p in urgentes if p not in pedidos_entregados]
+        
+                if urgentes_no_entregados:
+                    for idx, pedido in enumerate(urgentes_no_entregados):
+                        tiempo_limite = pedido.deadline
+                        tiempo_restante = tiempo_limite - tiempo_actual_segundos
                 
-                if tiempo_restante > 0:
-                    tiempo_texto = f"{tiempo_restante}s"
-                else:
-                    tiempo_texto = "Tarde"
+                        if tiempo_restante > 0:
+                            tiempo_texto = f"{tiempo_restante}s"
+                        else:
+                            tiempo_texto = "Tarde"
                     
-                hud_lines.append(f"{idx+1}. {pedido.id} P:{pedido.priority} T:{tiempo_texto} Peso:{pedido.weight}kg")
-        else:
-            hud_lines.append("  (No hay pedidos disponibles)")
-
-        for i, line in enumerate(hud_lines):
-            hud_surface = get_font(8).render(line, True, (255, 255, 255))
-            SCREEN.blit(hud_surface, (MAP_WIDTH + 10, 8 + i * 20))
-
-        # Mostrar información de interacción con paquetes (posiciones adyacentes)
-        interaccion_y = 550
-        
-        # Verificar si puede recoger algún paquete
-        puede_recoger = False
-        for pedido in pedidos:
-            if pedido not in pedidos_recogidos and es_adyacente((player.x, player.y), tuple(pedido.pickup)):
-                puede_recoger = True
-                break
-        
-        if puede_recoger:
-            font = get_font(10)
-            texto = font.render("Presiona N para recoger paquete", True, (255, 255, 0))
-            SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y))
-        
-        # Verificar si puede entregar algún paquete
-        puede_entregar = False
-        pedidos_en_inventario = inventario.get_orders()
-        for pedido in pedidos_en_inventario:
-            if pedido not in pedidos_entregados and es_adyacente((player.x, player.y), tuple(pedido.dropoff)):
-                puede_entregar = True
-                break
-        
-        if puede_entregar:
-            font = get_font(10)
-            texto = font.render("Presiona M para entregar paquete", True, (255, 255, 0))
-            SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y + 20))
-
-        # DIBUJAR NOTIFICACIÓN (si está activa) - Esto va al final
-        notificador.dibujar(SCREEN)
-        
-        # Manejar pausa si se presionó ESC
-        if accion == "pausa":
-            # Pausar el tiempo cuando se entra al menú de pausa
-            if not juego_pausado:
-                juego_pausado = True
-                tiempo_inicio_pausa = pygame.time.get_ticks()
+                        hud_lines.append(f"{idx+1}. {pedido.id} P:{pedido.priority} T:{tiempo_texto} Peso:{pedido.weight}kg")
+                else:
+                    hud_lines.append("  (No hay pedidos disponibles)")
+
+                for i, line in enumerate(hud_lines):
+                    hud_surface = get_font(8).render(line, True, (255, 255, 255))
+                    SCREEN.blit(hud_surface, (MAP_WIDTH + 10, 8 + i * 20))
+
+                # Mostrar información de interacción con paquetes (posiciones adyacentes)
+                interaccion_y = 550
+        
+                # Verificar si puede recoger algún paquete
+                puede_recoger = False
+                for pedido in pedidos:
+                    if pedido not in pedidos_recogidos and es_adyacente((player.x, player.y), pedido.pickup):
+                        puede_recoger = True
+                        break
+        
+                if puede_recoger:
+                    font = get_font(10)
+                    texto = font.render("Presiona N para recoger paquete", True, (255, 255, 0))
+                    SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y))
+        
+                # Verificar si puede entregar algún paquete
+                puede_entregar = False
+                pedidos_en_inventario = inventario.get_orders()
+                for pedido in pedidos_en_inventario:
+                    if pedido not in pedidos_entregados and es_adyacente((player.x, player.y), pedido.dropoff):
+                        puede_entregar = True
+                        break
+        
+                if puede_entregar:
+                    font = get_font(10)
+                    texto = font.render("Presiona M para entregar paquete", True, (255, 255, 0))
+                    SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y + 20))
+
+
+            # DIBUJAR NOTIFICACIÓN (si está activa) - Esto va al final
+            notificador.dibujar(SCREEN)
+        
+            # Manejar pausa si se presionó ESC
+            if accion == "pausa":
+                # Pausar el tiempo cuando se entra al menú de pausa
+                if not juego_pausado:
+                    juego_pausado = True
+                    tiempo_inicio_pausa = pygame.time.get_ticks()
             
-            # Preparar datos para GameStateManager
-            game_state_data = {
-                'sistema_clima': sistema_clima,
-                'notificador': notificador,
-                'tiempo_actual': tiempo_actual_segundos,
-                'tiempo_pausado': tiempo_total_pausado,
-                'tiempo_inicio': tiempo_inicio,
-                'day': save_data_to_use.day if save_data_to_use else 1
-            }
+                # Preparar datos para GameStateManager
+                game_state_data = {
+                    'sistema_clima': sistema_clima,
+                    'notificador': notificador,
+                    'tiempo_actual': tiempo_actual_segundos,
+                    'tiempo_pausado': tiempo_total_pausado,
+                    'tiempo_inicio': tiempo_inicio,
+                    'day': save_data_to_use.day if save_data_to_use else 1
+                }
             
-            paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
+                paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
             
-            # Reanudar el tiempo cuando se sale del menú de pausa
-            if juego_pausado and tiempo_inicio_pausa is not None:
-                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-                juego_pausado = False
-                tiempo_inicio_pausa = None
+                # Reanudar el tiempo cuando se sale del menú de pausa
+                if juego_pausado and tiempo_inicio_pausa is not None:
+                    tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                    juego_pausado = False
+                    tiempo_inicio_pausa = None
                 
-            if not paused:  # Si pause() retorna False, significa que queremos salir al menú principal
-                return
+                if not paused:  # Si pause() retorna False, significa que queremos salir al menú principal
+                    terminar_partida()
+                    return
 
-        # Dibujar el inventario si está activo
-        inventario.dibujar_inventario(SCREEN)
+            # Dibujar el inventario si está activo
+            inventario.dibujar_inventario(SCREEN)
         
-        # Actualizar la screen
-        pygame.display.update()
+            # Overlay del perfilador (F3)
+            PROFILER.dibujar(SCREEN)
+        
+            # Actualizar la screen
+            with PROFILER.medir("pantalla"):
+                pygame.display.update()
 
 def show_scoreboard():
     """Muestra la pantalla del scoreboard con el top de jugadores"""
     pygame.display.set_caption("Courier Quest - Score Board")
     
-    # Cargar scores desde el archivo
-    from pathlib import Path
-    import json
-    
-    score_file = Path("src/game/saves/savedScores.json")
-    scores = []
-    
-    if score_file.exists():
-        try:
-            with open(score_file, 'r', encoding='utf-8') as f:
-                scores = json.load(f)
-                if not isinstance(scores, list):
-                    scores = []
-        except (json.JSONDecodeError, FileNotFoundError):
-            scores = []
+    # Solo se leen los top-K ya mantenidos por el ScoreBoard (no todo el historial)
+    board = ScoreBoard.para_directorio(BASE_DIR / "src" / "game" / "saves")
+    tableros = board.tableros() or [(None, None)]
+    tablero_actual = 0
+    scores = board.top(*tableros[tablero_actual])
     
     while True:
         SCREEN.blit(BG, (0, 0))
@@ -890,6 +950,13 @@ def show_scoreboard():
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 80))
         SCREEN.blit(title, title_rect)
         
+        # Tablero seleccionado (global, por ciudad y/o dificultad)
+        ciudad, dificultad = tableros[tablero_actual]
+        subtitle = get_font(14).render(
+            f"< {ciudad or 'Todas las ciudades'} | {(dificultad or 'Todas').upper()} >", True, (200, 200, 200)
+        )
+        SCREEN.blit(subtitle, subtitle.get_rect(center=(WINDOW_WIDTH // 2, 120)))
+        
         # Mostrar scores
         if scores:
             # Limitar a top 10
@@ -937,7 +1004,7 @@ def show_scoreboard():
         
         # Botón de regreso
         back_font = get_font(16)
-        back_text = back_font.render("Presiona ESC para volver al menú", True, (150, 150, 150))
+        back_text = back_font.render("ESC volver al menú | <- -> cambiar tablero", True, (150, 150, 150))
         back_rect = back_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
         SCREEN.blit(back_text, back_rect)
         
@@ -949,6 +1016,10 @@ def show_scoreboard():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return  # Volver al menú principal
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    paso = 1 if event.key == pygame.K_RIGHT else -1
+                    tablero_actual = (tablero_actual + paso) % len(tableros)
+                    scores = board.top(*tableros[tablero_actual])
         
         pygame.display.update()
 
@@ -1080,7 +1151,7 @@ def pause(player, stats, rep, gestor, original_caption, game_state_data=None):
                                 day=1,  # aquí puedes usar el día actual
                                 current_weather="clear"
                             )
-                            save_id = Save.save_score_only_global()
+                            save_id = save_data.save_score_only_global()
 
                         save_score = save
 
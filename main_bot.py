@@ -1,13 +1,16 @@
 import sys
+import atexit
 import pygame
 import json
+import uuid
 from pathlib import Path
 from typing import List
-from src.models.CityMap import CityMap
 from src.models.ClimaData import ClimaData
 from src.game.button import Button
 from src.game.package_notifier import NotificadorPedidos
 from src.api.ManejadorAPI import ManejadorAPI
+from src.api.cache_confiable import CacheConfiable
+from src.models.MapaCompilado import MapaCompilado
 from src.game.events import Events
 from src.game.save import Save
 from src.game.inventory import InventarioPedidos
@@ -32,7 +35,13 @@ from src.game.player import Player
 from src.game.bot import Bot 
 from src.game.weather_system import SistemaClima
 from src.game.undo import UndoSystem
-from src.game.game_state_manager import GameStateManager
+from src.game.move_journal import MoveJournal
+from src.game.game_state_manager import GameStateManager, GameState
+from src.game.profiler import FrameProfiler
+from src.game.autosave import AutoSaveService
+from src.game.scoreboard import ScoreBoard
+from src.game.sqlite_store import SQLiteStore
+from src.game.score_events import ScoreEventLog
 
 pygame.init()
 
@@ -40,6 +49,25 @@ BG = pygame.image.load("./sprites/Background.png")
 BASE_DIR = Path(__file__).resolve().parent
 CACHE_DIR = BASE_DIR / "cache"
 SPRITES_DIR = BASE_DIR / "sprites"
+JOURNAL_DIR = BASE_DIR / "src" / "game" / "saves" / "journal"
+
+# Backend opcional: con True las partidas, puntajes y eventos de score se guardan
+# en SQLite (saves/courier.db) en lugar de archivos sueltos
+USAR_SQLITE = False
+if USAR_SQLITE:
+    SQLiteStore.activar(BASE_DIR / "src" / "game" / "saves" / "courier.db")
+
+# Perfilador de frames: overlay con F3 y CSV de percentiles al salir
+PROFILER = FrameProfiler(out_dir=BASE_DIR / "profiling")
+atexit.register(PROFILER.exportar_csv)
+
+# Autosave incremental en segundo plano: un delta cada 5 s de juego y un
+# checkpoint completo cada 12 deltas (conserva los 3 autosaves más recientes)
+AUTOSAVE = AutoSaveService(intervalo=5, conservar=3, checkpoint_cada=12)
+atexit.register(AUTOSAVE.detener)
+
+# Bitácoras de eventos de score: se conservan las de las últimas partidas
+ScoreEventLog.limpiar_antiguas(BASE_DIR / "src" / "game" / "saves" / "events")
 
 def get_font(size):
     return pygame.font.Font("./sprites/font.ttf", size)
@@ -180,18 +208,12 @@ def select_bot_difficulty():
 def select_save_file():
     pygame.display.set_caption("Courier Quest - Seleccionar Partida")
     
-    game_state_manager = GameStateManager()
-    save_files = []
-    saves_dir = Path("src/game/saves")
+    # Solo se lee el índice de partidas (no se parsea cada guardado), una vez al entrar:
+    # en esta pantalla no se guarda ni se borra nada, así que la lista no cambia
+    partidas = GameStateManager().listar_partidas()
+    total_saves = len(partidas)
     
-    if saves_dir.exists():
-        for file in saves_dir.glob("*.json"):
-            if file.name != "savedScores.json":
-                save_info = game_state_manager.get_save_info(file)
-                if save_info:
-                    save_files.append(save_info)
-    
-    if not save_files:
+    if not total_saves:
         show_no_saves_message()
         return None
     
@@ -211,11 +233,11 @@ def select_save_file():
                     if selected_index < scroll_offset:
                         scroll_offset = selected_index
                 elif event.key == pygame.K_DOWN:
-                    selected_index = min(len(save_files) - 1, selected_index + 1)
+                    selected_index = min(total_saves - 1, selected_index + 1)
                     if selected_index >= scroll_offset + max_visible:
                         scroll_offset = selected_index - max_visible + 1
                 elif event.key == pygame.K_RETURN:
-                    return save_files[selected_index]['file']
+                    return partidas[selected_index]['file']
                 elif event.key == pygame.K_ESCAPE:
                     return None
         
@@ -229,12 +251,9 @@ def select_save_file():
         list_font = get_font(16)
         y_start = 120
         
-        for i in range(max_visible):
+        # Página visible, ordenada de la más reciente a la más antigua
+        for i, save_info in enumerate(partidas[scroll_offset:scroll_offset + max_visible]):
             file_index = scroll_offset + i
-            if file_index >= len(save_files):
-                break
-                
-            save_info = save_files[file_index]
             
             if file_index == selected_index:
                 rect = pygame.Rect(30, y_start + i * 60 - 10, WINDOW_WIDTH - 60, 70)
@@ -253,7 +272,7 @@ def select_save_file():
             up_arrow = list_font.render("↑ Más arriba", True, (255, 255, 255))
             SCREEN.blit(up_arrow, (WINDOW_WIDTH // 2 - 50, 100))
         
-        if scroll_offset + max_visible < len(save_files):
+        if scroll_offset + max_visible < total_saves:
             down_arrow = list_font.render("↓ Más abajo", True, (255, 255, 255))
             SCREEN.blit(down_arrow, (WINDOW_WIDTH // 2 - 50, y_start + max_visible * 60))
         
@@ -302,10 +321,11 @@ def es_adyacente(pos1, pos2):
     x2, y2 = pos2
     return (abs(x1 - x2) == 1 and y1 == y2) or (abs(y1 - y2) == 1 and x1 == x2)
 
-def mostrar_pantalla_victoria(player, tiempo_actual, player_name):
+def mostrar_pantalla_victoria(player, tiempo_actual, player_name, ciudad=None, guardar_score=True):
     pygame.display.set_caption("Courier Quest - ¡VICTORIA!")
     
-    player.score.save_scoreboard(player_name)
+    if guardar_score:
+        player.score.save_scoreboard(player_name, ciudad=ciudad)
     
     while True:
         SCREEN.blit(BG, (0, 0))
@@ -343,12 +363,13 @@ def mostrar_pantalla_victoria(player, tiempo_actual, player_name):
         
         pygame.display.update()
 
-def mostrar_pantalla_derrota(player, tiempo_actual, razon, player_name):
+def mostrar_pantalla_derrota(player, tiempo_actual, razon, player_name, ciudad=None, guardar_score=True):
     """Muestra la pantalla de derrota"""
     pygame.display.set_caption("Courier Quest - Derrota")
     
     # Guardar automáticamente el scoreboard
-    player.score.save_scoreboard(player_name)
+    if guardar_score:
+        player.score.save_scoreboard(player_name, ciudad=ciudad)
     
     while True:
         SCREEN.blit(BG, (0, 0))
@@ -423,15 +444,14 @@ def game(new_game=False, save_file=None):
         # Continuar partida: cargar del save
         if save_file:
             try:
-                # Detectar si es un archivo de GameStateManager o Save básico
-                with open(save_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                # Detectar si es un archivo de GameStateManager (JSON o snapshot .cqsave) o Save básico
+                game_state_manager = GameStateManager()
+                data = game_state_manager.leer_datos(save_file)
                 
                 # Verificar si tiene campos del GameStateManager
                 if 'tiempo_actual_segundos' in data and 'active_orders' in data:
-                    # Es un guardado completo de GameStateManager
-                    game_state_manager = GameStateManager()
-                    loaded_game_state = game_state_manager.load_game_state(save_file)
+                    # Es un guardado completo de GameStateManager (los datos ya se leyeron)
+                    loaded_game_state = GameState(**data)
                     
                     player_name = loaded_game_state.player_name
                     save_data_to_use = None  # No usar Save básico
@@ -470,9 +490,8 @@ def game(new_game=False, save_file=None):
 
     # --- cargar mapa ---
     try:
-        with open(CACHE_DIR / "map.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        city_map = CityMap(**data)
+        # Grilla compilada (.cqmap) mapeada en memoria; se genera desde map.json si falta o quedó vieja
+        city_map = MapaCompilado.cargar(CACHE_DIR / "map.json")
 
     except Exception as e:
         print(f"Error cargando mapa: {e}")
@@ -480,9 +499,7 @@ def game(new_game=False, save_file=None):
 
     # --- cargar clima ---
     try:
-        with open(CACHE_DIR / "TigerCity_weather.json", "r", encoding="utf-8") as f:
-            clima_data = json.load(f)
-        clima = ClimaData(**clima_data)
+        clima = CacheConfiable.cargar(CACHE_DIR / "TigerCity_weather.json", ClimaData)
         sistema_clima = SistemaClima(clima)
     except Exception as e:
         print(f"Error cargando clima: {e}")
@@ -511,7 +528,7 @@ def game(new_game=False, save_file=None):
 
     # --- inicializar entidades ---
     renderer = MapRenderer(city_map, SPRITES_DIR, TILE_WIDTH, TILE_HEIGHT, viewport_size=(MAP_WIDTH, MAP_HEIGHT))
-    map_logic = MapLogic(city_map, TILE_WIDTH, TILE_HEIGHT)
+    map_logic = MapLogic(city_map, TILE_WIDTH, TILE_HEIGHT, cache_dir=CACHE_DIR)
     stats = Stats()
     rep = Reputation()
     
@@ -525,11 +542,21 @@ def game(new_game=False, save_file=None):
                     start_y=start_y,
                     save_data=save_data_to_use,
                     player_name=player_name)
+    # Pedidos sin camino desde la zona del jugador se marcan al liberarse
+    notificador.configurar_mapa(map_logic, map_logic.get_player_tile_pos(player.rect))
 
     # --- Inicializar sistema de deshacer ---
-    undo_system = UndoSystem(1000000)
+    MoveJournal.limpiar_antiguas(JOURNAL_DIR)
+    journal = MoveJournal(JOURNAL_DIR / f"{uuid.uuid4()}.journal")
+    undo_system = UndoSystem(1000000, journal=journal)
     undo_system.save_state(player, 0, [])
 
+    def terminar_partida():
+        """Cierra la bitácora y el mapa y escribe los eventos de score pendientes; se llama en cada salida de la partida"""
+        journal.cerrar()
+        player.score.events.flush()
+        city_map.cerrar()
+
     # --- Inicializar inventario ---
     inventario = InventarioPedidos(max_weight=10, screen_width=WINDOW_WIDTH, screen_height=WINDOW_HEIGHT)
 
@@ -557,7 +584,7 @@ def game(new_game=False, save_file=None):
         pedidos_en_inventario = inventario.get_orders()
         
         if pedido_a_entregar in pedidos_en_inventario:
-            tiempo_limite = pedido_a_entregar.release_time + pedido_a_entregar.duration
+            tiempo_limite = pedido_a_entregar.deadline
             delay_seconds = tiempo_actual_segundos - tiempo_limite
             
             if delay_seconds <= -30:  # Entregado 30s antes o más
@@ -616,232 +643,274 @@ def game(new_game=False, save_file=None):
     tiempo_inicio_pausa = None  # Momento cuando comenzó la pausa actual
     juego_pausado = False  # Estado de pausa
     
+    pedidos_data = {
+        'pedidos': pedidos,
+        'pedidos_recogidos': pedidos_recogidos,
+        'pedidos_entregados': pedidos_entregados,
+        'es_adyacente_func': es_adyacente
+    }
+    AUTOSAVE.reiniciar()
+    
+    event_handler = Events(
+        player, gestor, notificador, undo_system, inventario,
+        recoger_callback=recoger_paquete,
+        entregar_callback=entregar_paquete,
+        pedidos_data=pedidos_data,
+        map_logic=map_logic,
+        sistema_clima=sistema_clima,
+        profiler=PROFILER
+    )
+    
     while running:
         dt = clock.tick(60) / 1000.0  # delta seconds
+        with PROFILER.frame():
         
-        hay_notificacion_activa = notificador.activo
-        
-        if hay_notificacion_activa and not juego_pausado:
-            juego_pausado = True
-            tiempo_inicio_pausa = pygame.time.get_ticks()
-        elif not hay_notificacion_activa and juego_pausado and tiempo_inicio_pausa is not None:
-            juego_pausado = False
-            tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-            tiempo_inicio_pausa = None
+            hay_notificacion_activa = notificador.activo
         
-        tiempo_actual_ms = pygame.time.get_ticks() - tiempo_inicio - tiempo_total_pausado
-        if juego_pausado and tiempo_inicio_pausa is not None:
-            tiempo_actual_ms -= (pygame.time.get_ticks() - tiempo_inicio_pausa)
+            if hay_notificacion_activa and not juego_pausado:
+                juego_pausado = True
+                tiempo_inicio_pausa = pygame.time.get_ticks()
+            elif not hay_notificacion_activa and juego_pausado and tiempo_inicio_pausa is not None:
+                juego_pausado = False
+                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                tiempo_inicio_pausa = None
         
-        tiempo_actual_segundos = max(0, tiempo_actual_ms // 1000)
+            tiempo_actual_ms = pygame.time.get_ticks() - tiempo_inicio - tiempo_total_pausado
+            if juego_pausado and tiempo_inicio_pausa is not None:
+                tiempo_actual_ms -= (pygame.time.get_ticks() - tiempo_inicio_pausa)
         
-        # VERIFICAR CONDICIONES DE VICTORIA Y DERROTA
-        if not juego_pausado:
-            # Condición de DERROTA por reputación
-            if player.reputation.valor < 20:
-                mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Reputación muy baja", player_name)
-                return
+            tiempo_actual_segundos = max(0, tiempo_actual_ms // 1000)
+
+            # Autosave: aquí solo se copia el estado, la escritura ocurre en el hilo de autosave
+            if not juego_pausado:
+                with PROFILER.medir("autosave"):
+                    AUTOSAVE.tick(
+                        tiempo_actual_segundos,
+                        player=player,
+                        stats=stats,
+                        reputation=rep,
+                        gestor_pedidos=gestor,
+                        sistema_clima=sistema_clima,
+                        notificador=notificador,
+                        tiempo_actual=tiempo_actual_segundos,
+                        tiempo_pausado=tiempo_total_pausado,
+                        tiempo_inicio=tiempo_inicio,
+                        day=save_data_to_use.day if save_data_to_use else 1
+                    )
+        
+            # VERIFICAR CONDICIONES DE VICTORIA Y DERROTA
+            if not juego_pausado:
+                # Condición de DERROTA por reputación
+                if player.reputation.valor < 20:
+                    mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Reputación muy baja", player_name, ciudad=city_map.city_name)
+                    terminar_partida()
+                    return
             
-            # Condición de DERROTA por tiempo agotado
-            if tiempo_actual_segundos >= TIEMPO_TOTAL_JORNADA:
+                # Condición de DERROTA por tiempo agotado
+                if tiempo_actual_segundos >= TIEMPO_TOTAL_JORNADA:
+                    total_score = player.score.calcular_total()
+                    if total_score >= META_INGRESOS:
+                        mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name, ciudad=city_map.city_name)
+                    else:
+                        mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Tiempo agotado", player_name, ciudad=city_map.city_name)
+                    terminar_partida()
+                    return
+            
+                # Condición de VICTORIA por meta alcanzada
                 total_score = player.score.calcular_total()
                 if total_score >= META_INGRESOS:
-                    mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name)
-                else:
-                    mostrar_pantalla_derrota(player, tiempo_actual_segundos, "Tiempo agotado", player_name)
-                return
-            
-            # Condición de VICTORIA por meta alcanzada
-            total_score = player.score.calcular_total()
-            if total_score >= META_INGRESOS:
-                mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name)
-                return
+                    mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name, ciudad=city_map.city_name)
+                    terminar_partida()
+                    return
         
-        if not juego_pausado:
-            notificador.actualizar(tiempo_actual_segundos)
-        
-        pedidos_data = {
-            'pedidos': pedidos,
-            'pedidos_recogidos': pedidos_recogidos,
-            'pedidos_entregados': pedidos_entregados,
-            'es_adyacente_func': es_adyacente
-        }
-        event_handler = Events(
-            player, gestor, notificador, undo_system, inventario,
-            recoger_callback=recoger_paquete,
-            entregar_callback=entregar_paquete,
-            pedidos_data=pedidos_data,
-            map_logic=map_logic,
-            sistema_clima=sistema_clima,
-            tiempo_actual=lambda: tiempo_actual_segundos
-        )
-        accion = event_handler.procesar_eventos()
-
-        if accion == "salir":
-            print("Saliendo del juego.")
-            pygame.quit()
-
-        if accion == "pausa":
             if not juego_pausado:
-                juego_pausado = True
-                tiempo_inicio_pausa = pygame.time.get_ticks()
+                with PROFILER.medir("notificador"):
+                    notificador.actualizar(tiempo_actual_segundos)
+        
+            event_handler.actualizar(tiempo_actual_segundos)
+            with PROFILER.medir("eventos"):
+                accion = event_handler.procesar_eventos()
 
-            # Preparar datos para GameStateManager
-            game_state_data = {
-                'sistema_clima': sistema_clima,
-                'notificador': notificador,
-                'tiempo_actual': tiempo_actual_segundos,
-                'tiempo_pausado': tiempo_total_pausado,
-                'tiempo_inicio': tiempo_inicio,
-                'day': save_data_to_use.day if save_data_to_use else 1
-            }
+            if accion == "salir":
+                print("Saliendo del juego.")
+                terminar_partida()
+                pygame.quit()
+                sys.exit()
+
+            if accion == "pausa":
+                if not juego_pausado:
+                    juego_pausado = True
+                    tiempo_inicio_pausa = pygame.time.get_ticks()
+
+                # Preparar datos para GameStateManager
+                game_state_data = {
+                    'sistema_clima': sistema_clima,
+                    'notificador': notificador,
+                    'tiempo_actual': tiempo_actual_segundos,
+                    'tiempo_pausado': tiempo_total_pausado,
+                    'tiempo_inicio': tiempo_inicio,
+                    'day': save_data_to_use.day if save_data_to_use else 1
+                }
             
-            paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
+                paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
 
-            if juego_pausado and tiempo_inicio_pausa is not None:
-                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-                juego_pausado = False
-                tiempo_inicio_pausa = None
+                if juego_pausado and tiempo_inicio_pausa is not None:
+                    tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                    juego_pausado = False
+                    tiempo_inicio_pausa = None
 
-            if not paused:
-                return
+                if not paused:
+                    terminar_partida()
+                    return
                 
-        condicion = sistema_clima.obtener_condicion()
-        intensidad = sistema_clima.obtener_intensidad()
-        efectos = sistema_clima.obtener_efectos()
+            condicion = sistema_clima.obtener_condicion()
+            intensidad = sistema_clima.obtener_intensidad()
+            efectos = sistema_clima.obtener_efectos()
 
-        keys = pygame.key.get_pressed()
+            keys = pygame.key.get_pressed()
 
-        if not juego_pausado:
-            sistema_clima.actualizar()
+            if not juego_pausado:
+                with PROFILER.medir("clima"):
+                    sistema_clima.actualizar()
             
-        moved = event_handler.manejar_movimiento(keys, dt)
-
-        SCREEN.fill((0, 0, 0))
-        renderer.draw(SCREEN)
-        
-        pedidos_activos = gestor.ver_pedidos()
-        renderer.draw_package_icons(SCREEN, pedidos_activos, pedidos_recogidos, pedidos_entregados)
-        
-        debug_color = (200, 200, 200, 100)
-        for x in range(0, MAP_WIDTH, TILE_WIDTH):
-            pygame.draw.line(SCREEN, debug_color, (x, 0), (x, MAP_HEIGHT), 1)
-        for y in range(0, MAP_HEIGHT, TILE_HEIGHT):
-            pygame.draw.line(SCREEN, debug_color, (0, y), (MAP_WIDTH, y), 1)
-        
-        player.draw(SCREEN)
-        
-        # --- HUD Actualizado ---
-        px, py = map_logic.get_player_tile_pos(player.rect)
-        tiempo_total_segundos = 900
-        tiempo_restante_segundos = max(0, tiempo_total_segundos - tiempo_actual_segundos)
-        minutos = tiempo_restante_segundos // 60
-        segundos = tiempo_restante_segundos % 60
-        
-        # Calcular peso actual del inventario
-        pedidos_en_inventario = inventario.get_orders()
-        peso_actual = sum(pedido.weight for pedido in pedidos_en_inventario)
-        
-        # Calcular ingreso total para mostrar progreso hacia meta
-        total_actual = player.score.calcular_total()
-        progreso_meta = (total_actual / META_INGRESOS) * 100
-        
-        hud_lines = [
-            f"Tiempo: {tiempo_actual_segundos}s | Restante: {minutos:02d}:{segundos:02d}",
-            f"Jugador: {player.name} | Reputacion: {player.reputation.valor}",
-            f"Resistencia: {player.stats.resistencia:.1f} | Estado: {player.stats.estado_actual()}",
-            f"Ingresos: ${total_actual:.0f} / ${META_INGRESOS} ({progreso_meta:.1f}%)",
-            f"Peso: {peso_actual:.1f}kg | Velocidad: {player.velocidad_actual:.1f}px/f",
-            f"Clima: {condicion}",
-            f"Pedidos activos: {len(gestor)} | Pendientes: {notificador.obtener_pedidos_pendientes_count()}",
-            f"Estado: {'PAUSADO' if juego_pausado else 'ACTIVO'} | Notif: {'SI' if notificador.activo else 'NO'}",
-            f"Undo: {undo_system.get_undo_count()} pasos disponibles", 
-            "U=volver | (1-5)+R = volver N pasos",
-            "N=recoger paquete",
-            "M=entregar paquete",
-            "I=abrir inventario",
-            "K=ordenar inventario",
-            "",
-            "PEDIDOS:"
-        ]
-
-        urgentes = gestor.ordenar_por_prioridad()
-        urgentes_no_entregados = [p for p in urgentes if p not in pedidos_entregados]
-        
-        if urgentes_no_entregados:
-            for idx, pedido in enumerate(urgentes_no_entregados):
-                tiempo_limite = pedido.release_time + pedido.duration
-                tiempo_restante = tiempo_limite - tiempo_actual_segundos
+            with PROFILER.medir("movimiento"):
+                moved = event_handler.manejar_movimiento(keys, dt)
+
+            SCREEN.fill((0, 0, 0))
+            with PROFILER.medir("mapa"):
+                renderer.draw(SCREEN)
+        
+            pedidos_activos = gestor.ver_pedidos()
+            with PROFILER.medir("iconos"):
+                renderer.draw_package_icons(SCREEN, pedidos_activos, pedidos_recogidos, pedidos_entregados)
+        
+            debug_color = (200, 200, 200, 100)
+            for x in range(0, MAP_WIDTH, TILE_WIDTH):
+                pygame.draw.line(SCREEN, debug_color, (x, 0), (x, MAP_HEIGHT), 1)
+            for y in range(0, MAP_HEIGHT, TILE_HEIGHT):
+                pygame.draw.line(SCREEN, debug_color, (0, y), (MAP_WIDTH, y), 1)
+        
+            player.draw(SCREEN)
+        
+            # --- HUD Actualizado ---
+            with PROFILER.medir("hud"):
+                px, py = map_logic.get_player_tile_pos(player.rect)
+                tiempo_total_segundos = 900
+                tiempo_restante_segundos = max(0, tiempo_total_segundos - tiempo_actual_segundos)
+                minutos = tiempo_restante_segundos // 60
+                segundos = tiempo_restante_segundos % 60
+        
+                # Calcular peso actual del inventario
+                pedidos_en_inventario = inventario.get_orders()
+                peso_actual = sum(pedido.weight for pedido in pedidos_en_inventario)
+        
+                # Calcular ingreso total para mostrar progreso hacia meta
+                total_actual = player.score.calcular_total()
+                progreso_meta = (total_actual / META_INGRESOS) * 100
+        
+                hud_lines = [
+                    f"Tiempo: {tiempo_actual_segundos}s | Restante: {minutos:02d}:{segundos:02d}",
+                    f"Jugador: {player.name} | Reputacion: {player.reputation.valor}",
+                    f"Resistencia: {player.stats.resistencia:.1f} | Estado: {player.stats.estado_actual()}",
+                    f"Ingresos: ${total_actual:.0f} / ${META_INGRESOS} ({progreso_meta:.1f}%)",
+                    f"Peso: {peso_actual:.1f}kg | Velocidad: {player.velocidad_actual:.1f}px/f",
+                    f"Clima: {condicion}",
+                    f"Pedidos activos: {len(gestor)} | Pendientes: {notificador.obtener_pedidos_pendientes_count()}",
+                    f"Estado: {'PAUSADO' if juego_pausado else 'ACTIVO'} | Notif: {'SI' if notificador.activo else 'NO'}",
+                    f"Undo: {undo_system.get_undo_count()} pasos disponibles", 
+                    "U=volver | (1-5)+R = volver N pasos",
+                    "T=rebobinar 30s",
+                    "N=recoger paquete",
+                    "M=entregar paquete",
+                    "I=abrir inventario",
+                    "K=ordenar inventario",
+                    "F3=perfil de frames",
+                    "",
+                    "PEDIDOS:"
+                ]
+
+                urgentes = gestor.ordenar_por_prioridad()
+                urgentes_no_entregados = [p for p in urgentes if p not in pedidos_entregados]
+        
+                if urgentes_no_entregados:
+                    for idx, pedido in enumerate(urgentes_no_entregados):
+                        tiempo_limite = pedido.deadline
+                        tiempo_restante = tiempo_limite - tiempo_actual_segundos
                 
-                if tiempo_restante > 0:
-                    tiempo_texto = f"{tiempo_restante}s"
-                else:
-                    tiempo_texto = "Tarde"
+                        if tiempo_restante > 0:
+                            tiempo_texto = f"{tiempo_restante}s"
+                        else:
+                            tiempo_texto = "Tarde"
                     
-                hud_lines.append(f"{idx+1}. {pedido.id} P:{pedido.priority} T:{tiempo_texto} Peso:{pedido.weight}kg")
-        else:
-            hud_lines.append("  (No hay pedidos disponibles)")
+                        hud_lines.append(f"{idx+1}. {pedido.id} P:{pedido.priority} T:{tiempo_texto} Peso:{pedido.weight}kg")
+                else:
+                    hud_lines.append("  (No hay pedidos disponibles)")
 
-        for i, line in enumerate(hud_lines):
-            hud_surface = get_font(8).render(line, True, (255, 255, 255))
-            SCREEN.blit(hud_surface, (MAP_WIDTH + 10, 8 + i * 20))
+                for i, line in enumerate(hud_lines):
+                    hud_surface = get_font(8).render(line, True, (255, 255, 255))
+                    SCREEN.blit(hud_surface, (MAP_WIDTH + 10, 8 + i * 20))
 
-        interaccion_y = 550
+                interaccion_y = 550
         
-        puede_recoger = False
-        for pedido in pedidos:
-            if pedido not in pedidos_recogidos and es_adyacente((player.x, player.y), tuple(pedido.pickup)):
-                puede_recoger = True
-                break
+                puede_recoger = False
+                for pedido in pedidos:
+                    if pedido not in pedidos_recogidos and es_adyacente((player.x, player.y), pedido.pickup):
+                        puede_recoger = True
+                        break
         
-        if puede_recoger:
-            font = get_font(10)
-            texto = font.render("Presiona N para recoger paquete", True, (255, 255, 0))
-            SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y))
+                if puede_recoger:
+                    font = get_font(10)
+                    texto = font.render("Presiona N para recoger paquete", True, (255, 255, 0))
+                    SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y))
         
-        puede_entregar = False
-        pedidos_en_inventario = inventario.get_orders()
-        for pedido in pedidos_en_inventario:
-            if pedido not in pedidos_entregados and es_adyacente((player.x, player.y), tuple(pedido.dropoff)):
-                puede_entregar = True
-                break
+                puede_entregar = False
+                pedidos_en_inventario = inventario.get_orders()
+                for pedido in pedidos_en_inventario:
+                    if pedido not in pedidos_entregados and es_adyacente((player.x, player.y), pedido.dropoff):
+                        puede_entregar = True
+                        break
         
-        if puede_entregar:
-            font = get_font(10)
-            texto = font.render("Presiona M para entregar paquete", True, (255, 255, 0))
-            SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y + 20))
+                if puede_entregar:
+                    font = get_font(10)
+                    texto = font.render("Presiona M para entregar paquete", True, (255, 255, 0))
+                    SCREEN.blit(texto, (MAP_WIDTH + 10, interaccion_y + 20))
 
-        notificador.dibujar(SCREEN)
+
+            notificador.dibujar(SCREEN)
         
-        if accion == "pausa":
-            if not juego_pausado:
-                juego_pausado = True
-                tiempo_inicio_pausa = pygame.time.get_ticks()
+            if accion == "pausa":
+                if not juego_pausado:
+                    juego_pausado = True
+                    tiempo_inicio_pausa = pygame.time.get_ticks()
             
-            game_state_data = {
-                'sistema_clima': sistema_clima,
-                'notificador': notificador,
-                'tiempo_actual': tiempo_actual_segundos,
-                'tiempo_pausado': tiempo_total_pausado,
-                'tiempo_inicio': tiempo_inicio,
-                'day': save_data_to_use.day if save_data_to_use else 1
-            }
+                game_state_data = {
+                    'sistema_clima': sistema_clima,
+                    'notificador': notificador,
+                    'tiempo_actual': tiempo_actual_segundos,
+                    'tiempo_pausado': tiempo_total_pausado,
+                    'tiempo_inicio': tiempo_inicio,
+                    'day': save_data_to_use.day if save_data_to_use else 1
+                }
             
-            paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
+                paused = pause(player, stats, rep, gestor, city_map.city_name, game_state_data)
             
-            if juego_pausado and tiempo_inicio_pausa is not None:
-                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-                juego_pausado = False
-                tiempo_inicio_pausa = None
+                if juego_pausado and tiempo_inicio_pausa is not None:
+                    tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                    juego_pausado = False
+                    tiempo_inicio_pausa = None
                 
-            if not paused:  
-                return
+                if not paused:  
+                    terminar_partida()
+                    return
 
-        # Dibujar el inventario si está activo
-        inventario.dibujar_inventario(SCREEN)
+            # Dibujar el inventario si está activo
+            inventario.dibujar_inventario(SCREEN)
         
-        # Actualizar la screen
-        pygame.display.update()
+            PROFILER.dibujar(SCREEN)
+        
+            # Actualizar la screen
+            with PROFILER.medir("pantalla"):
+                pygame.display.update()
 
 def game_with_bot(bot_difficulty):
     """
@@ -857,18 +926,15 @@ def game_with_bot(bot_difficulty):
     
     # --- cargar mapa ---
     try:
-        with open(CACHE_DIR / "map.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        city_map = CityMap(**data)
+        # Grilla compilada (.cqmap) mapeada en memoria; se genera desde map.json si falta o quedó vieja
+        city_map = MapaCompilado.cargar(CACHE_DIR / "map.json")
     except Exception as e:
         print(f"Error cargando mapa: {e}")
         return
     
     # --- cargar clima ---
     try:
-        with open(CACHE_DIR / "TigerCity_weather.json", "r", encoding="utf-8") as f:
-            clima_data = json.load(f)
-        clima = ClimaData(**clima_data)
+        clima = CacheConfiable.cargar(CACHE_DIR / "TigerCity_weather.json", ClimaData)
         sistema_clima = SistemaClima(clima)
     except Exception as e:
         print(f"Error cargando clima: {e}")
@@ -894,7 +960,7 @@ def game_with_bot(bot_difficulty):
     
     # --- inicializar renderer y lógica del mapa ---
     renderer = MapRenderer(city_map, SPRITES_DIR, TILE_WIDTH, TILE_HEIGHT, viewport_size=(MAP_WIDTH, MAP_HEIGHT))
-    map_logic = MapLogic(city_map, TILE_WIDTH, TILE_HEIGHT)
+    map_logic = MapLogic(city_map, TILE_WIDTH, TILE_HEIGHT, cache_dir=CACHE_DIR)
     
     # --- Stats y reputación SEPARADOS ---
     player_stats = Stats()
@@ -919,6 +985,7 @@ def game_with_bot(bot_difficulty):
         start_x=start_x_player, start_y=start_y_player,
         save_data=None, player_name=player_name
     )
+    notificador.configurar_mapa(map_logic, map_logic.get_player_tile_pos(player.rect))
     
     # --- Crear BOT ---
     bot = Bot(
@@ -932,8 +999,17 @@ def game_with_bot(bot_difficulty):
     )
     
     # --- Sistemas de deshacer y inventarios SEPARADOS ---
-    undo_system = UndoSystem(10000)
+    MoveJournal.limpiar_antiguas(JOURNAL_DIR)
+    journal = MoveJournal(JOURNAL_DIR / f"{uuid.uuid4()}.journal")
+    undo_system = UndoSystem(10000, journal=journal)
     undo_system.save_state(player, 0, [])
+
+    def terminar_partida():
+        """Cierra la bitácora y el mapa y escribe los eventos de score pendientes; se llama en cada salida de la partida"""
+        journal.cerrar()
+        player.score.events.flush()
+        bot.score.events.flush()
+        city_map.cerrar()
     
     inventario_player = InventarioPedidos(max_weight=10, screen_width=WINDOW_WIDTH, screen_height=WINDOW_HEIGHT)
     inventario_bot = InventarioPedidos(max_weight=10, screen_width=WINDOW_WIDTH, screen_height=WINDOW_HEIGHT)
@@ -965,7 +1041,7 @@ def game_with_bot(bot_difficulty):
         pedidos_en_inventario = inventario_player.get_orders()
         
         if pedido_a_entregar in pedidos_en_inventario:
-            tiempo_limite = pedido_a_entregar.release_time + pedido_a_entregar.duration
+            tiempo_limite = pedido_a_entregar.deadline
             delay_seconds = tiempo_actual_segundos - tiempo_limite
             
             if delay_seconds <= -30:
@@ -998,299 +1074,313 @@ def game_with_bot(bot_difficulty):
     tiempo_inicio_pausa = None
     juego_pausado = False
     
+    # Manejador de eventos persistente; los pedidos del bot se excluyen al recoger
+    pedidos_data_player = {
+        'pedidos': pedidos,
+        'pedidos_recogidos': pedidos_recogidos_player,
+        'pedidos_entregados': pedidos_entregados_player,
+        'pedidos_excluidos': [pedidos_recogidos_bot, pedidos_entregados_bot],
+        'es_adyacente_func': es_adyacente
+    }
+    
+    event_handler = Events(
+        player, gestor_player, notificador, undo_system, inventario_player,
+        recoger_callback=recoger_paquete_player,
+        entregar_callback=entregar_paquete_player,
+        pedidos_data=pedidos_data_player,
+        map_logic=map_logic,
+        sistema_clima=sistema_clima,
+        profiler=PROFILER
+    )
+    
     while running:
         dt = clock.tick(60) / 1000.0
+        with PROFILER.frame():
         
-        # Manejo de pausa
-        hay_notificacion_activa = notificador.activo
+            # Manejo de pausa
+            hay_notificacion_activa = notificador.activo
         
-        if hay_notificacion_activa and not juego_pausado:
-            juego_pausado = True
-            tiempo_inicio_pausa = pygame.time.get_ticks()
-        elif not hay_notificacion_activa and juego_pausado and tiempo_inicio_pausa is not None:
-            juego_pausado = False
-            tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-            tiempo_inicio_pausa = None
+            if hay_notificacion_activa and not juego_pausado:
+                juego_pausado = True
+                tiempo_inicio_pausa = pygame.time.get_ticks()
+            elif not hay_notificacion_activa and juego_pausado and tiempo_inicio_pausa is not None:
+                juego_pausado = False
+                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                tiempo_inicio_pausa = None
         
-        # Calcular tiempo actual
-        tiempo_actual_ms = pygame.time.get_ticks() - tiempo_inicio - tiempo_total_pausado
-        if juego_pausado and tiempo_inicio_pausa is not None:
-            tiempo_actual_ms -= (pygame.time.get_ticks() - tiempo_inicio_pausa)
+            # Calcular tiempo actual
+            tiempo_actual_ms = pygame.time.get_ticks() - tiempo_inicio - tiempo_total_pausado
+            if juego_pausado and tiempo_inicio_pausa is not None:
+                tiempo_actual_ms -= (pygame.time.get_ticks() - tiempo_inicio_pausa)
         
-        tiempo_actual_segundos = max(0, tiempo_actual_ms // 1000)
+            tiempo_actual_segundos = max(0, tiempo_actual_ms // 1000)
         
-        # Actualizar notificador
-        if not juego_pausado:
-            notificador.actualizar(tiempo_actual_segundos)
+            # Actualizar notificador
+            if not juego_pausado:
+                with PROFILER.medir("notificador"):
+                    notificador.actualizar(tiempo_actual_segundos)
         
-        # --- CONDICIONES DE FIN DEL JUEGO ---
-        if not juego_pausado:
-            player_score = player.score.calcular_total()
-            bot_score = bot.score.calcular_total()
+            # --- CONDICIONES DE FIN DEL JUEGO ---
+            if not juego_pausado:
+                player_score = player.score.calcular_total()
+                bot_score = bot.score.calcular_total()
             
-            # Fin por tiempo agotado
-            if tiempo_actual_segundos >= TIEMPO_TOTAL_JORNADA:
-                # Determinar ganador por puntaje
-                if player_score > bot_score:
-                    resultado = "player_win"
-                elif bot_score > player_score:
-                    resultado = "bot_win"
-                else:
-                    resultado = "empate"
+                # Fin por tiempo agotado
+                if tiempo_actual_segundos >= TIEMPO_TOTAL_JORNADA:
+                    # Determinar ganador por puntaje
+                    if player_score > bot_score:
+                        resultado = "player_win"
+                    elif bot_score > player_score:
+                        resultado = "bot_win"
+                    else:
+                        resultado = "empate"
                 
-                # Guardar scores
-                player.score.save_scoreboard(player_name)
-                bot.score.save_scoreboard(bot.name)
+                    # Guardar scores
+                    player.score.save_scoreboard(player_name, ciudad=city_map.city_name, dificultad=bot_difficulty)
+                    bot.score.save_scoreboard(bot.name, ciudad=city_map.city_name, dificultad=bot_difficulty)
                 
-                mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name)
-                return
+                    mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name, ciudad=city_map.city_name, guardar_score=False)
+                    terminar_partida()
+                    return
             
-            # Victoria anticipada
-            if player_score >= META_INGRESOS and bot_score < META_INGRESOS:
-                player.score.save_scoreboard(player_name)
-                bot.score.save_scoreboard(bot.name)
-                mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name)
-                return
-            elif bot_score >= META_INGRESOS and player_score < META_INGRESOS:
-                player.score.save_scoreboard(player_name)
-                bot.score.save_scoreboard(bot.name)
-                mostrar_pantalla_derrota(player, tiempo_actual_segundos, "El bot ganó", player_name)
-                return
+                # Victoria anticipada
+                if player_score >= META_INGRESOS and bot_score < META_INGRESOS:
+                    player.score.save_scoreboard(player_name, ciudad=city_map.city_name, dificultad=bot_difficulty)
+                    bot.score.save_scoreboard(bot.name, ciudad=city_map.city_name, dificultad=bot_difficulty)
+                    mostrar_pantalla_victoria(player, tiempo_actual_segundos, player_name, ciudad=city_map.city_name, guardar_score=False)
+                    terminar_partida()
+                    return
+                elif bot_score >= META_INGRESOS and player_score < META_INGRESOS:
+                    player.score.save_scoreboard(player_name, ciudad=city_map.city_name, dificultad=bot_difficulty)
+                    bot.score.save_scoreboard(bot.name, ciudad=city_map.city_name, dificultad=bot_difficulty)
+                    mostrar_pantalla_derrota(player, tiempo_actual_segundos, "El bot ganó", player_name, ciudad=city_map.city_name, guardar_score=False)
+                    terminar_partida()
+                    return
         
-        if not juego_pausado:
-            sistema_clima.actualizar()
-        
-        pedidos_data_player = {
-            'pedidos': [p for p in pedidos if p not in pedidos_recogidos_bot and p not in pedidos_entregados_bot],
-            'pedidos_recogidos': pedidos_recogidos_player,
-            'pedidos_entregados': pedidos_entregados_player,
-            'es_adyacente_func': es_adyacente
-        }
-        
-        event_handler = Events(
-            player, gestor_player, notificador, undo_system, inventario_player,
-            recoger_callback=recoger_paquete_player,
-            entregar_callback=entregar_paquete_player,
-            pedidos_data=pedidos_data_player,
-            map_logic=map_logic,
-            sistema_clima=sistema_clima,
-            tiempo_actual=lambda: tiempo_actual_segundos
-        )
+            if not juego_pausado:
+                with PROFILER.medir("clima"):
+                    sistema_clima.actualizar()
+        
+            event_handler.actualizar(tiempo_actual_segundos)
+            with PROFILER.medir("eventos"):
+                accion = event_handler.procesar_eventos()
+        
+            if accion == "salir":
+                terminar_partida()
+                pygame.quit()
+                sys.exit()
         
-        accion = event_handler.procesar_eventos()
-        
-        if accion == "salir":
-            pygame.quit()
-            sys.exit()
-        
-        if accion == "pausa":
-            game_state_data = {
-                'player': player,
-                'bot': bot,
-                'pedidos': pedidos,
-                'pedidos_recogidos_player': pedidos_recogidos_player,
-                'pedidos_entregados_player': pedidos_entregados_player,
-                'pedidos_recogidos_bot': pedidos_recogidos_bot,
-                'pedidos_entregados_bot': pedidos_entregados_bot,
-                'inventario_player': inventario_player,
-                'inventario_bot': inventario_bot,
-                'gestor_player': gestor_player,
-                'gestor_bot': gestor_bot,
-                'notificador': notificador,
-                'sistema_clima': sistema_clima,
-                'tiempo_actual': tiempo_actual_segundos,
-                'tiempo_pausado': tiempo_total_pausado,
-                'tiempo_inicio': tiempo_inicio,
-                'day': 1,
-                'bot_difficulty': bot_difficulty
-            }
+            if accion == "pausa":
+                game_state_data = {
+                    'player': player,
+                    'bot': bot,
+                    'pedidos': pedidos,
+                    'pedidos_recogidos_player': pedidos_recogidos_player,
+                    'pedidos_entregados_player': pedidos_entregados_player,
+                    'pedidos_recogidos_bot': pedidos_recogidos_bot,
+                    'pedidos_entregados_bot': pedidos_entregados_bot,
+                    'inventario_player': inventario_player,
+                    'inventario_bot': inventario_bot,
+                    'gestor_player': gestor_player,
+                    'gestor_bot': gestor_bot,
+                    'notificador': notificador,
+                    'sistema_clima': sistema_clima,
+                    'tiempo_actual': tiempo_actual_segundos,
+                    'tiempo_pausado': tiempo_total_pausado,
+                    'tiempo_inicio': tiempo_inicio,
+                    'day': 1,
+                    'bot_difficulty': bot_difficulty
+                }
             
-            paused = pause(player, player_stats, player_rep, gestor_player, 
-                          f"{city_map.city_name} - VS Bot ({bot_difficulty.upper()})", 
-                          game_state_data)
+                paused = pause(player, player_stats, player_rep, gestor_player, 
+                              f"{city_map.city_name} - VS Bot ({bot_difficulty.upper()})", 
+                              game_state_data)
             
-            if juego_pausado and tiempo_inicio_pausa is not None:
-                tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
-                juego_pausado = False
-                tiempo_inicio_pausa = None
+                if juego_pausado and tiempo_inicio_pausa is not None:
+                    tiempo_total_pausado += pygame.time.get_ticks() - tiempo_inicio_pausa
+                    juego_pausado = False
+                    tiempo_inicio_pausa = None
             
-            if not paused:
-                return  # Volver al menú principal
+                if not paused:
+                    terminar_partida()
+                    return  # Volver al menú principal
         
-        keys = pygame.key.get_pressed()
-        if not juego_pausado:
-            event_handler.manejar_movimiento(keys, dt)
+            keys = pygame.key.get_pressed()
+            if not juego_pausado:
+                with PROFILER.medir("movimiento"):
+                    event_handler.manejar_movimiento(keys, dt)
             
-            pedidos_disponibles_bot = [
-                p for p in pedidos
-                if p.id in notificador.pedidos_mostrados  
-                and p not in pedidos_recogidos_player  
-                and p not in pedidos_entregados_player  
-                and p not in pedidos_recogidos_bot 
-                and p not in pedidos_entregados_bot  
-            ]
+                with PROFILER.medir("bot"):
+                    pedidos_disponibles_bot = [
+                        p for p in pedidos
+                        if p.id in notificador.pedidos_mostrados  
+                        and p.alcanzable is not False
+                        and p not in pedidos_recogidos_player  
+                        and p not in pedidos_entregados_player  
+                        and p not in pedidos_recogidos_bot 
+                        and p not in pedidos_entregados_bot  
+                    ]
             
-            clima_factor = sistema_clima.obtener_efectos().get('velocidad_movimiento', 1.0)
-            bot.update(dt=dt, pedidos=pedidos_disponibles_bot, clima_factor=clima_factor)
+                    clima_factor = sistema_clima.obtener_efectos().get('velocidad_movimiento', 1.0)
+                    bot.update(dt=dt, pedidos=pedidos_disponibles_bot, clima_factor=clima_factor)
             
-            # Bot recoge paquetes automáticamente
-            for pedido in pedidos_disponibles_bot:
-                if pedido not in pedidos_recogidos_bot:
-                    pickup_tile = tuple(pedido.pickup)
-                    bot_tile = map_logic.get_player_tile_pos(bot.rect)
-                    if es_adyacente(bot_tile, pickup_tile):
-                        if inventario_bot.can_accept(pedido):
-                            if inventario_bot.accept_order(pedido):
-                                pedidos_recogidos_bot.append(pedido)
-                                print(f"[BOT] Paquete {pedido.id} recogido")
+                    # Bot recoge paquetes automáticamente
+                    for pedido in pedidos_disponibles_bot:
+                        if pedido not in pedidos_recogidos_bot:
+                            pickup_tile = pedido.pickup
+                            bot_tile = map_logic.get_player_tile_pos(bot.rect)
+                            if es_adyacente(bot_tile, pickup_tile):
+                                if inventario_bot.can_accept(pedido):
+                                    if inventario_bot.accept_order(pedido):
+                                        pedidos_recogidos_bot.append(pedido)
+                                        print(f"[BOT] Paquete {pedido.id} recogido")
             
-            # Bot entrega paquetes automáticamente
-            for pedido in inventario_bot.get_orders():
-                if pedido not in pedidos_entregados_bot:
-                    dropoff_tile = tuple(pedido.dropoff)
-                    bot_tile = map_logic.get_player_tile_pos(bot.rect)
-                    if es_adyacente(bot_tile, dropoff_tile):
-                        tiempo_limite = pedido.release_time + pedido.duration
-                        delay_seconds = tiempo_actual_segundos - tiempo_limite
+                    # Bot entrega paquetes automáticamente
+                    for pedido in inventario_bot.get_orders():
+                        if pedido not in pedidos_entregados_bot:
+                            dropoff_tile = pedido.dropoff
+                            bot_tile = map_logic.get_player_tile_pos(bot.rect)
+                            if es_adyacente(bot_tile, dropoff_tile):
+                                tiempo_limite = pedido.deadline
+                                delay_seconds = tiempo_actual_segundos - tiempo_limite
                         
-                        if delay_seconds <= -30:
-                            estado_entrega = "temprano"
-                        elif delay_seconds <= 0:
-                            estado_entrega = "a_tiempo"
-                        else:
-                            estado_entrega = "tarde"
+                                if delay_seconds <= -30:
+                                    estado_entrega = "temprano"
+                                elif delay_seconds <= 0:
+                                    estado_entrega = "a_tiempo"
+                                else:
+                                    estado_entrega = "tarde"
                         
-                        bot.reputation.registrar_entrega(estado_entrega, max(0, delay_seconds))
-                        inventario_bot.reject_order(pedido)
-                        ganado = bot.score.agregar_ingreso(pedido.payout, bot.reputation.valor)
+                                bot.reputation.registrar_entrega(estado_entrega, max(0, delay_seconds))
+                                inventario_bot.reject_order(pedido)
+                                ganado = bot.score.agregar_ingreso(pedido.payout, bot.reputation.valor)
                         
-                        if estado_entrega == "temprano":
-                            bono = pedido.payout * 0.1
-                            bot.score.agregar_bono(bono, "Entrega temprana")
-                        elif estado_entrega == "tarde":
-                            penalizacion = pedido.payout * 0.1
-                            bot.score.agregar_penalizacion(penalizacion, f"Retraso de {delay_seconds}s")
+                                if estado_entrega == "temprano":
+                                    bono = pedido.payout * 0.1
+                                    bot.score.agregar_bono(bono, "Entrega temprana")
+                                elif estado_entrega == "tarde":
+                                    penalizacion = pedido.payout * 0.1
+                                    bot.score.agregar_penalizacion(penalizacion, f"Retraso de {delay_seconds}s")
                         
-                        pedidos_entregados_bot.append(pedido)
-                        print(f"[BOT] Paquete {pedido.id} entregado. Pago: ${ganado:.0f}")
-        
-        SCREEN.fill((0, 0, 0))
-        renderer.draw(SCREEN)
-        
-        # Dibujar paquetes
-        pedidos_activos_player = gestor_player.ver_pedidos()
-        pedidos_activos_bot = gestor_bot.ver_pedidos()
-        
-        pedidos_ids_vistos = set()
-        todos_pedidos = []
-        for pedido in pedidos_activos_player + pedidos_activos_bot:
-            if pedido.id not in pedidos_ids_vistos:
-                todos_pedidos.append(pedido)
-                pedidos_ids_vistos.add(pedido.id)
-        
-        recogidos_ids_vistos = set()
-        todos_recogidos = []
-        for pedido in pedidos_recogidos_player + pedidos_recogidos_bot:
-            if pedido.id not in recogidos_ids_vistos:
-                todos_recogidos.append(pedido)
-                recogidos_ids_vistos.add(pedido.id)
-        
-        entregados_ids_vistos = set()
-        todos_entregados = []
-        for pedido in pedidos_entregados_player + pedidos_entregados_bot:
-            if pedido.id not in entregados_ids_vistos:
-                todos_entregados.append(pedido)
-                entregados_ids_vistos.add(pedido.id)
-        
-        renderer.draw_package_icons(SCREEN, todos_pedidos, todos_recogidos, todos_entregados)
-        
-        debug_color = (200, 200, 200, 100)
-        for x in range(0, MAP_WIDTH, TILE_WIDTH):
-            pygame.draw.line(SCREEN, debug_color, (x, 0), (x, MAP_HEIGHT), 1)
-        for y in range(0, MAP_HEIGHT, TILE_HEIGHT):
-            pygame.draw.line(SCREEN, debug_color, (0, y), (MAP_WIDTH, y), 1)
-        
-        player.draw(SCREEN)
-        bot.draw(SCREEN)
-        
-        # --- HUD DUAL ---
-        tiempo_restante_segundos = max(0, TIEMPO_TOTAL_JORNADA - tiempo_actual_segundos)
-        minutos = tiempo_restante_segundos // 60
-        segundos = tiempo_restante_segundos % 60
-        
-        player_score = player.score.calcular_total()
-        bot_score = bot.score.calcular_total()
-        
-        # Información adicional del bot según dificultad
-        bot_extra_info = []
-        if bot_difficulty == Bot.HARD and hasattr(bot, 'delivery_sequence'):
-            if bot.delivery_sequence:
-                bot_extra_info.append(f"Secuencia: {len(bot.delivery_sequence)} entregas")
-        
-        hud_lines = [
-            f"Tiempo: {minutos:02d}:{segundos:02d}",
-            "",
-            f"=== {player.name} (TÚ) ===",
-            f"Score: ${player_score:.0f} / ${META_INGRESOS}",
-            f"Rep: {player.reputation.valor:.1f}",
-            f"Resist: {player.stats.resistencia:.1f}",
-            f"Inventario: {len(inventario_player.get_orders())} paquetes",
-            "",
-            f"=== {bot.name} ({bot_difficulty.upper()}) ===",
-            f"Score: ${bot_score:.0f} / ${META_INGRESOS}",
-            f"Rep: {bot.reputation.valor:.1f}",
-            f"Resist: {bot.stats.resistencia:.1f}",
-            f"Inventario: {len(inventario_bot.get_orders())} paquetes",
-            f"Tarea: {bot.current_task or 'ninguna'}",
-        ]
-        
-        # Agregar información extra del bot
-        hud_lines.extend(bot_extra_info)
-        
-        hud_lines.extend([
-            "",
-            f"Clima: {sistema_clima.obtener_condicion()}",
-            f"Factor: {clima_factor:.2f}",
-            "",
-            "CONTROLES:",
-            "Flechas = Mover",
-            "N = Recoger paquete",
-            "M = Entregar paquete",
-            "I = Ver inventario",
-            "ESC = Pausa"
-        ])
-        
-        for i, line in enumerate(hud_lines):
-            hud_surface = get_font(8).render(line, True, (255, 255, 255))
-            SCREEN.blit(hud_surface, (MAP_WIDTH + 10, 8 + i * 18))
-        
-        # Dibujar notificación
-        notificador.dibujar(SCREEN)
-        
-        # Dibujar inventario
-        inventario_player.dibujar_inventario(SCREEN)
-        
-        pygame.display.update()
+                                pedidos_entregados_bot.append(pedido)
+                                print(f"[BOT] Paquete {pedido.id} entregado. Pago: ${ganado:.0f}")
+        
+            SCREEN.fill((0, 0, 0))
+            with PROFILER.medir("mapa"):
+                renderer.draw(SCREEN)
+        
+            # Dibujar paquetes
+            pedidos_activos_player = gestor_player.ver_pedidos()
+            pedidos_activos_bot = gestor_bot.ver_pedidos()
+        
+            pedidos_ids_vistos = set()
+            todos_pedidos = []
+            for pedido in pedidos_activos_player + pedidos_activos_bot:
+                if pedido.id not in pedidos_ids_vistos:
+                    todos_pedidos.append(pedido)
+                    pedidos_ids_vistos.add(pedido.id)
+        
+            recogidos_ids_vistos = set()
+            todos_recogidos = []
+            for pedido in pedidos_recogidos_player + pedidos_recogidos_bot:
+                if pedido.id not in recogidos_ids_vistos:
+                    todos_recogidos.append(pedido)
+                    recogidos_ids_vistos.add(pedido.id)
+        
+            entregados_ids_vistos = set()
+            todos_entregados = []
+            for pedido in pedidos_entregados_player + pedidos_entregados_bot:
+                if pedido.id not in entregados_ids_vistos:
+                    todos_entregados.append(pedido)
+                    entregados_ids_vistos.add(pedido.id)
+        
+            with PROFILER.medir("iconos"):
+                renderer.draw_package_icons(SCREEN, todos_pedidos, todos_recogidos, todos_entregados)
+        
+            debug_color = (200, 200, 200, 100)
+            for x in range(0, MAP_WIDTH, TILE_WIDTH):
+                pygame.draw.line(SCREEN, debug_color, (x, 0), (x, MAP_HEIGHT), 1)
+            for y in range(0, MAP_HEIGHT, TILE_HEIGHT):
+                pygame.draw.line(SCREEN, debug_color, (0, y), (MAP_WIDTH, y), 1)
+        
+            player.draw(SCREEN)
+            bot.draw(SCREEN)
+        
+            # --- HUD DUAL ---
+            with PROFILER.medir("hud"):
+                tiempo_restante_segundos = max(0, TIEMPO_TOTAL_JORNADA - tiempo_actual_segundos)
+                minutos = tiempo_restante_segundos // 60
+                segundos = tiempo_restante_segundos % 60
+        
+                player_score = player.score.calcular_total()
+                bot_score = bot.score.calcular_total()
+        
+                # Información adicional del bot según dificultad
+                bot_extra_info = []
+                if bot_difficulty == Bot.HARD and hasattr(bot, 'delivery_sequence'):
+                    if bot.delivery_sequence:
+                        bot_extra_info.append(f"Secuencia: {len(bot.delivery_sequence)} entregas")
+        
+                hud_lines = [
+                    f"Tiempo: {minutos:02d}:{segundos:02d}",
+                    "",
+                    f"=== {player.name} (TÚ) ===",
+                    f"Score: ${player_score:.0f} / ${META_INGRESOS}",
+                    f"Rep: {player.reputation.valor:.1f}",
+                    f"Resist: {player.stats.resistencia:.1f}",
+                    f"Inventario: {len(inventario_player.get_orders())} paquetes",
+                    "",
+                    f"=== {bot.name} ({bot_difficulty.upper()}) ===",
+                    f"Score: ${bot_score:.0f} / ${META_INGRESOS}",
+                    f"Rep: {bot.reputation.valor:.1f}",
+                    f"Resist: {bot.stats.resistencia:.1f}",
+                    f"Inventario: {len(inventario_bot.get_orders())} paquetes",
+                    f"Tarea: {bot.current_task or 'ninguna'}",
+                ]
+        
+                # Agregar información extra del bot
+                hud_lines.extend(bot_extra_info)
+        
+                hud_lines.extend([
+                    "",
+                    f"Clima: {sistema_clima.obtener_condicion()}",
+                    f"Factor: {clima_factor:.2f}",
+                    "",
+                    "CONTROLES:",
+                    "Flechas = Mover",
+                    "N = Recoger paquete",
+                    "M = Entregar paquete",
+                    "T = Rebobinar 30s",
+                    "I = Ver inventario",
+                    "F3 = Perfil de frames",
+                    "ESC = Pausa"
+                ])
+        
+                for i, line in enumerate(hud_lines):
+                    hud_surface = get_font(8).render(line, True, (255, 255, 255))
+                    SCREEN.blit(hud_surface, (MAP_WIDTH + 10, 8 + i * 18))
+        
+            # Dibujar notificación
+            notificador.dibujar(SCREEN)
+        
+            # Dibujar inventario
+            inventario_player.dibujar_inventario(SCREEN)
+        
+            # Overlay del perfilador (F3)
+            PROFILER.dibujar(SCREEN)
+        
+            with PROFILER.medir("pantalla"):
+                pygame.display.update()
 
 def show_scoreboard():
     """Muestra la pantalla del scoreboard con el top de jugadores"""
     pygame.display.set_caption("Courier Quest - Score Board")
     
-    # Cargar scores desde el archivo
-    from pathlib import Path
-    import json
-    
-    score_file = Path("src/game/saves/savedScores.json")
-    scores = []
-    
-    if score_file.exists():
-        try:
-            with open(score_file, 'r', encoding='utf-8') as f:
-                scores = json.load(f)
-                if not isinstance(scores, list):
-                    scores = []
-        except (json.JSONDecodeError, FileNotFoundError):
-            scores = []
+    # Solo se leen los top-K ya mantenidos por el ScoreBoard (no todo el historial)
+    board = ScoreBoard.para_directorio(BASE_DIR / "src" / "game" / "saves")
+    tableros = board.tableros() or [(None, None)]
+    tablero_actual = 0
+    scores = board.top(*tableros[tablero_actual])
     
     while True:
         SCREEN.blit(BG, (0, 0))
@@ -1301,6 +1391,13 @@ def show_scoreboard():
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 80))
         SCREEN.blit(title, title_rect)
         
+        # Tablero seleccionado (global, por ciudad y/o dificultad)
+        ciudad, dificultad = tableros[tablero_actual]
+        subtitle = get_font(14).render(
+            f"< {ciudad or 'Todas las ciudades'} | {(dificultad or 'Todas').upper()} >", True, (200, 200, 200)
+        )
+        SCREEN.blit(subtitle, subtitle.get_rect(center=(WINDOW_WIDTH // 2, 120)))
+        
         # Mostrar scores
         if scores:
             # Limitar a top 10
@@ -1348,7 +1445,7 @@ def show_scoreboard():
         
         # Botón de regreso
         back_font = get_font(16)
-        back_text = back_font.render("Presiona ESC para volver al menú", True, (150, 150, 150))
+        back_text = back_font.render("ESC volver al menú | <- -> cambiar tablero", True, (150, 150, 150))
         back_rect = back_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
         SCREEN.blit(back_text, back_rect)
         
@@ -1360,6 +1457,10 @@ def show_scoreboard():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return  # Volver al menú principal
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    paso = 1 if event.key == pygame.K_RIGHT else -1
+                    tablero_actual = (tablero_actual + paso) % len(tableros)
+                    scores = board.top(*tableros[tablero_actual])
         
         pygame.display.update()
 
@@ -1487,7 +1588,7 @@ def pause(player, stats, rep, gestor, original_caption, game_state_data=None):
                                 day=1,
                                 current_weather="clear"
                             )
-                            save_id = Save.save_score_only_global()
+                            save_id = save_data.save_score_only_global()
 
                         save_score = save
 
@@ -1,37 +1,214 @@
 import requests
 import json
 import csv
+import io
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from src.api.cache_confiable import CacheConfiable
+from src.api.circuit_breaker import CircuitBreaker, CircuitoAbierto
+from src.api.job_cache import JobsColumnar
+from src.api.json_stream import iterar_arreglo
+from src.game.map_pipeline import PreprocesadorMapa
 from src.models.ClimaData import ClimaData
 from src.models.Pedido import PedidoSolicitud
 from src.models.CityMap import CityMap
+from src.models.MapaCompilado import MapaCompilado
 
 
 class ManejadorAPI:
     BASE_URL = "https://tigerds-api.kindflower-ccaf48b6.eastus.azurecontainerapps.io"
 
-    def __init__(self, cache_dir: str = "cache", default_duration: int = 50):
+    # (conexión, lectura) en segundos por endpoint; sin timeout una API colgada congela el menú
+    TIMEOUTS: Dict[str, Tuple[float, float]] = {
+        "weather": (3.05, 5.0),
+        "jobs": (3.05, 10.0),
+        "map": (3.05, 15.0),  # El mapa es la respuesta más grande
+    }
+
+    # Reintentos ante errores de red, 429 y 5xx: espera exponencial con jitter completo
+    REINTENTOS = 2
+    BACKOFF_BASE = 0.25
+    BACKOFF_TOPE = 4.0
+    REINTENTAR_STATUS = {429, 500, 502, 503, 504}
+
+    # Circuito compartido por URL base: tras varios fallos seguidos se usa la caché sin esperar a la red
+    FALLOS_PARA_ABRIR = 3
+    ENFRIAMIENTO = 30.0
+    _circuitos: Dict[str, CircuitBreaker] = {}
+
+    TAM_BLOQUE = 1 << 16  # Bytes por lectura al recorrer respuestas grandes en streaming
+    COLUMNAS_JOBS_CSV = [
+        "id", "pickup_x", "pickup_y", "dropoff_x", "dropoff_y",
+        "payout", "duration", "weight", "priority", "release_time"
+    ]
+
+    # Metadatos de validación por endpoint: ETag, Last-Modified y hora de la última descarga
+    META_FILE = "api_cache.json"
+    TTL = 60.0  # Segundos en que la caché se usa sin consultar a la API
+
+    def __init__(self, cache_dir: str = "cache", default_duration: int = 50,
+                 timeout: Optional[Union[float, Tuple[float, float]]] = None, ttl: Optional[float] = None,
+                 reintentos: Optional[int] = None, pool_connections: int = 4, pool_maxsize: int = 8):
         self.session = requests.Session()
         self.session.headers.update({"accept": "application/json"})
+        # Los reintentos los maneja _get_con_reintentos (con jitter y circuito), no urllib3
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)  # crea carpeta si no existe
         self.default_duration = default_duration
+        self.timeout = timeout  # Si se indica, reemplaza a TIMEOUTS para todos los endpoints
+        self.reintentos = self.REINTENTOS if reintentos is None else reintentos
+        self.ttl = self.TTL if ttl is None else ttl
+        self._meta_path = self.cache_dir / self.META_FILE
+        self._meta_lock = threading.Lock()  # update_data descarga en varios hilos
+        self._meta: Dict[str, Dict[str, Any]] = self._cargar_meta()
+
+    # ===================== RED =====================
+    @property
+    def circuito(self) -> CircuitBreaker:
+        if self.BASE_URL not in self._circuitos:
+            self._circuitos[self.BASE_URL] = CircuitBreaker(self.FALLOS_PARA_ABRIR, self.ENFRIAMIENTO)
+        return self._circuitos[self.BASE_URL]
+
+    def _timeout_de(self, endpoint: str) -> Union[float, Tuple[float, float]]:
+        return self.timeout or self.TIMEOUTS.get(endpoint, (3.05, 10.0))
+
+    def _espera(self, intento: int, response: Optional[requests.Response] = None) -> float:
+        """Segundos antes del siguiente intento; respeta Retry-After si el servidor lo envía"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(self.BACKOFF_TOPE, float(retry_after))
+        return random.uniform(0, min(self.BACKOFF_TOPE, self.BACKOFF_BASE * 2 ** intento))
+
+    def _get_con_reintentos(self, url: str, timeout, **kwargs) -> requests.Response:
+        """
+        GET con reintentos. Un pedido que agota los intentos cuenta como un fallo
+        del circuito; cualquier respuesta que no sea 429/5xx lo cierra.
+        """
+        error: Optional[Exception] = None
+        for intento in range(self.reintentos + 1):
+            response = None
+            try:
+                response = self.session.get(url, timeout=timeout, **kwargs)
+                if response.status_code not in self.REINTENTAR_STATUS:
+                    self.circuito.exito()
+                    return response
+                response.close()  # Con stream=True la conexión vuelve al pool solo al cerrarla
+                error = requests.HTTPError(f"{response.status_code} para {url}", response=response)
+            except requests.RequestException as e:
+                # Cualquier error de requests (redirecciones, respuesta cortada, etc.) se reintenta
+                error = e
+            except Exception:
+                # Error inesperado: igual cuenta como fallo, así el circuito semiabierto libera su prueba
+                self.circuito.fallo()
+                raise
+            if intento < self.reintentos:
+                time.sleep(self._espera(intento, response))
+        self.circuito.fallo()
+        raise error
+
+    # ===================== CACHÉ =====================
+    def _cargar_meta(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[WARNING] Metadatos de caché inválidos ({e}), se descargará todo de nuevo")
+            return {}
+
+    def _actualizar_meta(self, clave: str, **valores) -> None:
+        with self._meta_lock:
+            self._meta.setdefault(clave, {}).update(valores)
+            tmp_path = self._meta_path.with_name(self._meta_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._meta, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, self._meta_path)
+
+    def _obtener(self, clave: str, url: str, archivo: str, forzar: bool = False, usar_cache: bool = True,
+                 params: Optional[Dict[str, Any]] = None, stream: bool = False) -> Optional[requests.Response]:
+        """
+        Descarga un endpoint validando contra la caché. Devuelve la respuesta con
+        datos nuevos, o None si hay que usar `archivo` de la caché:
+        - dentro del TTL (y sin `forzar`) no se hace ninguna solicitud;
+        - si no, se envía If-None-Match / If-Modified-Since y un 304 solo renueva la hora;
+        - sin red (o con error del servidor, tras los reintentos) se usa la caché si existe;
+        - con el circuito abierto se usa la caché directamente, sin tocar la red.
+        Con `usar_cache=False` siempre se descarga.
+        """
+        entrada = self._meta.get(clave, {})
+        en_cache = usar_cache and bool(entrada) and (self.cache_dir / archivo).exists()
+        if en_cache and not forzar and time.time() - entrada.get("fetched_at", 0) < self.ttl:
+            return None
+
+        headers = {}
+        if en_cache:
+            if entrada.get("etag"):
+                headers["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                headers["If-Modified-Since"] = entrada["last_modified"]
+
+        if not self.circuito.permitir():
+            if en_cache:
+                return None
+            raise CircuitoAbierto(f"La API falló repetidamente y no hay {archivo} en caché")
+
+        try:
+            response = self._get_con_reintentos(url, self._timeout_de(clave.split(":")[0]),
+                                                params=params, headers=headers, stream=stream)
+            if response.status_code == 304 and en_cache:
+                response.close()
+                self._actualizar_meta(clave, fetched_at=time.time())
+                return None
+            if not response.ok:
+                response.close()  # Con stream=True la conexión quedaba tomada al salir con el error
+                response.raise_for_status() #Esto permite recibir respuesta del HTTP para la carga de datos
+        except requests.RequestException as e:
+            if not en_cache:
+                raise
+            print(f"[WARNING] No se pudo consultar {url} ({e}), se usa la caché")
+            return None
+        return response
+
+    def _registrar_descarga(self, clave: str, response: requests.Response) -> None:
+        """Guarda los validadores después de escribir los archivos de caché"""
+        self._actualizar_meta(
+            clave,
+            fetched_at=time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
 
     # ===================== CLIMA =====================
     #Carga la información del clima a clima data.
-    def get_weather(self, city: str, mode: str = "seed", save: bool = True) -> ClimaData:
+    def get_weather(self, city: str, mode: str = "seed", save: bool = True, forzar: bool = False) -> ClimaData:
         url = f"{self.BASE_URL}/city/weather"
         params = {"city": city, "mode": mode}
+        clave = f"weather:{city}:{mode}"
+        archivo = f"{city}_weather.json"
 
-        response = self.session.get(url, params=params)
-        response.raise_for_status() #Esto permite recibir respuesta del HTTP para la carga de datos
+        response = self._obtener(clave, url, archivo, forzar, usar_cache=save, params=params)
+        if response is None:  # La caché sigue vigente
+            return CacheConfiable.cargar(self.cache_dir / archivo, ClimaData)
         payload = response.json()
         clima = ClimaData(**payload["data"])
 
         if save:
-            self.save_to_json(clima, f"{city}_weather.json")
+            self.save_to_json(clima, archivo)
             self.save_to_csv(clima, f"{city}_weather.csv")
+            self._registrar_descarga(clave, response)
 
         return clima
 
@@ -45,6 +222,9 @@ class ManejadorAPI:
                 json.dump(data.dict(), f, indent=4, ensure_ascii=False)
             else:
                 json.dump(data, f, indent=4, ensure_ascii=False)
+        if isinstance(data, BaseModel):
+            # Firma para que la próxima carga pueda saltarse la validación
+            CacheConfiable.firmar(filepath, type(data).__name__)
         print(f"Saved JSON to {filepath}")
 
     #Carga los archivos en formato JSON
@@ -65,16 +245,42 @@ class ManejadorAPI:
         print(f"Transiciones de clima salvados en {filepath}")
 
     # ===================== PEDIDOS =====================
-    def get_jobs(self, save: bool = True) -> List[PedidoSolicitud]:
+    def get_jobs(self, save: bool = True, forzar: bool = False) -> List[PedidoSolicitud]:
         url = f"{self.BASE_URL}/city/jobs"
-        response = self.session.get(url)
-        response.raise_for_status() #Esto permite recibir respuesta del HTTP para la carga de datos
-        payload = response.json()
+        response = self._obtener("jobs", url, "jobs.json", forzar, usar_cache=save, stream=True)
+        if response is None:  # La caché sigue vigente
+            data, confiable = CacheConfiable.leer(self.cache_dir / "jobs.json", PedidoSolicitud.__name__)
+            construir = PedidoSolicitud.model_construct if confiable else PedidoSolicitud
+            return [construir(**job) for job in data]
+
+        # Se parsea el arreglo "data" por partes; no se guarda el payload ni sus dicts completos
+        with response:
+            jobs = list(self.iterar_jobs(response))
+        if save:
+            self.save_jobs_stream(jobs)
+            self._registrar_descarga("jobs", response)
+
+        return jobs
+
+    def descargar_jobs(self, forzar: bool = False) -> bool:
+        """
+        Actualiza jobs.json/jobs.csv sin armar la lista de pedidos: cada pedido se
+        parsea, valida y escribe antes de leer el siguiente, así que la memoria no
+        depende del tamaño del feed. Devuelve False si la caché seguía vigente.
+        """
+        url = f"{self.BASE_URL}/city/jobs"
+        response = self._obtener("jobs", url, "jobs.json", forzar, stream=True)
+        if response is None:
+            return False
+        with response:
+            self.save_jobs_stream(self.iterar_jobs(response))
+        self._registrar_descarga("jobs", response)
+        return True
 
-        # Convierte los pedidos.
-        jobs = []
-        for job in payload["data"]:
-            jobs.append(PedidoSolicitud(
+    def iterar_jobs(self, response: requests.Response) -> Iterator[PedidoSolicitud]:
+        """Convierte los pedidos a medida que llegan del stream HTTP"""
+        for job in iterar_arreglo(response.iter_content(chunk_size=self.TAM_BLOQUE), "data"):
+            yield PedidoSolicitud(
                 id=job["id"],
                 pickup=job["pickup"],
                 dropoff=job["dropoff"],
@@ -83,82 +289,155 @@ class ManejadorAPI:
                 weight=job["weight"],
                 priority=job["priority"],
                 release_time=job["release_time"]
-            ))
+            )
 
-        if save:
-            self.save_to_json([job.dict() for job in jobs], "jobs.json")
-            self.save_jobs_to_csv(jobs, "jobs.csv")
+    def save_jobs_stream(self, jobs: Iterable[PedidoSolicitud], json_name: str = "jobs.json",
+                         csv_name: str = "jobs.csv") -> int:
+        """
+        Escribe jobs.json y jobs.csv en una sola pasada (sirve con un generador).
+        Se escribe a temporales y se reemplaza al final: si la descarga se corta,
+        la caché anterior queda intacta. Devuelve la cantidad de pedidos.
+        Al terminar escribe también la caché columnar jobs.bin (JobsColumnar).
+        """
+        json_path = self.cache_dir / json_name
+        csv_path = self.cache_dir / csv_name
+        json_tmp = json_path.with_name(json_path.name + ".tmp")
+        csv_tmp = csv_path.with_name(csv_path.name + ".tmp")
+        total = 0
+        columnas = JobsColumnar.nuevas_columnas()
+        try:
+            with open(json_tmp, "w", encoding="utf-8") as fj, open(csv_tmp, "w", newline="", encoding="utf-8") as fc:
+                writer = csv.writer(fc)
+                writer.writerow(self.COLUMNAS_JOBS_CSV)
+                fj.write("[")
+                for job in jobs:
+                    datos = job.model_dump() if hasattr(job, "model_dump") else job.dict()
+                    # Un pedido por línea: con indent json usa el encoder en Python puro (varias veces más lento)
+                    fj.write(("\n" if total == 0 else ",\n") + json.dumps(datos, ensure_ascii=False))
+                    writer.writerow(self._fila_csv(job))
+                    if columnas is not None:
+                        try:
+                            JobsColumnar.agregar(columnas, job)
+                        except OverflowError:
+                            columnas = None  # Valor fuera de int32: este feed queda solo en JSON
+                    total += 1
+                fj.write("\n]" if total else "]")
+            os.replace(json_tmp, json_path)
+            os.replace(csv_tmp, csv_path)
+            CacheConfiable.firmar(json_path, PedidoSolicitud.__name__)
+            binario = JobsColumnar.ruta_para(json_path)
+            if columnas is not None:
+                JobsColumnar.escribir(json_path, columnas)
+            elif binario.exists():
+                binario.unlink()
+        finally:
+            for tmp in (json_tmp, csv_tmp):
+                if tmp.exists():
+                    tmp.unlink()
+        print(f"{total} jobs saved to {json_path} and {csv_path}")
+        return total
 
-        return jobs
+    @staticmethod
+    def _fila_csv(job: PedidoSolicitud) -> list:
+        return [
+            job.id,
+            job.pickup[0], job.pickup[1],
+            job.dropoff[0], job.dropoff[1],
+            job.payout,
+            job.duration,   #En sustitución del deadlone, se guarda la duración.
+            job.weight,
+            job.priority,
+            job.release_time
+        ]
 
         #Guarda los pedidos en CSV
-    def save_jobs_to_csv(self, jobs: List[PedidoSolicitud], filename: str):
+    def save_jobs_to_csv(self, jobs: Iterable[PedidoSolicitud], filename: str):
         filepath = self.cache_dir / filename
         with open(filepath, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow([
-                "id", "pickup_x", "pickup_y", "dropoff_x", "dropoff_y",
-                "payout", "duration", "weight", "priority", "release_time"
-            ])
+            writer.writerow(self.COLUMNAS_JOBS_CSV)
             for job in jobs:
-                writer.writerow([
-                    job.id,
-                    job.pickup[0], job.pickup[1],
-                    job.dropoff[0], job.dropoff[1],
-                    job.payout,
-                    job.duration,   #En sustitución del deadlone, se guarda la duración.
-                    job.weight,
-                    job.priority,
-                    job.release_time
-                ])
+                writer.writerow(self._fila_csv(job))
         print(f"Jobs saved to {filepath}")
 
     # ===================== MAPA =====================
     #Recoge la información del mapa para guardarlo en CityMap.
-    def get_map(self, save: bool = True) -> CityMap:
+    def get_map(self, save: bool = True, forzar: bool = False) -> CityMap:
         url = f"{self.BASE_URL}/city/map"
-        response = self.session.get(url)
-        response.raise_for_status() #Esto permite recibir respuesta del HTTP para la carga de datos
+        response = self._obtener("map", url, "map.json", forzar, usar_cache=save)
+        if response is None:  # La caché sigue vigente
+            return self.load_map_from_json("map.json")
         payload = response.json()
 
         city_map = CityMap(**payload["data"])
 
         if save:
-            self.save_to_json(city_map.dict(), "map.json")
+            self.save_to_json(city_map, "map.json")
+            compilado = MapaCompilado.compilar(city_map)
+            try:
+                compilado.escribir(self.cache_dir / "map.json")
+            except OSError as e:
+                # Sin .cqmap el juego lo compila al cargar; la descarga igual queda registrada
+                print(f"[WARNING] No se pudo escribir el mapa compilado: {e}")
+            # Los derivados se indexan por contenido: si el mapa cambió, los del anterior ya no sirven
+            PreprocesadorMapa.limpiar_otros(self.cache_dir, PreprocesadorMapa.hash_contenido(compilado))
             self.save_map_to_csv(city_map, "map.csv")
+            self._registrar_descarga("map", response)
 
         return city_map
 
     #Carga el mapa usando JSON
     def load_map_from_json(self, filename: str = "map.json") -> CityMap:
-        filepath = self.cache_dir / filename
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return CityMap(**data)
+        return CacheConfiable.cargar(self.cache_dir / filename, CityMap)
 
     #Guarda mapa usando CSV
     def save_map_to_csv(self, city_map: CityMap, filename: str):
         filepath = self.cache_dir / filename
+        # Lo que depende de la leyenda (code,name,surface_weight,blocked) se formatea con csv
+        # una sola vez por código; cada fila del mapa se escribe como un único string
+        sufijos = {}
+        buffer = io.StringIO()
+        formato = csv.writer(buffer)
+        for code, info in city_map.legend.items():
+            formato.writerow([code, info.name, info.surface_weight, info.blocked])
+            sufijos[code] = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
         with open(filepath, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
             writer.writerow(["x", "y", "code", "name", "surface_weight", "blocked"])
-            for tile in city_map.iterar_elementos():
-                writer.writerow([
-                    tile.x,
-                    tile.y,
-                    tile.codigo,
-                    tile.name,
-                    tile.surface_weight,
-                    tile.blocked
-                ])
+            for y, fila in enumerate(city_map.tiles):
+                f.write("".join([f"{x},{y},{sufijos[code]}" for x, code in enumerate(fila) if code in sufijos]))
         print(f"Mapa guardado en {filepath}")
 
     #Sirve para la carga general y actualización de archivos.
-    def update_data(self):
-        """Descarga y actualiza todos los datos (clima, jobs, mapa)"""
+    def update_data(self, concurrente: bool = True, forzar: bool = False):
+        """
+        Descarga y actualiza todos los datos (clima, jobs, mapa).
+
+        En modo concurrente las tres descargas van en paralelo sobre la misma
+        sesión (cada hilo usa su propia conexión del pool), y cada una escribe
+        su JSON/CSV apenas llega, mientras las otras siguen esperando la red.
+        El tiempo total es el de la descarga más lenta y no la suma.
+        Lo que sigue vigente en la caché (TTL o 304) no se vuelve a escribir;
+        `forzar` ignora el TTL pero mantiene la validación condicional.
+        """
         print("Actualizando datos desde la API...")
         city = "TigerCity"
-        self.get_weather(city, mode="seed", save=True)
-        self.get_jobs(save=True)
-        self.get_map(save=True)
-        print("Datos actualizados exitosamente")
+        inicio = time.perf_counter()
+        if not concurrente:
+            self.get_weather(city, mode="seed", save=True, forzar=forzar)
+            self.descargar_jobs(forzar=forzar)
+            self.get_map(save=True, forzar=forzar)
+        else:
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="api") as pool:
+                futuros = [
+                    pool.submit(self.get_weather, city, mode="seed", save=True, forzar=forzar),
+                    pool.submit(self.descargar_jobs, forzar=forzar),
+                    pool.submit(self.get_map, save=True, forzar=forzar),
+                ]
+            # Se esperan las tres antes de fallar, para no dejar escrituras a medias
+            for futuro in futuros:
+                futuro.result()
+        print(f"Datos actualizados exitosamente ({time.perf_counter() - inicio:.2f}s)")
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import typing
+from pathlib import Path
+from typing import Any, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+
+class CacheConfiable:
+    """
+    Firma de los archivos de caché que escribe el propio juego.
+
+    Junto a cada archivo (ej. map.json) se guarda `map.json.meta` con la versión
+    del esquema, el modelo y un checksum del contenido. Al cargar, si la firma
+    coincide los modelos se arman con model_construct (sin validar: son datos que
+    ya se validaron al descargarlos); si no coincide, o el archivo se editó a
+    mano, se valida todo como siempre.
+
+    Subir VERSION_ESQUEMA al cambiar los modelos invalida las firmas viejas.
+    """
+
+    VERSION_ESQUEMA = 1
+    EXTENSION_META = ".meta"
+
+    @classmethod
+    def ruta_meta(cls, ruta: Path) -> Path:
+        ruta = Path(ruta)
+        return ruta.with_name(ruta.name + cls.EXTENSION_META)
+
+    @staticmethod
+    def _checksum(contenido: bytes) -> str:
+        return hashlib.blake2b(contenido, digest_size=16).hexdigest()
+
+    # ---------------- Escritura ----------------
+    @classmethod
+    def firmar(cls, ruta: Path, modelo: str) -> None:
+        """Firma un archivo recién escrito. `modelo` es el nombre del modelo que contiene."""
+        ruta = Path(ruta)
+        meta = {
+            "schema": cls.VERSION_ESQUEMA,
+            "modelo": modelo,
+            "checksum": cls._checksum(ruta.read_bytes()),
+        }
+        meta_path = cls.ruta_meta(ruta)
+        tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    # ---------------- Lectura ----------------
+    @classmethod
+    def leer(cls, ruta: Path, modelo: str) -> Tuple[Any, bool]:
+        """Devuelve (datos JSON, si la firma es válida para `modelo`)"""
+        contenido = Path(ruta).read_bytes()
+        return json.loads(contenido), cls._firma_valida(ruta, modelo, contenido)
+
+    @classmethod
+    def _firma_valida(cls, ruta: Path, modelo: str, contenido: bytes) -> bool:
+        try:
+            with open(cls.ruta_meta(ruta), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return False
+        return (
+            isinstance(meta, dict)
+            and meta.get("schema") == cls.VERSION_ESQUEMA
+            and meta.get("modelo") == modelo
+            and meta.get("checksum") == cls._checksum(contenido)
+        )
+
+    @classmethod
+    def cargar(cls, ruta: Path, modelo: Type[BaseModel]) -> BaseModel:
+        """Carga un modelo desde la caché: sin validar si la firma coincide, validando si no"""
+        data, confiable = cls.leer(ruta, modelo.__name__)
+        if confiable:
+            return cls.construir(modelo, data)
+        return modelo(**data)
+
+    @classmethod
+    def construir(cls, modelo: Type[BaseModel], data: dict) -> BaseModel:
+        """model_construct recursivo: también arma los submodelos (model_construct solo no lo hace)"""
+        valores = {}
+        for nombre, campo in modelo.model_fields.items():
+            if nombre in data:
+                valores[nombre] = cls._valor(campo.annotation, data[nombre])
+        return modelo.model_construct(**valores)
+
+    @classmethod
+    def _valor(cls, tipo: Any, valor: Any) -> Any:
+        if valor is None:
+            return None
+        submodelo = cls._submodelo(tipo)
+        if submodelo is not None:
+            return cls.construir(submodelo, valor)
+        origen = typing.get_origin(tipo)
+        argumentos = typing.get_args(tipo)
+        if origen is typing.Union:  # Optional[X]
+            tipo = next((a for a in argumentos if a is not type(None)), tipo)
+            return cls._valor(tipo, valor)
+        if origen in (list, tuple) and argumentos and cls._contiene_modelos(argumentos[0]):
+            return [cls._valor(argumentos[0], v) for v in valor]
+        if origen is dict and len(argumentos) == 2 and cls._contiene_modelos(argumentos[1]):
+            return {k: cls._valor(argumentos[1], v) for k, v in valor.items()}
+        return valor  # Tipos simples (y listas/dicts de tipos simples) se usan tal cual
+
+    @staticmethod
+    def _submodelo(tipo: Any) -> Optional[Type[BaseModel]]:
+        return tipo if isinstance(tipo, type) and issubclass(tipo, BaseModel) else None
+
+    @classmethod
+    def _contiene_modelos(cls, tipo: Any) -> bool:
+        if cls._submodelo(tipo) is not None:
+            return True
+        return any(cls._contiene_modelos(a) for a in typing.get_args(tipo))
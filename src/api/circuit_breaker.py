@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Callable
+
+import requests
+
+
+class CircuitoAbierto(requests.ConnectionError):
+    """La API falló demasiadas veces seguidas y no hay datos en caché para responder"""
+
+
+class CircuitBreaker:
+    """
+    Corta las solicitudes a un servicio que viene fallando.
+
+    - cerrado: las solicitudes pasan; cada fallo seguido suma uno.
+    - abierto: tras `umbral` fallos seguidos no se intenta nada durante `enfriamiento` segundos.
+    - semiabierto: pasado el enfriamiento se deja pasar una sola solicitud de prueba;
+      si funciona el circuito se cierra, si falla vuelve a abrirse.
+    """
+
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+    def __init__(self, umbral: int = 3, enfriamiento: float = 30.0, reloj: Callable[[], float] = time.monotonic):
+        self.umbral = max(1, umbral)
+        self.enfriamiento = enfriamiento
+        self._reloj = reloj
+        self._lock = threading.Lock()  # Varias descargas en paralelo comparten el circuito
+        self.estado = self.CERRADO
+        self.fallos = 0
+        self._abierto_desde = 0.0
+        self._prueba_en_curso = False
+
+    def permitir(self) -> bool:
+        """True si se puede intentar una solicitud ahora"""
+        with self._lock:
+            if self.estado == self.CERRADO:
+                return True
+            if self.estado == self.ABIERTO:
+                if self._reloj() - self._abierto_desde < self.enfriamiento:
+                    return False
+                self.estado = self.SEMIABIERTO
+                self._prueba_en_curso = False
+            # Semiabierto: una sola solicitud de prueba a la vez
+            if self._prueba_en_curso:
+                return False
+            self._prueba_en_curso = True
+            return True
+
+    def exito(self) -> None:
+        with self._lock:
+            self.estado = self.CERRADO
+            self.fallos = 0
+            self._prueba_en_curso = False
+
+    def fallo(self) -> None:
+        with self._lock:
+            self.fallos += 1
+            self._prueba_en_curso = False
+            if self.estado == self.SEMIABIERTO or self.fallos >= self.umbral:
+                if self.estado != self.ABIERTO:
+                    print(f"[WARNING] API no disponible tras {self.fallos} fallos, se usará la caché por {self.enfriamiento:.0f}s")
+                self.estado = self.ABIERTO
+                self._abierto_desde = self._reloj()
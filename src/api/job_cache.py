@@ -0,0 +1,161 @@
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from src.models.Pedido import Pedido, PedidoSolicitud
+
+
+class JobsColumnar:
+    """
+    Caché binaria columnar de pedidos (jobs.bin), escrita junto a jobs.json.
+
+    Layout:
+    - header: magic, versión, cantidad de pedidos, tamaño y mtime de jobs.json
+      (si el JSON cambió después, el binario se considera viejo y se ignora);
+    - una columna int32 por campo numérico, en el orden de COLUMNAS;
+    - tabla de ids: offsets uint32 (n + 1) y luego los ids en UTF-8 concatenados.
+
+    Al abrir se mapea el archivo en memoria y cada columna es un memoryview sobre
+    el mapa: no se lee ni se copia nada hasta que alguien accede a una columna.
+    """
+
+    EXTENSION = ".bin"
+    MAGIC = b"CQJB"
+    VERSION = 1
+
+    _HEADER = struct.Struct("<4sBIqq")  # magic, versión, n, tamaño de jobs.json, mtime_ns de jobs.json
+    COLUMNAS = ("pickup_x", "pickup_y", "dropoff_x", "dropoff_y",
+                "payout", "duration", "weight", "priority", "release_time")
+    _TIPO = "i"  # int32
+    _TIPO_OFFSET = "I"  # uint32
+
+    def __init__(self, mapa: mmap.mmap, n: int):
+        self._mapa = mapa
+        self.n = n
+        ancho = array(self._TIPO).itemsize
+        self._vista = vista = memoryview(mapa)
+        inicio = self._HEADER.size
+        self._columnas: Dict[str, memoryview] = {}
+        for nombre in self.COLUMNAS:
+            self._columnas[nombre] = vista[inicio:inicio + n * ancho].cast(self._TIPO)
+            inicio += n * ancho
+        ancho_offset = array(self._TIPO_OFFSET).itemsize
+        self._offsets = vista[inicio:inicio + (n + 1) * ancho_offset].cast(self._TIPO_OFFSET)
+        self._ids = vista[inicio + (n + 1) * ancho_offset:]
+
+    # ---------------- Escritura ----------------
+    @classmethod
+    def ruta_para(cls, json_path: Path) -> Path:
+        return Path(json_path).with_suffix(cls.EXTENSION)
+
+    @classmethod
+    def nuevas_columnas(cls) -> Dict[str, array]:
+        """Columnas vacías para ir agregando pedidos mientras se escribe el JSON"""
+        columnas = {nombre: array(cls._TIPO) for nombre in cls.COLUMNAS}
+        columnas["id"] = []
+        return columnas
+
+    @classmethod
+    def agregar(cls, columnas: Dict[str, array], job: PedidoSolicitud) -> None:
+        columnas["pickup_x"].append(job.pickup[0])
+        columnas["pickup_y"].append(job.pickup[1])
+        columnas["dropoff_x"].append(job.dropoff[0])
+        columnas["dropoff_y"].append(job.dropoff[1])
+        columnas["payout"].append(job.payout)
+        columnas["duration"].append(job.duration)
+        columnas["weight"].append(job.weight)
+        columnas["priority"].append(job.priority)
+        columnas["release_time"].append(job.release_time)
+        columnas["id"].append(job.id.encode("utf-8"))
+
+    @classmethod
+    def escribir(cls, json_path: Path, columnas: Dict[str, array]) -> Path:
+        """Escribe jobs.bin para el jobs.json ya escrito (temporal + os.replace)"""
+        json_path = Path(json_path)
+        ruta = cls.ruta_para(json_path)
+        ids: List[bytes] = columnas["id"]
+        offsets = array(cls._TIPO_OFFSET, [0])
+        for id_bytes in ids:
+            offsets.append(offsets[-1] + len(id_bytes))
+
+        estado = json_path.stat()
+        tmp_path = ruta.with_name(ruta.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, len(ids), estado.st_size, estado.st_mtime_ns))
+            for nombre in cls.COLUMNAS:
+                columnas[nombre].tofile(f)
+            offsets.tofile(f)
+            f.write(b"".join(ids))
+        os.replace(tmp_path, ruta)
+        return ruta
+
+    # ---------------- Lectura ----------------
+    @classmethod
+    def abrir(cls, json_path: Path) -> Optional["JobsColumnar"]:
+        """Mapea jobs.bin si corresponde al jobs.json actual; None si falta o quedó viejo"""
+        json_path = Path(json_path)
+        ruta = cls.ruta_para(json_path)
+        try:
+            estado = json_path.stat()
+            with open(ruta, "rb") as f:
+                if os.fstat(f.fileno()).st_size < cls._HEADER.size:
+                    return None
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        magic, version, n, tam_json, mtime_json = cls._HEADER.unpack_from(mapa, 0)
+        if magic != cls.MAGIC or version != cls.VERSION or (tam_json, mtime_json) != (estado.st_size, estado.st_mtime_ns):
+            mapa.close()
+            return None
+        return cls(mapa, n)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def columna(self, nombre: str) -> memoryview:
+        """Vista int32 de una columna (sin copiar)"""
+        return self._columnas[nombre]
+
+    def id(self, i: int) -> str:
+        return bytes(self._ids[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+    def pedidos(self, duration: Optional[int] = None) -> Iterator[Pedido]:
+        """
+        Reconstruye los pedidos de juego sin pasar por pydantic (los datos ya se
+        validaron al escribir la caché). `duration` reemplaza la duración guardada.
+        """
+        c = self._columnas
+        columnas = zip(c["pickup_x"], c["pickup_y"], c["dropoff_x"], c["dropoff_y"], c["payout"],
+                       c["duration"], c["weight"], c["priority"], c["release_time"])
+        ids = bytes(self._ids)
+        # Con ids ASCII los offsets en bytes sirven directo sobre el texto decodificado
+        texto = ids.decode("ascii") if ids.isascii() else None
+        offsets = self._offsets
+        for i, (px, py, dx, dy, payout, dur, weight, priority, release_time) in enumerate(columnas):
+            yield Pedido(
+                id=texto[offsets[i]:offsets[i + 1]] if texto is not None else self.id(i),
+                pickup=(px, py),
+                dropoff=(dx, dy),
+                payout=payout,
+                duration=dur if duration is None else duration,
+                weight=weight,
+                priority=priority,
+                release_time=release_time,
+            )
+
+    def cerrar(self) -> None:
+        """Libera jobs.bin; después las columnas ya no se pueden leer"""
+        for vista in (*self._columnas.values(), self._offsets, self._ids, self._vista):
+            try:
+                vista.release()
+            except BufferError:
+                pass  # Exportada por el llamador (ej. memoryview(columna)); la libera el GC
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Queda viva alguna vista o slice de una columna: el mapa se libera cuando el GC la recoja
+            print("[WARNING] jobs.bin sigue en uso, no se pudo cerrar")
@@ -0,0 +1,108 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+_ESPACIOS = " \t\n\r"
+_NUMERO = frozenset("0123456789.eE+-")
+
+
+class _Lector:
+    """Buffer de texto alimentado por bloques (bytes o str) de una respuesta HTTP"""
+
+    def __init__(self, bloques: Iterable[Union[bytes, str]]):
+        self._bloques = iter(bloques)
+        self._decoder = json.JSONDecoder()
+        self._utf8 = None  # Decodificador incremental: un carácter puede quedar partido entre bloques
+        self.texto = ""
+        self.pos = 0
+
+    def _leer_mas(self) -> bool:
+        for bloque in self._bloques:
+            if isinstance(bloque, bytes):
+                if self._utf8 is None:
+                    self._utf8 = codecs.getincrementaldecoder("utf-8")()
+                bloque = self._utf8.decode(bloque)
+            if not bloque:
+                continue
+            # Se descarta lo ya consumido para que el buffer no crezca con el documento
+            self.texto = self.texto[self.pos:] + bloque
+            self.pos = 0
+            return True
+        return False
+
+    def siguiente_caracter(self) -> str:
+        """Salta espacios y devuelve el próximo carácter sin consumirlo ('' al final)"""
+        while True:
+            while self.pos < len(self.texto) and self.texto[self.pos] in _ESPACIOS:
+                self.pos += 1
+            if self.pos < len(self.texto):
+                return self.texto[self.pos]
+            if not self._leer_mas():
+                return ""
+
+    def esperar(self, caracter: str) -> None:
+        encontrado = self.siguiente_caracter()
+        if encontrado != caracter:
+            raise ValueError(f"JSON inválido: se esperaba {caracter!r} y llegó {encontrado!r}")
+        self.pos += 1
+
+    def valor(self) -> Any:
+        """Decodifica el próximo valor completo, pidiendo más bloques si quedó cortado"""
+        self.siguiente_caracter()
+        while True:
+            try:
+                valor, fin = self._decoder.raw_decode(self.texto, self.pos)
+            except json.JSONDecodeError:
+                if not self._leer_mas():
+                    raise
+                continue
+            # Un número al borde del buffer puede seguir en el próximo bloque ("3." de "3.5", "1e" de "1e-3")
+            if self._numero_abierto(fin) and self._leer_mas():
+                continue
+            self.pos = fin
+            return valor
+
+    def _numero_abierto(self, fin: int) -> bool:
+        """True si el valor decodificado es un número y el buffer termina sin cerrarlo"""
+        if self.texto[self.pos] not in "-0123456789":
+            return False
+        for i in range(fin, len(self.texto)):
+            if self.texto[i] not in _NUMERO:
+                return False
+        return True
+
+
+def iterar_arreglo(bloques: Iterable[Union[bytes, str]], clave: str = "data") -> Iterator[Any]:
+    """
+    Recorre los elementos del arreglo `clave` de un objeto JSON sin cargar el documento entero.
+
+    `bloques` es cualquier iterable de bytes o texto (ej. response.iter_content()).
+    Los demás campos del objeto raíz se decodifican y descartan; en memoria queda
+    solo el elemento actual y el bloque en curso.
+    """
+    lector = _Lector(bloques)
+    lector.esperar("{")
+    if lector.siguiente_caracter() == "}":
+        return
+    while True:
+        nombre = lector.valor()
+        lector.esperar(":")
+        if nombre == clave:
+            lector.esperar("[")
+            if lector.siguiente_caracter() == "]":
+                return
+            while True:
+                yield lector.valor()
+                separador = lector.siguiente_caracter()
+                lector.pos += 1
+                if separador == "]":
+                    return
+                if separador != ",":
+                    raise ValueError(f"JSON inválido: separador {separador!r} dentro de {clave!r}")
+        lector.valor()  # Campo que no interesa
+        separador = lector.siguiente_caracter()
+        lector.pos += 1
+        if separador == "}":
+            raise KeyError(clave)
+        if separador != ",":
+            raise ValueError(f"JSON inválido: separador {separador!r} en el objeto raíz")
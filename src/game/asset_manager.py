@@ -0,0 +1,100 @@
+import pygame
+from pathlib import Path
+from typing import Dict, Tuple
+
+
+class AssetManager:
+    """
+    Caché central de sprites.
+    Cada PNG se decodifica una sola vez y las variantes escaladas se guardan
+    por (nombre, tamaño) dentro de un atlas, de modo que todas las entidades
+    (jugador, bots y renderer) comparten las mismas superficies.
+    """
+
+    # Sprite que falta: damero magenta/negro, bien visible en pantalla
+    COLORES_FALTANTE = ((255, 0, 255), (0, 0, 0))
+
+    # Una instancia compartida por carpeta de sprites
+    _instancias: Dict[Path, "AssetManager"] = {}
+
+    def __init__(self, sprites_dir: Path):
+        self.sprites_dir = Path(sprites_dir)
+        self._originales: Dict[str, pygame.Surface] = {}  # nombre -> imagen sin escalar
+        self._escalados: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}  # (nombre, tamaño) -> subsuperficie del atlas
+        self.faltantes: Dict[str, Path] = {}  # nombre -> ruta que no se pudo cargar
+        self._atlas: list[pygame.Surface] = []  # Páginas del atlas (una por cada lote empaquetado)
+
+    @classmethod
+    def para_directorio(cls, sprites_dir: Path) -> "AssetManager":
+        """Devuelve el gestor compartido para una carpeta de sprites"""
+        clave = Path(sprites_dir).resolve()
+        if clave not in cls._instancias:
+            cls._instancias[clave] = cls(clave)
+        return cls._instancias[clave]
+
+    @classmethod
+    def limpiar(cls) -> None:
+        """Libera todas las superficies cacheadas (por ejemplo, al reiniciar el display)"""
+        cls._instancias.clear()
+
+    def cargar(self, filename: str) -> pygame.Surface:
+        """
+        Carga la imagen original una sola vez. Si no se pudo cargar devuelve un
+        damero de reemplazo (y la ruta queda en `faltantes`), nunca None.
+        """
+        if filename not in self._originales:
+            ruta = self.sprites_dir / filename
+            try:
+                self._originales[filename] = pygame.image.load(str(ruta)).convert_alpha()
+            except Exception as e:
+                print(f"[AssetManager] Warning: no se pudo cargar sprite '{ruta}': {e}")
+                self.faltantes[filename] = ruta
+                self._originales[filename] = self._reemplazo()
+        return self._originales[filename]
+
+    @classmethod
+    def _reemplazo(cls) -> pygame.Surface:
+        """Damero de 2x2 píxeles; al escalarlo queda de cuatro cuadros"""
+        imagen = pygame.Surface((2, 2), pygame.SRCALPHA)
+        primero, segundo = cls.COLORES_FALTANTE
+        for x in range(2):
+            for y in range(2):
+                imagen.set_at((x, y), primero if (x + y) % 2 == 0 else segundo)
+        return imagen
+
+    def obtener(self, filename: str, size: Tuple[int, int]) -> pygame.Surface:
+        """Devuelve el sprite escalado al tamaño pedido"""
+        return self.obtener_varios({filename: filename}, size)[filename]
+
+    def obtener_varios(self, nombres: Dict[str, str], size: Tuple[int, int]) -> Dict[str, pygame.Surface]:
+        """
+        Devuelve un dict clave -> sprite escalado.
+        Los sprites que aún no están en caché se empaquetan juntos en una nueva página del atlas.
+
+        Args:
+            nombres: Dict clave lógica -> nombre de archivo (ej. {"up": "Spr_delivery_up.png"})
+            size: Tamaño (ancho, alto) del tile
+        """
+        size = (int(size[0]), int(size[1]))
+        faltantes = []
+        for filename in nombres.values():
+            if (filename, size) not in self._escalados and filename not in faltantes:
+                faltantes.append(filename)
+
+        if faltantes:
+            self._empaquetar(faltantes, size)
+
+        return {clave: self._escalados[(filename, size)] for clave, filename in nombres.items()}
+
+    def _empaquetar(self, filenames: list[str], size: Tuple[int, int]) -> None:
+        """Escala los sprites y los coloca en una tira horizontal (atlas) compartida"""
+        ancho, alto = size
+        atlas = pygame.Surface((ancho * len(filenames), alto), pygame.SRCALPHA).convert_alpha()
+        for i, filename in enumerate(filenames):
+            original = self.cargar(filename)
+            area = pygame.Rect(i * ancho, 0, ancho, alto)
+            atlas.blit(pygame.transform.scale(original, size), area.topleft)
+            # La subsuperficie comparte la memoria de píxeles con el atlas
+            self._escalados[(filename, size)] = atlas.subsurface(area)
+
+        self._atlas.append(atlas)
@@ -0,0 +1,138 @@
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from src.game.game_state_manager import GameStateManager, GameState
+
+
+class AutoSaveService:
+    """
+    Guardado automático en segundo plano.
+
+    El hilo del juego solo copia el estado a un dict (capturar_estado); la
+    validación, serialización y escritura atómica se hacen en un hilo worker.
+    Si llega un snapshot nuevo mientras el anterior sigue pendiente, el viejo
+    se descarta (solo interesa el más reciente). Se conservan los últimos
+    `conservar` autosaves.
+
+    Con `checkpoint_cada` > 0 cada partida usa un solo autosave incremental:
+    un checkpoint completo y luego deltas pequeños, con un checkpoint nuevo
+    cada `checkpoint_cada` deltas.
+    """
+
+    def __init__(self, gestor: Optional[GameStateManager] = None, intervalo: float = 30.0, conservar: int = 3,
+                 checkpoint_cada: int = 0):
+        self.gestor = gestor or GameStateManager()
+        self.intervalo = intervalo  # Segundos de juego entre autosaves
+        self.conservar = conservar
+        self.checkpoint_cada = checkpoint_cada
+        self.ultimo_guardado: Optional[str] = None  # save_id del último autosave escrito
+        self._cadena_id: Optional[str] = None  # save_id del autosave incremental de la partida actual
+        self._cadena_abierta: Optional[str] = None  # Última cadena en que escribió el worker (solo la usa él)
+
+        self._proximo: Optional[float] = None  # Tiempo del próximo autosave (None = se fija en el primer tick)
+        # Cada snapshot va con el número de partida en que se capturó; reiniciar lo incrementa
+        # y el worker descarta los de partidas anteriores
+        self._partida = 0
+        self._lock = threading.Lock()  # Protege _partida y _cadena_id entre reiniciar y el worker
+        self._pendientes: "queue.Queue[Optional[Tuple[int, Dict[str, Any]]]]" = queue.Queue(maxsize=1)
+        self._worker = threading.Thread(target=self._trabajar, name="autosave", daemon=True)
+        self._worker.start()
+
+    def tick(self, tiempo_actual: float, **componentes) -> bool:
+        """
+        Llamar cada frame. Cuando pasa el intervalo captura el estado y lo encola.
+        `componentes` son los mismos argumentos de GameStateManager.create_game_state.
+        """
+        if self._proximo is None:
+            self._proximo = tiempo_actual + self.intervalo
+        if tiempo_actual < self._proximo:
+            return False
+        self._proximo = tiempo_actual + self.intervalo
+        self.solicitar(self.gestor.capturar_estado(**componentes))
+        return True
+
+    def reiniciar(self) -> None:
+        """
+        Al empezar (o cargar) una partida el intervalo se cuenta desde el primer tick.
+        Lo que quedó encolado de la partida anterior se descarta y la nueva empieza
+        su propio autosave incremental.
+        """
+        self._proximo = None
+        with self._lock:
+            self._partida += 1
+            self._cadena_id = None
+            try:
+                pendiente = self._pendientes.get_nowait()
+            except queue.Empty:
+                return
+            if pendiente is None:
+                self._pendientes.put_nowait(None)  # Era el aviso de detener, no un snapshot
+
+    def solicitar(self, datos: Dict[str, Any]) -> None:
+        """Encola un snapshot; reemplaza al pendiente si el worker aún no lo tomó"""
+        item = (self._partida, datos)
+        try:
+            self._pendientes.put_nowait(item)
+        except queue.Full:
+            try:
+                self._pendientes.get_nowait()
+            except queue.Empty:
+                pass
+            self._pendientes.put_nowait(item)
+
+    def _trabajar(self) -> None:
+        while True:
+            item = self._pendientes.get()
+            if item is None:
+                self._cerrar_cadena(None)
+                break
+            partida, datos = item
+            with self._lock:
+                if partida != self._partida:
+                    continue  # Snapshot de una partida que ya terminó
+                if self.checkpoint_cada > 0 and self._cadena_id is None:
+                    self._cadena_id = self._nuevo_id()
+                # Si reiniciar llega durante la escritura, este snapshot igual va a la cadena de su partida
+                cadena_id = self._cadena_id
+            try:
+                game_state = GameState(**datos)
+                if self.checkpoint_cada > 0:
+                    self._cerrar_cadena(cadena_id)
+                    save_id = cadena_id
+                    nuevo = self.gestor.guardar_incremental(game_state, save_id, self.checkpoint_cada)
+                else:
+                    save_id = self._nuevo_id()
+                    self.gestor.save_game_state(game_state, save_id=save_id)
+                    nuevo = True
+                if nuevo:
+                    self.gestor.rotar_autosaves(self.conservar)
+                self.ultimo_guardado = save_id
+            except Exception as e:
+                print(f"[AutoSave] Error al guardar: {e}")
+
+    def _cerrar_cadena(self, siguiente: Optional[str]) -> None:
+        """Cierra la cadena anterior cuando el worker pasa a otra (o termina), así su resumen llega al índice"""
+        if self._cadena_abierta is not None and self._cadena_abierta != siguiente:
+            try:
+                self.gestor.cerrar_cadena(self._cadena_abierta)
+            except Exception as e:
+                print(f"[AutoSave] Error al cerrar {self._cadena_abierta}: {e}")
+        self._cadena_abierta = siguiente
+
+    @staticmethod
+    def _nuevo_id() -> str:
+        return f"{GameStateManager.PREFIJO_AUTOSAVE}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+
+    def detener(self, timeout: float = 5.0) -> None:
+        """Termina el worker esperando a que se escriba el snapshot pendiente"""
+        if not self._worker.is_alive():
+            return
+        # El None va detrás del snapshot pendiente, así que este se escribe antes de salir
+        try:
+            self._pendientes.put(None, timeout=timeout)
+        except queue.Full:
+            print("[AutoSave] El guardado pendiente no terminó a tiempo")
+            return
+        self._worker.join(timeout)
@@ -7,7 +7,6 @@ from src.game.player import Player
 from src.game.stats_module import Stats
 from src.game.reputation import Reputation
 from src.game.save import Save
-from pathlib import Path as _Path
 
 
 class Bot(Player):
@@ -25,6 +24,14 @@ class Bot(Player):
     MEDIUM = "medium"
     HARD = "hard"
     
+    # Sprites propios del bot (Player los carga desde la caché compartida)
+    SPRITE_FILES = {
+        "up": "Spr_delivery_bot_up.png",
+        "down": "Spr_delivery_bot_down.png",
+        "izq": "Spr_delivery_bot_izq.png",
+        "der": "Spr_delivery_bot_der.png",
+    }
+    
     def __init__(
         self, 
         sprites_dir: Path, 
@@ -52,23 +59,6 @@ class Bot(Player):
             save_data=save_data,
             player_name=player_name
         )
-        # --- Intent: usar sprites específicos del bot si existen en la carpeta ---
-        
-        # Reemplazar directamente los sprites del bot (se asume que existen)
-        sprites_dir = _Path(sprites_dir)
-        self.sprites.update({
-            "up": pygame.transform.scale(pygame.image.load(sprites_dir / "Spr_delivery_bot_up.png").convert_alpha(), (self.tile_width, self.tile_height)),
-            "down": pygame.transform.scale(pygame.image.load(sprites_dir / "Spr_delivery_bot_down.png").convert_alpha(), (self.tile_width, self.tile_height)),
-            "izq": pygame.transform.scale(pygame.image.load(sprites_dir / "Spr_delivery_bot_izq.png").convert_alpha(), (self.tile_width, self.tile_height)),
-            "der": pygame.transform.scale(pygame.image.load(sprites_dir / "Spr_delivery_bot_der.png").convert_alpha(), (self.tile_width, self.tile_height)),
-        })
-
-        # Actualizar imagen actual manteniendo el centro si existe
-        current_center = getattr(self.rect, 'center', None)
-        self.image = self.sprites.get(self.direccion, next(iter(self.sprites.values())))
-        if current_center:
-            self.rect = self.image.get_rect(center=current_center)
-
         
         self.difficulty = difficulty
         self.map_logic = map_logic
@@ -170,26 +160,31 @@ class Bot(Player):
             
             # usar la secuencia optimizada
             if self.difficulty == self.HARD and self.delivery_sequence:
-                target = self.delivery_sequence[0]
+                packages = self.delivery_sequence
             else:
                 packages = sorted(packages, key=lambda p: p.priority, reverse=True)
-                target = packages[0]
+            # Saltar entregas a zonas del mapa sin camino desde aquí
+            target = next((p for p in packages if self._es_alcanzable(p.dropoff)), None)
+            if target is None:
+                self.current_task = "explore"
+                self._make_random_decision()
+                return
             
             self.current_task = "deliver"
             self.target_package = target
-            self.current_goal = tuple(target.dropoff)
+            self.current_goal = target.dropoff
             self._plan_path_to(self.current_goal, clima_factor)
             return
 
         # Recoger paquetes
         if pedidos:
             # Filtrar no recogidos
-            available = [p for p in pedidos if not self._is_package_picked(p)]
+            available = [p for p in pedidos if not self._is_package_picked(p) and self._puede_completar(p)]
             if available:
                 target = self._choose_best_package(available, clima_factor)
                 self.current_task = "pickup"
                 self.target_package = target
-                self.current_goal = tuple(target.pickup)
+                self.current_goal = target.pickup
                 self._plan_path_to(self.current_goal, clima_factor)
                 return
         
@@ -197,6 +192,20 @@ class Bot(Player):
         self.current_task = "explore"
         self._make_random_decision()
     
+    def _es_alcanzable(self, tile: Tuple[int, int]) -> bool:
+        """Chequeo O(1) con las componentes conexas del mapa"""
+        if not self.map_logic:
+            return True
+        return self.map_logic.alcanzable(self._get_tile_pos(), tile)
+
+    def _puede_completar(self, package) -> bool:
+        """Si se puede recoger y luego entregar el pedido desde la posición actual"""
+        if package.alcanzable is False:
+            return False
+        if not self.map_logic:
+            return True
+        return self.map_logic.pedido_alcanzable(package, self._get_tile_pos())
+
     def _is_package_picked(self, package) -> bool:
         if not self.inventario:
             return False
@@ -207,7 +216,7 @@ class Bot(Player):
         
         if self.difficulty == self.EASY:
             # Easy: Aleatorio de los 3 más cercanos
-            packages = sorted(packages, key=lambda p: self._manhattan_distance(current_pos, tuple(p.pickup)))
+            packages = sorted(packages, key=lambda p: self._manhattan_distance(current_pos, p.pickup))
             candidates = packages[:min(3, len(packages))]
             return random.choice(candidates)
         
@@ -218,7 +227,7 @@ class Bot(Player):
         else: 
             # Hard: Mejor combinación de distancia, prioridad y clima
             def score(p):
-                dist = self._manhattan_distance(current_pos, tuple(p.pickup))
+                dist = self._manhattan_distance(current_pos, p.pickup)
                 priority = p.priority
                 time_left = p.duration
                 # Ajustar score por clima
@@ -232,6 +241,12 @@ class Bot(Player):
             return
         
         start = self._get_tile_pos()
+        destino = goal
+        
+        # Sin camino posible: no vale la pena gastar la búsqueda
+        if not self.map_logic.alcanzable(start, goal):
+            self.current_path = []
+            return
         
         if self.map_logic.is_blocked(goal[0], goal[1]):
             neighbors = [
@@ -240,7 +255,8 @@ class Bot(Player):
                 (goal[0] - 1, goal[1]),
                 (goal[0] + 1, goal[1]),
             ]
-            valid_neighbors = [n for n in neighbors if not self.map_logic.is_blocked(n[0], n[1])]
+            acceso = self.map_logic.componentes_de_acceso(start)
+            valid_neighbors = [n for n in neighbors if self.map_logic.componente(n[0], n[1]) in acceso]
             if valid_neighbors:
                 goal = min(valid_neighbors, key=lambda n: self._manhattan_distance(start, n))
             else:
@@ -251,8 +267,17 @@ class Bot(Player):
             self.current_path = self._random_walk_path(start, goal)
         elif self.difficulty == self.MEDIUM:
             self.current_path = self._expectimax_path(start, goal, clima_factor)
+        elif self.current_task == "deliver":
+            # Puntos de entrega: el campo de flujo se calcula una vez y lo comparten todos los bots.
+            # Se avanza por tramos; hasta que cubre la posición del bot se usa JPS.
+            servicio = self.map_logic.campos_de_flujo
+            campo = servicio.obtener(destino, presupuesto=servicio.PRESUPUESTO_FRAME)
+            if campo.listo(start):
+                self.current_path = campo.camino(start)
+            else:
+                self.current_path = self._jps_path(start, goal)
         else:
-            self.current_path = self._dijkstra_path(start, goal, clima_factor)
+            self.current_path = self._jps_path(start, goal)
     
     def _random_walk_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
         """
@@ -366,7 +391,7 @@ class Bot(Player):
             α, β, γ = 1.0, 0.4, 0.3
             
             payout = package.payout
-            dist_to_pickup = self._manhattan_distance(current_pos, tuple(package.pickup))
+            dist_to_pickup = self._manhattan_distance(current_pos, package.pickup)
             weather_penalty = (1.0 - clima_factor) * dist_to_pickup * 0.5
             priority_bonus = package.priority * 5.0
             time_left = package.duration
@@ -376,6 +401,20 @@ class Bot(Player):
         
         return max(packages, key=evaluate_package)
     
+    def _jps_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Jump Point Search para nivel HARD: mismo costo mínimo que Dijkstra, pero
+        salta los tramos de calle en vez de expandirlos tile por tile. El clima
+        multiplica igual todos los pasos, así que no cambia el camino.
+        """
+        if start == goal:
+            return []
+        if self.map_logic.is_blocked(goal[0], goal[1]):
+            # JPS solo busca hacia tiles caminables; Dijkstra al menos acerca al bot
+            return self._dijkstra_path(start, goal)
+        # Vacío = JPS ya probó que no hay camino: repetir la búsqueda con Dijkstra no sirve
+        return self.map_logic.buscador_jps.buscar(start, goal)
+
     def _dijkstra_path(self, start: Tuple[int, int], goal: Tuple[int, int], clima_factor: float = 1.0) -> List[Tuple[int, int]]:
         """
         Algoritmo de Dijkstra para nivel HARD.
@@ -449,7 +488,7 @@ class Bot(Player):
             best_score = float('-inf')
             
             for package in unvisited:
-                dropoff_pos = tuple(package.dropoff)
+                dropoff_pos = package.dropoff
                 path_cost = self._estimate_path_cost(current_pos, dropoff_pos, clima_factor)
                 
                 priority_weight = 10.0
@@ -466,7 +505,7 @@ class Bot(Player):
             if best_package:
                 sequence.append(best_package)
                 unvisited.remove(best_package)
-                current_pos = tuple(best_package.dropoff)
+                current_pos = best_package.dropoff
         
         self.delivery_sequence = sequence
     
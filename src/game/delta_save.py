@@ -0,0 +1,128 @@
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Set
+
+
+class DeltaSave:
+    """
+    Archivo de deltas (.cqdelta) que acompaña a un checkpoint completo (.cqsave).
+
+    Cada registro guarda solo lo que cambió desde el registro anterior:
+    - "campos": campos generales con valor nuevo (posición, score, clima, ...).
+    - "listas": listas de pedidos que cambiaron, como lista de ids.
+    - "pedidos": pedidos que aparecen por primera vez en la cadena (dict completo).
+
+    El header lleva un token del checkpoint (su save_timestamp). Si el checkpoint
+    se reescribe y el proceso muere antes de reiniciar el archivo de deltas,
+    el token no coincide y los deltas viejos se ignoran.
+    """
+
+    EXTENSION = ".cqdelta"
+    MAGIC = b"CQDL"
+    VERSION = 1
+
+    _HEADER = struct.Struct("<4sBH")  # magic, versión, largo del token
+    _LARGO = struct.Struct("<I")  # largo de cada registro comprimido
+
+    LISTAS_PEDIDOS = ("active_orders", "inventory_orders", "available_orders", "pedidos_pendientes")
+
+    # ---------------- Cálculo ----------------
+    @classmethod
+    def calcular(cls, anterior: Dict[str, Any], nuevo: Dict[str, Any], conocidos: Set[str]) -> Dict[str, Any]:
+        """
+        Diferencia entre dos estados (dicts de GameState).
+        `conocidos` son los ids de pedidos ya guardados en la cadena; se actualiza aquí.
+        """
+        campos = {}
+        listas = {}
+        pedidos = []
+        for clave, valor in nuevo.items():
+            if clave in cls.LISTAS_PEDIDOS:
+                if valor != anterior.get(clave):
+                    listas[clave] = [str(p["id"]) for p in valor]
+                    for pedido in valor:
+                        pedido_id = str(pedido["id"])
+                        if pedido_id not in conocidos:
+                            conocidos.add(pedido_id)
+                            pedidos.append(pedido)
+            elif valor != anterior.get(clave):
+                campos[clave] = valor
+
+        delta = {"campos": campos}
+        if listas:
+            delta["listas"] = listas
+        if pedidos:
+            delta["pedidos"] = pedidos
+        return delta
+
+    @classmethod
+    def aplicar(cls, estado: Dict[str, Any], delta: Dict[str, Any], tabla: Dict[str, Dict[str, Any]]) -> None:
+        """Aplica un delta sobre `estado`. `tabla` es id -> pedido de toda la cadena."""
+        for pedido in delta.get("pedidos", []):
+            tabla[str(pedido["id"])] = pedido
+        estado.update(delta["campos"])
+        for nombre, ids in delta.get("listas", {}).items():
+            estado[nombre] = [dict(tabla[i]) for i in ids]
+
+    # ---------------- Archivo ----------------
+    @classmethod
+    def ruta_para(cls, checkpoint: Path) -> Path:
+        return Path(checkpoint).with_suffix(cls.EXTENSION)
+
+    @classmethod
+    def iniciar(cls, ruta: Path, token: str) -> None:
+        """Crea (o vacía) el archivo de deltas para un checkpoint nuevo"""
+        token_bytes = token.encode("utf-8")
+        with open(ruta, "wb") as f:
+            f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, len(token_bytes)) + token_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @classmethod
+    def agregar(cls, ruta: Path, delta: Dict[str, Any]) -> int:
+        """Agrega un registro al final. Devuelve los bytes escritos."""
+        datos = zlib.compress(json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        with open(ruta, "ab") as f:
+            f.write(cls._LARGO.pack(len(datos)) + datos)
+            f.flush()
+            os.fsync(f.fileno())
+        return cls._LARGO.size + len(datos)
+
+    @classmethod
+    def leer(cls, ruta: Path, token: str) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre los deltas en orden. No devuelve nada si el archivo no existe o
+        pertenece a otro checkpoint; se detiene en un registro incompleto (escritura cortada).
+        """
+        try:
+            f = open(ruta, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            header = f.read(cls._HEADER.size)
+            if len(header) < cls._HEADER.size:
+                return
+            magic, version, largo_token = cls._HEADER.unpack(header)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                return
+            if f.read(largo_token).decode("utf-8", errors="replace") != token:
+                return
+
+            while True:
+                largo = f.read(cls._LARGO.size)
+                if len(largo) < cls._LARGO.size:
+                    return
+                (n,) = cls._LARGO.unpack(largo)
+                datos = f.read(n)
+                if len(datos) < n:
+                    print(f"[WARNING] Delta incompleto al final de {ruta}, se ignora")
+                    return
+                try:
+                    delta = json.loads(zlib.decompress(datos).decode("utf-8"))
+                except (zlib.error, ValueError) as e:
+                    print(f"[WARNING] Delta corrupto en {ruta} ({e}), se ignora el resto")
+                    return
+                yield delta
@@ -3,6 +3,7 @@ import pygame
 class Events:
     """
     Clase encargada de manejar todos los eventos del juego.
+    Se crea una sola vez por partida y cada frame recibe el estado nuevo con actualizar().
     Controla:
     - Movimiento del jugador
     - Sistema de deshacer
@@ -10,8 +11,22 @@ class Events:
     - Pausa y salida del juego
     """
 
-    def __init__(self, player, gestor, notificador, undo_system, inventario=None, recoger_callback=None, entregar_callback=None, pedidos_data=None, 
-                 map_logic=None, sistema_clima=None, tiempo_actual=None):
+    # Teclas de movimiento: (teclas, dx, dy, dirección). El orden define la prioridad.
+    MOVIMIENTOS = (
+        ((pygame.K_UP, pygame.K_w), 0, -1, "up"),
+        ((pygame.K_DOWN, pygame.K_s), 0, 1, "down"),
+        ((pygame.K_LEFT, pygame.K_a), -1, 0, "izq"),
+        ((pygame.K_RIGHT, pygame.K_d), 1, 0, "der"),
+    )
+
+    # Segundos de juego que retrocede la tecla T (rebobinar usando la bitácora)
+    SEGUNDOS_REBOBINAR = 30
+
+    # Teclas numéricas para deshacer varios pasos con R
+    TECLAS_UNDO = ((pygame.K_1, 1), (pygame.K_2, 2), (pygame.K_3, 3), (pygame.K_4, 4), (pygame.K_5, 5))
+
+    def __init__(self, player, gestor, notificador, undo_system, inventario=None, recoger_callback=None, entregar_callback=None, pedidos_data=None,
+                 map_logic=None, sistema_clima=None, profiler=None):
         self.player = player
         self.gestor = gestor
         self.notificador = notificador
@@ -19,16 +34,47 @@ class Events:
         self.inventario = inventario
         self.recoger_callback = recoger_callback
         self.entregar_callback = entregar_callback
-        self.pedidos_data = pedidos_data  # Para acceder a pedidos, pedidos_recogidos, pedidos_entregados
-        
+        # Para acceder a pedidos, pedidos_recogidos, pedidos_entregados.
+        # Las listas se comparten por referencia, así que basta con armar el dict una vez.
+        # 'pedidos_excluidos' (opcional) es una lista de listas cuyos pedidos no se pueden recoger.
+        self.pedidos_data = pedidos_data
+
         # Para el sistema de movimiento integrado
         self.map_logic = map_logic
         self.sistema_clima = sistema_clima
-        self.tiempo_actual = tiempo_actual
-        
+        self.tiempo_actual = 0  # Segundos de juego, se actualiza cada frame
+
+        # Perfilador de frames (overlay con F3)
+        self.profiler = profiler
+
         # Estado de movimiento
         self.moved = False
 
+        # Tabla de despacho tecla -> acción (solo se registran las acciones disponibles)
+        self.acciones = self._compilar_acciones()
+
+    def _compilar_acciones(self):
+        acciones = {
+            pygame.K_u: self._deshacer,
+            pygame.K_r: self._deshacer_varios,
+            pygame.K_t: self._rebobinar,
+            pygame.K_ESCAPE: self._pausar,
+        }
+        if self.inventario:
+            acciones[pygame.K_i] = self._alternar_inventario
+            acciones[pygame.K_k] = self._ordenar_inventario
+        if self.recoger_callback and self.pedidos_data:
+            acciones[pygame.K_n] = self._manejar_recoger_paquete
+        if self.entregar_callback and self.pedidos_data and self.inventario:
+            acciones[pygame.K_m] = self._manejar_entregar_paquete
+        if self.profiler:
+            acciones[pygame.K_F3] = self.profiler.toggle_overlay
+        return acciones
+
+    def actualizar(self, tiempo_actual: int):
+        """Recibe el estado del frame actual (tiempo de juego en segundos)"""
+        self.tiempo_actual = tiempo_actual
+
     def procesar_eventos(self):
         """
         Procesa los eventos de pygame.
@@ -41,102 +87,107 @@ class Events:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return "salir"
-            
+
             # Manejar eventos del notificador (Z/X para aceptar/rechazar pedidos)
             if self.notificador.manejar_eventos(event, self.gestor):
                 continue  # Evento ya procesado por el notificador
-            
-            # Manejar sistema de deshacer
+
             if event.type == pygame.KEYDOWN:
-                # Alternar inventario (tecla I)
-                if event.key == pygame.K_i and self.inventario:
-                    self.inventario.toggle_inventario()
-
-                # Cambiar modo de ordenamiento del inventario (tecla K)
-                elif event.key == pygame.K_k and self.inventario:
-                    self.inventario.toggle_sort_mode()
-                    print(f"Inventario ordenado por: {self.inventario.get_current_sort_name()}")
-
-                # Deshacer un movimiento (tecla U)
-                elif event.key == pygame.K_u and not self.notificador.activo:
-                    self.undo_system.undo_last_move(self.player, self.gestor)
-
-                # Deshacer múltiples movimientos (tecla R + número)
-                elif event.key == pygame.K_r and not self.notificador.activo:
-                    keys_pressed = pygame.key.get_pressed()
-                    undo_count = 1
-                    
-                    # Permitir deshacer más pasos con números
-                    if keys_pressed[pygame.K_1]: undo_count = 1
-                    elif keys_pressed[pygame.K_2]: undo_count = 2
-                    elif keys_pressed[pygame.K_3]: undo_count = 3
-                    elif keys_pressed[pygame.K_4]: undo_count = 4
-                    elif keys_pressed[pygame.K_5]: undo_count = 5
-                    
-                    self.undo_system.undo_n_moves(self.player, undo_count, self.gestor)
-
-                # Recoger paquete (tecla N)
-                elif event.key == pygame.K_n and self.recoger_callback and self.pedidos_data:
-                    self._manejar_recoger_paquete()
-
-                # Entregar paquete (tecla M)
-                elif event.key == pygame.K_m and self.entregar_callback and self.pedidos_data:
-                    self._manejar_entregar_paquete()
-
-                # Pausar el juego
-                elif event.key == pygame.K_ESCAPE:
-                    return "pausa"
+                accion = self.acciones.get(event.key)
+                if accion:
+                    resultado = accion()
+                    if resultado:
+                        return resultado
 
         return None
 
+    # ---------------- Acciones de teclado ----------------
+    def _alternar_inventario(self):
+        """Alternar inventario (tecla I)"""
+        self.inventario.toggle_inventario()
+
+    def _ordenar_inventario(self):
+        """Cambiar modo de ordenamiento del inventario (tecla K)"""
+        self.inventario.toggle_sort_mode()
+        print(f"Inventario ordenado por: {self.inventario.get_current_sort_name()}")
+
+    def _deshacer(self):
+        """Deshacer un movimiento (tecla U)"""
+        if not self.notificador.activo:
+            self.undo_system.undo_last_move(self.player, self.gestor)
+
+    def _deshacer_varios(self):
+        """Deshacer múltiples movimientos (tecla R + número)"""
+        if self.notificador.activo:
+            return
+        keys_pressed = pygame.key.get_pressed()
+        undo_count = 1
+
+        # Permitir deshacer más pasos con números
+        for tecla, cantidad in self.TECLAS_UNDO:
+            if keys_pressed[tecla]:
+                undo_count = cantidad
+                break
+
+        self.undo_system.undo_n_moves(self.player, undo_count, self.gestor)
+
+    def _rebobinar(self):
+        """Rebobinar la posición del jugador SEGUNDOS_REBOBINAR segundos atrás (tecla T)"""
+        if self.notificador.activo:
+            return
+        self.undo_system.rebobinar(self.player, self.tiempo_actual - self.SEGUNDOS_REBOBINAR, self.tiempo_actual)
+
+    def _pausar(self):
+        """Pausar el juego (tecla ESC)"""
+        return "pausa"
+
+    def _player_tile_pos(self):
+        """Convierte la posición del jugador a coordenadas de tile"""
+        if self.map_logic:
+            return self.map_logic.get_player_tile_pos(self.player.rect)
+        # Fallback usando posición directa
+        return (self.player.x // self.player.tile_width, self.player.y // self.player.tile_height)
+
     def _manejar_recoger_paquete(self):
         """Maneja la acción de recoger un paquete con la tecla N"""
         if not self.pedidos_data or not self.recoger_callback:
             return
-        
+
         pedidos = self.pedidos_data.get('pedidos', [])
         pedidos_recogidos = self.pedidos_data.get('pedidos_recogidos', [])
+        pedidos_excluidos = self.pedidos_data.get('pedidos_excluidos', [])
         es_adyacente = self.pedidos_data.get('es_adyacente_func')
-        
+
         if not es_adyacente:
             return
-        
-        # Convertir posición del jugador a coordenadas de tile
-        if self.map_logic:
-            player_tile_pos = self.map_logic.get_player_tile_pos(self.player.rect)
-        else:
-            # Fallback usando posición directa
-            player_tile_pos = (self.player.x // self.player.tile_width, self.player.y // self.player.tile_height)
-        
+
+        player_tile_pos = self._player_tile_pos()
+
         # Buscar pedidos adyacentes que no han sido recogidos
         for pedido in pedidos:
-            if pedido not in pedidos_recogidos:
-                if es_adyacente(player_tile_pos, tuple(pedido.pickup)):
-                    self.recoger_callback(pedido)
-                    break
+            if pedido in pedidos_recogidos or any(pedido in lista for lista in pedidos_excluidos):
+                continue
+            if es_adyacente(player_tile_pos, pedido.pickup):
+                self.recoger_callback(pedido)
+                break
 
     def _manejar_entregar_paquete(self):
         """Maneja la acción de entregar un paquete con la tecla M"""
         if not self.pedidos_data or not self.entregar_callback or not self.inventario:
             return
-        
+
         pedidos_entregados = self.pedidos_data.get('pedidos_entregados', [])
         es_adyacente = self.pedidos_data.get('es_adyacente_func')
-        
+
         if not es_adyacente:
             return
-        
-        # Convertir posición del jugador a coordenadas de tile
-        if self.map_logic:
-            player_tile_pos = self.map_logic.get_player_tile_pos(self.player.rect)
-        else:
-            # Fallback usando posición directa
-            player_tile_pos = (self.player.x // self.player.tile_width, self.player.y // self.player.tile_height)
-        
+
+        player_tile_pos = self._player_tile_pos()
+
         # Buscar pedidos en el inventario que pueden ser entregados
         pedidos_en_inventario = self.inventario.get_orders()
         for pedido in pedidos_en_inventario:
-            if pedido not in pedidos_entregados and es_adyacente(player_tile_pos, tuple(pedido.dropoff)):
+            if pedido not in pedidos_entregados and es_adyacente(player_tile_pos, pedido.dropoff):
                 self.entregar_callback(pedido)
                 break
 
@@ -144,48 +195,41 @@ class Events:
         """Maneja el movimiento del jugador con el sistema integrado"""
         if not self.map_logic or not self.sistema_clima:
             return False
-        
+
         self.moved = False
-        
+
         # Solo procesar movimiento si no hay notificación activa
         if self.notificador.activo:
             return False
-        
+
         # Obtener posición actual del jugador en tiles
         px, py = self.map_logic.get_player_tile_pos(self.player.rect)
         new_x, new_y = px, py
         direccion = None
-        
+
         # Determinar dirección basada en teclas presionadas
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            new_y -= 1
-            direccion = "up"
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            new_y += 1
-            direccion = "down"
-        elif keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            new_x -= 1
-            direccion = "izq"
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            new_x += 1
-            direccion = "der"
-        
+        for teclas, dx, dy, nombre in self.MOVIMIENTOS:
+            if keys[teclas[0]] or keys[teclas[1]]:
+                new_x, new_y = px + dx, py + dy
+                direccion = nombre
+                break
+
         # Si hay movimiento y no hay colisión
         if direccion and not self.map_logic.is_blocked(new_x, new_y):
             # Obtener información del tile para surface_weight
             tile_info = self.map_logic.get_tile_info(new_x, new_y)
-            
+
             # Obtener datos del clima
             condicion = self.sistema_clima.obtener_condicion()
             efectos = self.sistema_clima.obtener_efectos()
             clima_factor = efectos["factor_velocidad"]
-            
+
             # Calcular peso del inventario
             peso_inventario = 0.0
             if self.inventario:
                 pedidos_en_inventario = self.inventario.get_orders()
                 peso_inventario = sum(pedido.weight for pedido in pedidos_en_inventario)
-            
+
             # Mover al jugador con todos los factores
             self.player.mover(
                 direccion=direccion,
@@ -195,13 +239,13 @@ class Events:
                 tile_info=tile_info,
             )
             self.moved = True
-            
+
             # Guardar estado después de un movimiento exitoso
             pedidos_activos_ids = [p.id for p in self.gestor.ver_pedidos()]
-            self.undo_system.save_state(self.player, self.tiempo_actual(), pedidos_activos_ids)
-        
+            self.undo_system.save_state(self.player, self.tiempo_actual, pedidos_activos_ids)
+
         # Si no se movió, recuperar resistencia
         if not self.moved:
             self.player.stats.recupera(segundos=dt, rest_point=False)
-        
+
         return self.moved
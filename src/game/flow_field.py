@@ -0,0 +1,189 @@
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.models.MapaCompilado import MapaCompilado
+
+# Dirección guardada por tile: hacia qué vecino moverse para acercarse al destino
+_SIN_DIRECCION = 0
+_DESPLAZAMIENTOS = ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0))  # índice = dirección (arriba, abajo, izq, der)
+_OPUESTA = (0, 2, 1, 4, 3)
+
+
+class CampoDeFlujo:
+    """
+    Distancia y dirección hacia un destino para todos los tiles del mapa.
+
+    Se arma con un Dijkstra inverso desde el destino (o desde sus vecinos
+    caminables si el destino es un edificio). Seguirlo cuesta una lectura por paso.
+    Las distancias usan el costo base de cada tile, sin clima: el clima
+    multiplica igual todos los pasos, así que no cambia las direcciones.
+
+    El Dijkstra se puede avanzar por tramos (avanzar(presupuesto)) para no
+    recorrer un mapa grande entero dentro de un frame. Mientras no termina, un
+    tile ya está resuelto si su distancia no supera la del próximo nodo del
+    heap (listo): desde ahí el camino solo pasa por tiles más cercanos, que
+    también están resueltos.
+    """
+
+    __slots__ = ("destino", "width", "height", "distancias", "direcciones",
+                 "_heap", "_grilla", "_bloqueado", "_costos")
+
+    def __init__(self, destino: Tuple[int, int], width: int, height: int, distancias: array, direcciones: bytearray):
+        self.destino = destino
+        self.width = width
+        self.height = height
+        self.distancias = distancias  # float64 por tile (inf = sin camino)
+        self.direcciones = direcciones  # uint8 por tile (0 = destino o sin camino)
+        # Frontera del Dijkstra pendiente (vacía = campo completo)
+        self._heap: List[Tuple[float, int]] = []
+        self._grilla = self._bloqueado = self._costos = None
+
+    @classmethod
+    def iniciar(cls, mapa: MapaCompilado, bloqueado: List[bool], costos: List[float],
+                destino: Tuple[int, int]) -> "CampoDeFlujo":
+        """Campo con solo las semillas; `bloqueado` y `costos` van por índice de código (como MapLogic._bloqueado)"""
+        ancho, alto = mapa.width, mapa.height
+        # float64 igual que el heap: en float32 pesos como 0.95 se redondean y el
+        # `dist > distancias[i]` de avanzar descartaría nodos que sí hay que expandir
+        campo = cls(destino, ancho, alto, array("d", [math.inf]) * (ancho * alto), bytearray(ancho * alto))
+        campo._grilla, campo._bloqueado, campo._costos = mapa.grilla, bloqueado, costos
+
+        x, y = destino
+        if campo._caminable(x, y):
+            semillas = [(x, y)]
+        else:
+            semillas = [(x + dx, y + dy) for dx, dy in _DESPLAZAMIENTOS[1:] if campo._caminable(x + dx, y + dy)]
+        for sx, sy in semillas:
+            campo.distancias[sy * ancho + sx] = 0.0
+            campo._heap.append((0.0, sy * ancho + sx))
+        if not campo._heap:
+            campo._soltar_mapa()
+        return campo
+
+    @classmethod
+    def calcular(cls, mapa: MapaCompilado, bloqueado: List[bool], costos: List[float],
+                 destino: Tuple[int, int]) -> "CampoDeFlujo":
+        """Campo completo, de una vez"""
+        campo = cls.iniciar(mapa, bloqueado, costos, destino)
+        campo.avanzar()
+        return campo
+
+    def _caminable(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and not self._bloqueado[self._grilla[y * self.width + x]]
+
+    def _soltar_mapa(self) -> None:
+        # Terminado: el campo ya no necesita la grilla (que puede ser un mmap que se cierra)
+        self._grilla = self._bloqueado = self._costos = None
+
+    @property
+    def completo(self) -> bool:
+        return not self._heap
+
+    def avanzar(self, presupuesto: Optional[int] = None) -> bool:
+        """Expande hasta `presupuesto` nodos (None = hasta terminar); devuelve si el campo quedó completo"""
+        heap, distancias, direcciones = self._heap, self.distancias, self.direcciones
+        grilla, costos, caminable = self._grilla, self._costos, self._caminable
+        ancho = self.width
+        restantes = presupuesto if presupuesto is not None else -1
+        while heap and restantes != 0:
+            dist, i = heapq.heappop(heap)
+            if dist > distancias[i]:
+                continue
+            restantes -= 1
+            # Entrar a este tile cuesta lo mismo venga de donde venga
+            paso = dist + costos[grilla[i]]
+            x, y = i % ancho, i // ancho
+            for direccion in (1, 2, 3, 4):
+                dx, dy = _DESPLAZAMIENTOS[direccion]
+                nx, ny = x + dx, y + dy
+                if not caminable(nx, ny):
+                    continue
+                j = ny * ancho + nx
+                if paso < distancias[j]:
+                    distancias[j] = paso
+                    direcciones[j] = _OPUESTA[direccion]  # desde el vecino se vuelve hacia este tile
+                    heapq.heappush(heap, (paso, j))
+        if not heap:
+            self._soltar_mapa()
+        return not heap
+
+    def listo(self, tile: Tuple[int, int]) -> bool:
+        """Si distancia/siguiente/camino de `tile` ya son definitivos"""
+        if not self._heap:
+            return True
+        i = self._indice(tile)
+        return i >= 0 and self.distancias[i] <= self._heap[0][0]
+
+    def _indice(self, tile: Tuple[int, int]) -> int:
+        x, y = tile
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return -1
+        return y * self.width + x
+
+    def distancia(self, tile: Tuple[int, int]) -> float:
+        i = self._indice(tile)
+        return math.inf if i < 0 else self.distancias[i]
+
+    def siguiente(self, tile: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Próximo tile hacia el destino; None si ya llegó o no hay camino"""
+        i = self._indice(tile)
+        if i < 0 or self.direcciones[i] == _SIN_DIRECCION:
+            return None
+        dx, dy = _DESPLAZAMIENTOS[self.direcciones[i]]
+        return tile[0] + dx, tile[1] + dy
+
+    def camino(self, desde: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Camino completo (sin incluir `desde`); vacío si no hay camino"""
+        camino = []
+        tile = self.siguiente(desde)
+        while tile is not None:
+            camino.append(tile)
+            tile = self.siguiente(tile)
+        return camino
+
+
+class ServicioCamposDeFlujo:
+    """
+    Campos de flujo de un mapa (MapLogic.campos_de_flujo), compartidos por todos los bots.
+
+    Varios bots yendo al mismo punto de entrega reutilizan un único Dijkstra.
+    Los campos se guardan en un LRU por destino. Con `presupuesto`, cada pedido
+    avanza el Dijkstra a lo sumo esa cantidad de nodos, así el costo de un
+    frame queda acotado aunque el mapa sea grande; el campo se completa a lo
+    largo de varios pedidos.
+    """
+
+    CAPACIDAD = 16
+    # Nodos por pedido en el juego (lo mismo que cortaba la búsqueda anterior de entregas)
+    PRESUPUESTO_FRAME = 1000
+
+    def __init__(self, mapa: MapaCompilado, bloqueado: List[bool], costos: List[float],
+                 capacidad: Optional[int] = None):
+        self.mapa = mapa
+        self.bloqueado = bloqueado
+        self.costos = costos
+        self.capacidad = capacidad or self.CAPACIDAD
+        self._campos: "OrderedDict[Tuple[int, int], CampoDeFlujo]" = OrderedDict()
+        self.calculados = 0
+
+    def obtener(self, destino: Tuple[int, int], presupuesto: Optional[int] = None) -> CampoDeFlujo:
+        """Campo hacia `destino`, avanzado hasta `presupuesto` nodos más (None = completo)"""
+        destino = (destino[0], destino[1])
+        campo = self._campos.get(destino)
+        if campo is not None:
+            self._campos.move_to_end(destino)
+        else:
+            campo = CampoDeFlujo.iniciar(self.mapa, self.bloqueado, self.costos, destino)
+            self.calculados += 1
+            self._campos[destino] = campo
+            if len(self._campos) > self.capacidad:
+                self._campos.popitem(last=False)
+        if not campo.completo:
+            campo.avanzar(presupuesto)
+        return campo
+
+    def limpiar(self) -> None:
+        self._campos.clear()
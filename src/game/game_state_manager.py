@@ -1,18 +1,23 @@
 from pydantic import BaseModel
 from typing import Optional, Tuple, List, Dict, Any
 import json
+import os
+import threading
 from pathlib import Path
 import uuid
 from datetime import datetime
 
 from src.game.save import Save
+from src.game.save_format import SnapshotBinario
+from src.game.delta_save import DeltaSave
+from src.game.sqlite_store import SQLiteStore
 from src.game.player import Player
 from src.game.stats_module import Stats
 from src.game.reputation import Reputation
 from src.game.job_manager import GestorPedidos
 from src.game.weather_system import SistemaClima
 from src.game.package_notifier import NotificadorPedidos
-from src.models.Pedido import PedidoSolicitud
+from src.models.Pedido import Pedido
 
 
 class GameState(BaseModel):
@@ -61,12 +66,35 @@ class GameState(BaseModel):
 
 class GameStateManager:
     """Gestor centralizado del estado del juego"""
+
+    # Índice de partidas: resumen de cada guardado para el menú "Continuar".
+    # No usa extensión .json para no mezclarse con los glob de partidas.
+    INDEX_FILE = "saves.index"
+    INDEX_VERSION = 2
+
+    # Archivos .json de la carpeta que no son partidas
+    ARCHIVOS_EXCLUIDOS = {"savedScores.json"}
+
+    # Prefijo de los guardados automáticos (se rotan con rotar_autosaves)
+    PREFIJO_AUTOSAVE = "autosave_"
+
+    # El índice se puede actualizar desde el hilo de autosave y desde el menú de pausa
+    _indice_lock = threading.RLock()
     
     def __init__(self):
         self.save_dir = Path(__file__).resolve().parent / "saves"
         self.save_dir.mkdir(exist_ok=True)
+        self.index_path = self.save_dir / self.INDEX_FILE
+        self._indice: Optional[Dict[str, Dict[str, Any]]] = None  # save_id -> resumen (se carga bajo demanda)
+        self._ordenadas: Optional[List[Dict[str, Any]]] = None  # Resúmenes ordenados (caché del menú)
+        self._cadenas: Dict[str, Dict[str, Any]] = {}  # save_id -> estado de su cadena checkpoint + deltas
+
+    @property
+    def db(self) -> Optional[SQLiteStore]:
+        """Backend SQLite activo (None = partidas en archivos)"""
+        return SQLiteStore.activo
     
-    def create_game_state(
+    def capturar_estado(
         self,
         player: Player,
         stats: Stats,
@@ -78,8 +106,12 @@ class GameStateManager:
         tiempo_pausado: int,
         tiempo_inicio: int,
         day: int
-    ) -> GameState:
-        """Crea un estado completo del juego a partir de todos los componentes"""
+    ) -> Dict[str, Any]:
+        """
+        Copia el estado de todos los componentes a un dict plano (sin validar).
+        Es barato y se puede llamar desde el hilo del juego; la validación y
+        escritura se hacen después (por ejemplo, en el hilo de autosave).
+        """
         
         # Serializar pedidos activos
         active_orders = []
@@ -112,7 +144,7 @@ class GameStateManager:
             "condicion_destino": sistema_clima.condicion_destino,
         }
         
-        return GameState(
+        return dict(
             player_name=player.name,
             day=day,
             save_timestamp=datetime.now().isoformat(),
@@ -151,8 +183,12 @@ class GameStateManager:
             pedidos_pendientes=pedidos_pendientes,
             notificacion_activa=notificador.activo
         )
+
+    def create_game_state(self, *args, **kwargs) -> GameState:
+        """Crea un estado completo del juego a partir de todos los componentes"""
+        return GameState(**self.capturar_estado(*args, **kwargs))
     
-    def _serialize_pedido(self, pedido: PedidoSolicitud) -> Dict[str, Any]:
+    def _serialize_pedido(self, pedido: Pedido) -> Dict[str, Any]:
         """Serializa un pedido a diccionario"""
         return {
             "id": pedido.id,
@@ -161,13 +197,13 @@ class GameStateManager:
             "payout": pedido.payout,
             "duration": pedido.duration,
             "release_time": pedido.release_time,
-            "pickup": pedido.pickup,
-            "dropoff": pedido.dropoff
+            "pickup": list(pedido.pickup),
+            "dropoff": list(pedido.dropoff)
         }
     
-    def _deserialize_pedido(self, data: Dict[str, Any]) -> PedidoSolicitud:
+    def _deserialize_pedido(self, data: Dict[str, Any]) -> Pedido:
         """Deserializa un diccionario a pedido"""
-        return PedidoSolicitud(
+        return Pedido(
             id=data["id"],
             priority=data["priority"],
             weight=data["weight"],
@@ -178,23 +214,174 @@ class GameStateManager:
             dropoff=data["dropoff"]
         )
     
-    def save_game_state(self, game_state: GameState) -> str:
-        """Guarda el estado completo del juego"""
-        save_id = str(uuid.uuid4())
-        file_path = self.save_dir / f"{save_id}.json"
-        
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(game_state.model_dump(), f, indent=4, ensure_ascii=False)
+    def save_game_state(self, game_state: GameState, formato: str = "binario", save_id: Optional[str] = None) -> str:
+        """
+        Guarda el estado completo del juego de forma atómica.
+        formato="binario" usa el snapshot comprimido (.cqsave); formato="json" el JSON legible.
+        """
+        save_id = save_id or str(uuid.uuid4())
+
+        if self.db is not None and formato != "json":
+            # En SQLite el snapshot binario va como BLOB junto a las columnas indexadas del resumen
+            self.db.guardar_partida(save_id, self._resumen(game_state), SnapshotBinario.serializar(game_state.model_dump()))
+            return save_id
+
+        if formato == "json":
+            file_path = self.save_dir / f"{save_id}.json"
+            contenido = self._json_indentado(game_state)
+        else:
+            file_path = self.save_dir / f"{save_id}{SnapshotBinario.EXTENSION}"
+            contenido = SnapshotBinario.serializar(game_state.model_dump())
+        self._escribir_atomico(file_path, contenido)
         
+        resumen = self._resumen(game_state)
+        resumen['archivo'] = file_path.name
+        self._actualizar_indice(save_id, resumen)
 
         return save_id
+
+    def guardar_incremental(self, game_state: GameState, save_id: str, checkpoint_cada: int = 20) -> bool:
+        """
+        Guarda solo lo que cambió desde el último guardado de `save_id` (delta).
+        Cada `checkpoint_cada` deltas (o la primera vez) se escribe un checkpoint completo.
+        Devuelve True si se escribió un checkpoint.
+        """
+        if self.db is not None:
+            # En SQLite cada guardado es un UPSERT de una fila (la transacción WAL ya es barata)
+            self.save_game_state(game_state, save_id=save_id)
+            return True
+
+        data = game_state.model_dump()
+        cadena = self._cadenas.get(save_id)
+
+        if cadena is None or cadena["deltas"] >= checkpoint_cada:
+            self.save_game_state(game_state, save_id=save_id)
+            checkpoint = self.save_dir / f"{save_id}{SnapshotBinario.EXTENSION}"
+            DeltaSave.iniciar(DeltaSave.ruta_para(checkpoint), game_state.save_timestamp)
+            self._cadenas[save_id] = {
+                "checkpoint": checkpoint,
+                "estado": data,
+                "conocidos": {str(p["id"]) for nombre in DeltaSave.LISTAS_PEDIDOS for p in data[nombre]},
+                "deltas": 0,
+            }
+            return True
+
+        delta = DeltaSave.calcular(cadena["estado"], data, cadena["conocidos"])
+        DeltaSave.agregar(DeltaSave.ruta_para(cadena["checkpoint"]), delta)
+        cadena["estado"] = data
+        cadena["deltas"] += 1
+        # El índice se reescribe solo con cada checkpoint y al cerrar la cadena (cerrar_cadena):
+        # hacerlo en cada delta costaría más que el delta mismo
+        cadena["resumen"] = self._resumen(game_state)
+        return False
+
+    def cerrar_cadena(self, save_id: str) -> None:
+        """
+        Termina la cadena incremental de `save_id`: lleva al índice el resumen del
+        último delta. El próximo guardar_incremental de ese save_id empieza con un checkpoint.
+        """
+        cadena = self._cadenas.pop(save_id, None)
+        if cadena is None or cadena.get("resumen") is None:
+            return
+        resumen = cadena["resumen"]
+        resumen['archivo'] = cadena["checkpoint"].name
+        self._actualizar_indice(save_id, resumen)
+
+    def _aplicar_deltas(self, checkpoint: Path, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reconstruye el estado final de una cadena reproduciendo sus deltas sobre el checkpoint"""
+        ruta = DeltaSave.ruta_para(checkpoint)
+        if not ruta.exists():
+            return data
+        tabla = {str(p["id"]): p for nombre in DeltaSave.LISTAS_PEDIDOS for p in data.get(nombre, [])}
+        for delta in DeltaSave.leer(ruta, data["save_timestamp"]):
+            DeltaSave.aplicar(data, delta, tabla)
+        return data
+
+    @staticmethod
+    def _escribir_atomico(file_path: Path, contenido: bytes) -> None:
+        """
+        Escribe en un temporal, hace fsync y lo renombra sobre el destino.
+        Si el proceso muere a mitad de la escritura, el guardado anterior queda intacto.
+        """
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(contenido)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except OSError:
+            # Falló antes del rename: el destino no se tocó y el temporal a medias sobra
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _json_indentado(game_state: GameState) -> bytes:
+        return json.dumps(game_state.model_dump(), indent=4, ensure_ascii=False).encode("utf-8")
+
+    def exportar_json(self, game_state: GameState, destino: Path) -> Path:
+        """Exporta un estado a JSON indentado (útil para depurar un .cqsave)"""
+        destino = Path(destino)
+        self._escribir_atomico(destino, self._json_indentado(game_state))
+        return destino
+
+    def eliminar_partida(self, save_id: str) -> None:
+        """Borra el archivo de una partida y su entrada del índice"""
+        if self.db is not None:
+            self.db.eliminar_partida(save_id)
+            return
+        with self._indice_lock:
+            indice = self._recargar_indice()
+            info = indice.pop(save_id, None)
+            if info:
+                self._borrar_archivos(info)
+                self._escribir_indice()
+
+    def rotar_autosaves(self, conservar: int) -> None:
+        """Deja solo los `conservar` autosaves más recientes"""
+        if self.db is not None:
+            self.db.rotar_autosaves(self.PREFIJO_AUTOSAVE, conservar)
+            return
+        with self._indice_lock:
+            indice = self._recargar_indice()
+            autosaves = sorted(
+                (save_id for save_id in indice if save_id.startswith(self.PREFIJO_AUTOSAVE)),
+                key=lambda save_id: indice[save_id].get('save_timestamp', ''),
+                reverse=True
+            )
+            viejos = autosaves[max(0, conservar):]
+            for save_id in viejos:
+                self._borrar_archivos(indice.pop(save_id))
+            if viejos:
+                self._escribir_indice()
+
+    def _borrar_archivos(self, info: Dict[str, Any]) -> None:
+        """Borra el archivo de una partida y, si tiene, su archivo de deltas"""
+        ruta = self.save_dir / info['archivo']
+        try:
+            ruta.unlink(missing_ok=True)
+            DeltaSave.ruta_para(ruta).unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[WARNING] No se pudo borrar {info['archivo']}: {e}")
+
+    def leer_datos(self, save_file: Path) -> Dict[str, Any]:
+        """
+        Lee el dict crudo de un guardado, sea snapshot binario o JSON.
+        Con el backend SQLite, save_file es el save_id (str) que devuelve listar_partidas.
+        """
+        if self.db is not None and isinstance(save_file, str):
+            datos = self.db.leer_partida(save_file)
+            if datos is None:
+                raise FileNotFoundError(f"No existe la partida {save_file} en {self.db.ruta}")
+            return SnapshotBinario.desde_bytes(datos)
+        if SnapshotBinario.es_snapshot(save_file):
+            return self._aplicar_deltas(save_file, SnapshotBinario.leer(save_file))
+        with open(save_file, "r", encoding="utf-8") as f:
+            return json.load(f)
     
     def load_game_state(self, save_file: Path) -> GameState:
         """Carga un estado completo del juego"""
-        with open(save_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        return GameState(**data)
+        return GameState(**self.leer_datos(save_file))
     
     def restore_game_state(
         self,
@@ -283,16 +470,137 @@ class GameStateManager:
     def get_save_info(self, save_file: Path) -> Dict[str, Any]:
         """Obtiene información básica de un archivo de guardado para mostrar en el menú"""
         try:
-            game_state = self.load_game_state(save_file)
-            return {
-                'file': save_file,
-                'player_name': game_state.player_name,
-                'day': game_state.day,
-                'reputation': game_state.reputation,
-                'city': game_state.city_name,
-                'save_timestamp': game_state.save_timestamp,
-                'score': game_state.score
-            }
+            if SnapshotBinario.es_snapshot(save_file):
+                # En el snapshot binario basta con leer el meta, sin descomprimir los pedidos
+                meta = SnapshotBinario.leer_meta(save_file)
+                for delta in DeltaSave.leer(DeltaSave.ruta_para(save_file), meta['save_timestamp']):
+                    meta.update(delta['campos'])
+                info = {
+                    'player_name': meta['player_name'],
+                    'day': meta['day'],
+                    'reputation': meta['reputation'],
+                    'city': meta.get('city_name', "TigerCity"),
+                    'save_timestamp': meta['save_timestamp'],
+                    'score': meta['score']
+                }
+            else:
+                info = self._resumen(self.load_game_state(save_file))
+            info['file'] = save_file
+            info['archivo'] = save_file.name
+            return info
         except Exception as e:
             print(f"Error leyendo {save_file}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    # ---------------- Índice de partidas ----------------
+    def _resumen(self, game_state: GameState) -> Dict[str, Any]:
+        """Datos mínimos de una partida para mostrarla en el menú"""
+        return {
+            'player_name': game_state.player_name,
+            'day': game_state.day,
+            'reputation': game_state.reputation,
+            'city': game_state.city_name,
+            'save_timestamp': game_state.save_timestamp,
+            'score': game_state.score
+        }
+
+    def _archivos_de_partida(self) -> Dict[str, Path]:
+        """save_id -> ruta de cada partida en disco (solo lista la carpeta, no parsea)"""
+        archivos = {
+            f.stem: f for f in self.save_dir.glob("*.json")
+            if f.name not in self.ARCHIVOS_EXCLUIDOS
+        }
+        for f in self.save_dir.glob(f"*{SnapshotBinario.EXTENSION}"):
+            archivos[f.stem] = f
+        return archivos
+
+    def _cargar_indice(self, sincronizar: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Lee el índice de disco; si falta o está corrupto lo reconstruye"""
+        if self._indice is not None:
+            return self._indice
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.INDEX_VERSION:
+                raise ValueError(f"versión de índice {data.get('version')}")
+            self._indice = data["saves"]
+        except FileNotFoundError:
+            return self.reconstruir_indice()
+        except (json.JSONDecodeError, KeyError, ValueError, AttributeError) as e:
+            print(f"[WARNING] Índice de partidas inválido ({e}), se reconstruirá")
+            return self.reconstruir_indice()
+
+        if not sincronizar:
+            return self._indice
+
+        # Sincronizar con la carpeta: agregar guardados que no estén en el índice
+        # (por ejemplo, de versiones anteriores) y quitar los que ya no existen
+        archivos = self._archivos_de_partida()
+        cambios = False
+        for save_id in list(self._indice):
+            if save_id not in archivos:
+                del self._indice[save_id]
+                cambios = True
+        for save_id, ruta in archivos.items():
+            if save_id not in self._indice:
+                info = self.get_save_info(ruta)
+                if info:
+                    info.pop('file')
+                    self._indice[save_id] = info
+                    cambios = True
+        if cambios:
+            self._escribir_indice()
+        return self._indice
+
+    def reconstruir_indice(self) -> Dict[str, Dict[str, Any]]:
+        """Parsea todas las partidas de la carpeta y vuelve a escribir el índice"""
+        self._indice = {}
+        for save_id, ruta in self._archivos_de_partida().items():
+            info = self.get_save_info(ruta)
+            if info:
+                info.pop('file')
+                self._indice[save_id] = info
+        self._escribir_indice()
+        return self._indice
+
+    def _recargar_indice(self) -> Dict[str, Dict[str, Any]]:
+        """Vuelve a leer el índice de disco (otra instancia o el hilo de autosave pudo modificarlo)"""
+        self._indice = None
+        return self._cargar_indice(sincronizar=False)
+
+    def _escribir_indice(self) -> None:
+        """Escribe el índice de forma atómica (archivo temporal + os.replace)"""
+        self._ordenadas = None
+        contenido = json.dumps({"version": self.INDEX_VERSION, "saves": self._indice}, ensure_ascii=False)
+        self._escribir_atomico(self.index_path, contenido.encode("utf-8"))
+
+    def _actualizar_indice(self, save_id: str, resumen: Dict[str, Any]) -> None:
+        with self._indice_lock:
+            indice = self._recargar_indice()
+            indice[save_id] = resumen
+            self._escribir_indice()
+
+    def contar_partidas(self) -> int:
+        if self.db is not None:
+            return self.db.contar_partidas()
+        with self._indice_lock:
+            return len(self._cargar_indice())
+
+    def listar_partidas(self, inicio: int = 0, cantidad: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Devuelve una página de partidas ordenadas de la más reciente a la más antigua,
+        leyendo solo el índice. Cada elemento tiene el mismo formato que get_save_info.
+        """
+        if self.db is not None:
+            return self.db.listar_partidas(inicio, cantidad)
+        if self._ordenadas is None:
+            with self._indice_lock:
+                indice = self._cargar_indice()
+            self._ordenadas = sorted(
+                ({**info, 'file': self.save_dir / info['archivo']} for save_id, info in indice.items()),
+                key=lambda info: info.get('save_timestamp', ''),
+                reverse=True
+            )
+        fin = None if cantidad is None else inicio + cantidad
+        return self._ordenadas[inicio:fin]
\ No newline at end of file
@@ -1,11 +1,11 @@
 from typing import List, Optional 
-from src.models.Pedido import PedidoSolicitud
+from src.models.Pedido import Pedido
 import pygame
 
 class InventarioPedidos: 
     def __init__(self, max_weight: int, screen_width: int, screen_height: int):
         self.max_weight = max_weight 
-        self.pedidos: List[PedidoSolicitud] = [] #Lista de pedidos aceptados 
+        self.pedidos: List[Pedido] = [] #Lista de pedidos aceptados 
         self.selected_index = 0 # Suma del peso de todos los pedidos que ha aceptado 
         self.inventario_activo = False  # Estado para mostrar/ocultar inventario
         self.screen_width = screen_width
@@ -23,10 +23,10 @@ class InventarioPedidos:
     def current_weight(self) -> int: 
         return sum(p.weight for p in self.pedidos) # Verifica que aún puede aceptar el pedido por el peso 
     
-    def can_accept(self, pedido: PedidoSolicitud) -> bool: 
+    def can_accept(self, pedido: Pedido) -> bool: 
         return self.current_weight() + pedido.weight <= self.max_weight 
 
-    def accept_order(self, pedido: PedidoSolicitud) -> bool: 
+    def accept_order(self, pedido: Pedido) -> bool: 
         if self.can_accept(pedido): 
             self.pedidos.append(pedido)
             # Aplicar ordenamiento actual después de agregar
@@ -34,21 +34,21 @@ class InventarioPedidos:
             return True 
         return False 
     
-    def reject_order(self, pedido: PedidoSolicitud) -> bool: 
+    def reject_order(self, pedido: Pedido) -> bool: 
         if pedido in self.pedidos: 
             self.pedidos.remove(pedido) 
             self.selected_index = min(self.selected_index, len(self.pedidos) - 1) 
             return True 
         return False 
     
-    def next(self) -> Optional[PedidoSolicitud]: 
+    def next(self) -> Optional[Pedido]: 
         if not self.pedidos:
             return None
         
         self.selected_index = (self.selected_index + 1) % len(self.pedidos) 
         return self.pedidos[self.selected_index] 
     
-    def last(self) -> Optional[PedidoSolicitud]: 
+    def last(self) -> Optional[Pedido]: 
         if not self.pedidos:
             return None 
         
@@ -63,7 +63,7 @@ class InventarioPedidos:
         
     def arrange_by_delivery_time(self):
         """Ordena por tiempo de entrega (release_time + duration)"""
-        self.pedidos.sort(key=lambda p: p.release_time + p.duration)
+        self.pedidos.sort(key=lambda p: p.deadline)
     
     def toggle_sort_mode(self):
         """Cambia el modo de ordenamiento y aplica el nuevo orden"""
@@ -88,10 +88,10 @@ class InventarioPedidos:
         modo = self.modos_ordenamiento[self.modo_actual]
         return self.nombres_modos[modo] 
         
-    def get_orders(self) -> List[PedidoSolicitud]: 
+    def get_orders(self) -> List[Pedido]: 
         return self.pedidos
 
-    def current_order(self) -> Optional[PedidoSolicitud]: 
+    def current_order(self) -> Optional[Pedido]: 
         if not self.pedidos: 
             return None 
         return self.pedidos[self.selected_index]
@@ -1,6 +1,6 @@
 from collections import deque
 from typing import List, Optional
-from src.models.Pedido import PedidoSolicitud
+from src.models.Pedido import Pedido
 from src.game.inventory import InventarioPedidos
 
 
@@ -9,8 +9,8 @@ class GestorPedidos:
 
     def __init__(self, max_inventory_weight: int = 50, screen_width: int = 800, screen_height: int = 600):
         # Cola de pedidos activos (FIFO)
-        self.cola_pedidos: deque[PedidoSolicitud] = deque()
-        self.available_orders: List[PedidoSolicitud] = [] #Pedidos disponibles
+        self.cola_pedidos: deque[Pedido] = deque()
+        self.available_orders: List[Pedido] = [] #Pedidos disponibles
         self.inventory = InventarioPedidos(
             max_weight=max_inventory_weight,
             screen_width=screen_width,
@@ -22,65 +22,65 @@ class GestorPedidos:
         return len(self.cola_pedidos)
     
 
-    def agregar_pedido(self, pedido: PedidoSolicitud) -> None:
+    def agregar_pedido(self, pedido: Pedido) -> None:
         """Agrega un pedido a la cola (FIFO)."""
         self.cola_pedidos.append(pedido)
 
-    def obtener_siguiente(self) -> Optional[PedidoSolicitud]:
+    def obtener_siguiente(self) -> Optional[Pedido]:
         """Saca y devuelve el siguiente pedido en la cola (FIFO)."""
         if self.cola_pedidos:
             return self.cola_pedidos.popleft()
         return None
 
-    def ver_pedido_actual(self) -> Optional[PedidoSolicitud]:
+    def ver_pedido_actual(self) -> Optional[Pedido]:
         """Devuelve el primer pedido de la cola sin retirarlo."""
         if self.cola_pedidos:
             return self.cola_pedidos[0]
         return None
 
-    def ver_pedidos(self) -> List[PedidoSolicitud]:
+    def ver_pedidos(self) -> List[Pedido]:
         """Devuelve una lista de los pedidos actuales (sin sacarlos)."""
         return list(self.cola_pedidos)
 
 
     # ------------------ Ordenamientos ------------------
-    def ordenar_por_duracion(self) -> List[PedidoSolicitud]:
+    def ordenar_por_duracion(self) -> List[Pedido]:
         """Devuelve los pedidos ordenados por duración (menor a mayor)."""
         return sorted(self.cola_pedidos, key=lambda p: p.duration)
 
-    def ordenar_por_prioridad(self) -> List[PedidoSolicitud]:
+    def ordenar_por_prioridad(self) -> List[Pedido]:
         """Devuelve los pedidos ordenados por prioridad (mayor a menor)."""
         return sorted(self.cola_pedidos, key=lambda p: p.priority, reverse=True)
 
     # ------------------ Filtros por tiempo ------------------
-    def pedidos_vencidos(self, tiempo_actual: int) -> List[PedidoSolicitud]:
+    def pedidos_vencidos(self, tiempo_actual: int) -> List[Pedido]:
         """
         Devuelve una lista de pedidos que ya excedieron su duración
         desde release_time.
         """
-        return [p for p in self.cola_pedidos if tiempo_actual >= p.release_time + p.duration]
+        return [p for p in self.cola_pedidos if tiempo_actual >= p.deadline]
 
-    def pedidos_pendientes(self, tiempo_actual: int) -> List[PedidoSolicitud]:
+    def pedidos_pendientes(self, tiempo_actual: int) -> List[Pedido]:
         """
         Devuelve los pedidos que aún están dentro de su duración.
         """
-        return [p for p in self.cola_pedidos if tiempo_actual < p.release_time + p.duration]
+        return [p for p in self.cola_pedidos if tiempo_actual < p.deadline]
 
     # -------------------------
     # Pedidos Disponibles
     # -------------------------
 
-    def add_available(self, pedido: PedidoSolicitud):
+    def add_available(self, pedido: Pedido):
         """Agrega un pedido a la lista de disponibles"""
         self.available_orders.append(pedido)
 
-    def remove_available(self, pedido: PedidoSolicitud):
+    def remove_available(self, pedido: Pedido):
         """Elimina un pedido de los disponibles"""
         if pedido in self.available_orders:
             self.available_orders.remove(pedido)
 
     # Pedidos disponibles para aceptar 
-    def list_available(self) -> List[PedidoSolicitud]:
+    def list_available(self) -> List[Pedido]:
         return self.available_orders
 
     def ordenar_disponibles_por_prioridad(self):
@@ -112,13 +112,13 @@ class GestorPedidos:
     # -------------------------
     # Navegación en el inventario
     # -------------------------
-    def siguiente_inventario(self) -> Optional[PedidoSolicitud]:
+    def siguiente_inventario(self) -> Optional[Pedido]:
         return self.inventory.next()
 
-    def anterior_inventario(self) -> Optional[PedidoSolicitud]:
+    def anterior_inventario(self) -> Optional[Pedido]:
         return self.inventory.last()
 
-    def pedido_actual(self) -> Optional[PedidoSolicitud]:
+    def pedido_actual(self) -> Optional[Pedido]:
         return self.inventory.current_order()
 
     # -------------------------
@@ -127,5 +127,5 @@ class GestorPedidos:
     def peso_inventario(self) -> int:
         return self.inventory.current_weight()
 
-    def listar_inventario(self) -> List[PedidoSolicitud]:
+    def listar_inventario(self) -> List[Pedido]:
         return self.inventory.get_orders()
\ No newline at end of file
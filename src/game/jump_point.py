@@ -0,0 +1,175 @@
+import heapq
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from src.models.MapaCompilado import MapaCompilado
+
+# Clase de cada tile para la búsqueda
+_BLOQUEADO, _UNIFORME, _PONDERADO = 0, 1, 2
+_DIRECCIONES = ((0, -1), (0, 1), (-1, 0), (1, 0))  # arriba, abajo, izq, der
+
+
+class BuscadorJPS:
+    """
+    Jump Point Search sobre la grilla de 4 vecinos, con los pesos de superficie.
+
+    Los tiles con el costo más común del mapa (las calles) son "uniformes": ahí
+    la búsqueda salta en línea recta y solo se detiene en puntos de salto (la
+    meta, vecinos forzados por obstáculos o giros que llevan a alguno). Los
+    tiles con otro costo (parques, etc.) se expanden uno a uno como en
+    Dijkstra, y los saltos se detienen al llegar a su lado.
+
+    Orden canónico: primero horizontal y después vertical. Un nodo al que se
+    llegó en horizontal sigue de largo o gira; uno al que se llegó en vertical
+    solo gira si el camino horizontal-primero está tapado.
+    """
+
+    def __init__(self, mapa: MapaCompilado, bloqueado: List[bool], costos: List[float]):
+        self.width = ancho = mapa.width
+        self.height = mapa.height
+        grilla = bytes(mapa.grilla)
+
+        # Costo uniforme: el costo caminable que más tiles cubre
+        por_costo: Dict[float, int] = Counter()
+        for indice, cantidad in Counter(grilla).items():
+            if not bloqueado[indice]:
+                por_costo[costos[indice]] += cantidad
+        self.costo_uniforme = max(por_costo, key=por_costo.get) if por_costo else 1.0
+        self.costo_minimo = min(por_costo) if por_costo else 1.0  # Para la heurística (admisible)
+
+        tabla = bytes(
+            _BLOQUEADO if b else (_UNIFORME if costo == self.costo_uniforme else _PONDERADO)
+            for b, costo in zip(bloqueado, costos)
+        )
+        self.clases = grilla.translate(tabla.ljust(256, bytes([_BLOQUEADO])))
+        self.costos_tile = costos
+        self.grilla = grilla
+        self.expandidos = 0  # Nodos expandidos por la última búsqueda (para medirla contra Dijkstra)
+
+        # Tiles uniformes al lado de uno ponderado: ahí los saltos siempre paran
+        self.borde = bytearray(len(grilla))
+        i = self.clases.find(_PONDERADO)
+        while i != -1:
+            x, y = i % ancho, i // ancho
+            for dx, dy in _DIRECCIONES:
+                if self._clase(x + dx, y + dy) == _UNIFORME:
+                    self.borde[(y + dy) * ancho + x + dx] = 1
+            i = self.clases.find(_PONDERADO, i + 1)
+
+    def _clase(self, x: int, y: int) -> int:
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return _BLOQUEADO
+        return self.clases[y * self.width + x]
+
+    def _libre(self, x: int, y: int) -> bool:
+        return self._clase(x, y) != _BLOQUEADO
+
+    def _forzado(self, x: int, y: int, s: int, dy: int) -> bool:
+        """
+        Si el vecino horizontal (x + s, y) es forzado al llegar en vertical: no se
+        podía llegar primero en horizontal porque ese tile está bloqueado o no es
+        uniforme (por ahí el camino costaría distinto).
+        """
+        return self._libre(x + s, y) and self._clase(x + s, y - dy) != _UNIFORME
+
+    # ---------------- Saltos ----------------
+    def _saltar_vertical(self, x: int, y: int, dy: int, meta: Tuple[int, int]) -> Optional[Tuple[int, int, int]]:
+        """Devuelve (x, y, pasos) del próximo punto de salto, o None si el camino se cierra"""
+        pasos = 0
+        while True:
+            y += dy
+            pasos += 1
+            if self._clase(x, y) != _UNIFORME:
+                return None
+            if (x, y) == meta or self.borde[y * self.width + x]:
+                return x, y, pasos
+            for s in (-1, 1):
+                if self._forzado(x, y, s, dy):
+                    return x, y, pasos
+
+    def _saltar_horizontal(self, x: int, y: int, dx: int, meta: Tuple[int, int]) -> Optional[Tuple[int, int, int]]:
+        pasos = 0
+        while True:
+            x += dx
+            pasos += 1
+            if self._clase(x, y) != _UNIFORME:
+                return None
+            if (x, y) == meta or self.borde[y * self.width + x]:
+                return x, y, pasos
+            # Un giro vertical desde aquí llega a algo: este tile es punto de salto
+            if self._saltar_vertical(x, y, -1, meta) or self._saltar_vertical(x, y, 1, meta):
+                return x, y, pasos
+
+    def _sucesores(self, x: int, y: int, llegada: Optional[Tuple[int, int]], meta: Tuple[int, int]):
+        """(x, y, costo, dirección) de cada sucesor del nodo"""
+        completo = llegada is None or self._clase(x, y) == _PONDERADO or self.borde[y * self.width + x]
+        if completo:
+            direcciones = _DIRECCIONES
+        elif llegada[0]:  # llegó en horizontal: seguir o girar
+            direcciones = (llegada, (0, -1), (0, 1))
+        else:  # llegó en vertical: seguir, y girar solo si es forzado
+            dy = llegada[1]
+            direcciones = [llegada] + [(s, 0) for s in (-1, 1) if self._forzado(x, y, s, dy)]
+
+        for dx, dy in direcciones:
+            nx, ny = x + dx, y + dy
+            clase = self._clase(nx, ny)
+            if clase == _BLOQUEADO:
+                continue
+            if clase == _PONDERADO:
+                yield nx, ny, self.costos_tile[self.grilla[ny * self.width + nx]], (dx, dy)
+                continue
+            salto = self._saltar_horizontal(x, y, dx, meta) if dx else self._saltar_vertical(x, y, dy, meta)
+            if salto is not None:
+                sx, sy, pasos = salto
+                yield sx, sy, pasos * self.costo_uniforme, (dx, dy)
+
+    # ---------------- Búsqueda ----------------
+    def buscar(self, inicio: Tuple[int, int], meta: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Camino de costo mínimo de `inicio` a `meta` (ambos caminables), tile por
+        tile y sin incluir `inicio`. Vacío si no hay camino.
+        """
+        inicio, meta = (inicio[0], inicio[1]), (meta[0], meta[1])
+        if inicio == meta or not self._libre(*meta):
+            return []
+        mx, my = meta
+
+        def h(x: int, y: int) -> float:
+            return (abs(x - mx) + abs(y - my)) * self.costo_minimo
+
+        self.expandidos = 0
+        costos: Dict[Tuple[int, int], float] = {inicio: 0.0}
+        padres: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        heap = [(h(*inicio), 0.0, inicio, None)]
+        while heap:
+            _, costo, nodo, llegada = heapq.heappop(heap)
+            if nodo == meta:
+                return self._reconstruir(padres, inicio, meta)
+            if costo > costos[nodo]:
+                continue
+            self.expandidos += 1
+            for nx, ny, paso, direccion in self._sucesores(nodo[0], nodo[1], llegada, meta):
+                vecino = (nx, ny)
+                nuevo = costo + paso
+                if nuevo < costos.get(vecino, float("inf")):
+                    costos[vecino] = nuevo
+                    padres[vecino] = nodo
+                    heapq.heappush(heap, (nuevo + h(nx, ny), nuevo, vecino, direccion))
+        return []
+
+    @staticmethod
+    def _reconstruir(padres: Dict[Tuple[int, int], Tuple[int, int]], inicio: Tuple[int, int],
+                     meta: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Expande los tramos rectos entre puntos de salto a pasos de un tile"""
+        puntos = [meta]
+        while puntos[-1] != inicio:
+            puntos.append(padres[puntos[-1]])
+        puntos.reverse()
+        camino = []
+        for (ax, ay), (bx, by) in zip(puntos, puntos[1:]):
+            dx, dy = (bx > ax) - (bx < ax), (by > ay) - (by < ay)
+            while (ax, ay) != (bx, by):
+                ax, ay = ax + dx, ay + dy
+                camino.append((ax, ay))
+        return camino
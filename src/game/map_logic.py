@@ -1,74 +1,120 @@
-from typing import Tuple, Optional
+from array import array
+from pathlib import Path
+from typing import FrozenSet, List, Tuple, Optional, Union
+from src.game.flow_field import ServicioCamposDeFlujo
+from src.game.jump_point import BuscadorJPS
+from src.game.map_pipeline import PreprocesadorMapa
 from src.models.CityMap import CityMap
+from src.models.MapaCompilado import MapaCompilado
 from src.models.TileInfo import TileInfo
 
 
 class MapLogic:
     
-    def __init__(self, city_map: CityMap, tile_width: int, tile_height: int):
+    def __init__(self, city_map: Union[CityMap, MapaCompilado], tile_width: int, tile_height: int,
+                 cache_dir: Optional[Path] = None):
         self.city_map = city_map
         self.tile_width = tile_width
         self.tile_height = tile_height
-        
-        # Cache para optimizar consultas frecuentes
-        self._tile_cache = {}
-        
-    def is_blocked(self, tile_x: int, tile_y: int) -> bool:
-        # Verificar límites del mapa
-        if tile_x < 0 or tile_y < 0 or tile_x >= self.city_map.width or tile_y >= self.city_map.height:
+
+        # Grilla uint8 de índices de código (mapeada desde el .cqmap o compilada en memoria)
+        self.mapa = MapaCompilado.desde(city_map)
+        # Bloqueo precalculado por código: is_blocked es una lectura de la grilla y una de esta lista
+        self._bloqueado: List[bool] = [self._codigo_bloqueado(info) for info in self.mapa.infos]
+        # Costo de pisar cada código, igual que Bot._get_tile_cost: surface_weight o 1.0
+        self._costos: List[float] = [info.surface_weight if info is not None and info.surface_weight else 1.0
+                                     for info in self.mapa.infos]
+        # Estructuras derivadas persistidas en cache/derived/<hash>/ (None = sin caché en disco)
+        self.derivados: Optional[PreprocesadorMapa] = PreprocesadorMapa(self.mapa, cache_dir) if cache_dir else None
+        self._componentes: Optional[memoryview] = None
+        # Campos de flujo por destino, compartidos por todos los bots de este mapa
+        self.campos_de_flujo = ServicioCamposDeFlujo(self.mapa, self._bloqueado, self._costos)
+        self._buscador_jps: Optional[BuscadorJPS] = None
+
+    @staticmethod
+    def _codigo_bloqueado(tile_info: Optional[TileInfo]) -> bool:
+        # Código que no está en la leyenda: bloqueado
+        if tile_info is None:
+            return True
+
+        # Si el tile está explícitamente marcado como bloqueado
+        if tile_info.blocked == True:
             return True
-        
-        try:
-            # Obtener información del tile
-            tile_info = self.get_tile_info(tile_x, tile_y)
             
-            # Si el tile está explícitamente marcado como bloqueado
-            if tile_info.blocked == True:
-                return True
-                
-            # Si es un edificio, siempre bloqueado
-            if tile_info.name == "edificio":
-                return True
-                
-            # Parques: caminables en este juego
-            if tile_info.name == "parque":
-                return False
-                
-            # Calles siempre caminables
-            if tile_info.name == "calle":
-                return False
-                
-            # Por defecto, si no sabemos qué es, lo consideramos bloqueado
+        # Si es un edificio, siempre bloqueado
+        if tile_info.name == "edificio":
             return True
+            
+        # Parques: caminables en este juego
+        if tile_info.name == "parque":
+            return False
+            
+        # Calles siempre caminables
+        if tile_info.name == "calle":
+            return False
+            
+        # Por defecto, si no sabemos qué es, lo consideramos bloqueado
+        return True
         
-        except (IndexError, AttributeError):
-            # Seguridad adicional para errores de índice o atributos
+    def is_blocked(self, tile_x: int, tile_y: int) -> bool:
+        # Verificar límites del mapa
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.mapa.width or tile_y >= self.mapa.height:
             return True
+        return self._bloqueado[self.mapa.indice(tile_x, tile_y)]
     
+    # ---------------- Alcanzabilidad ----------------
+    @property
+    def componentes(self) -> memoryview:
+        """Etiqueta de componente conexa por tile (uint32, 0 = bloqueado); se calcula una sola vez"""
+        if self._componentes is None:
+            if self.derivados:
+                datos = self.derivados.obtener("componentes")
+            else:
+                datos = _construir_componentes(self.mapa, _construir_transitable(self.mapa))
+            self._componentes = memoryview(datos).cast("I")
+        return self._componentes
+
+    @property
+    def buscador_jps(self) -> BuscadorJPS:
+        """Jump Point Search sobre este mapa; se arma la primera vez que se pide"""
+        if self._buscador_jps is None:
+            self._buscador_jps = BuscadorJPS(self.mapa, self._bloqueado, self._costos)
+        return self._buscador_jps
+
+    def componente(self, tile_x: int, tile_y: int) -> int:
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.mapa.width or tile_y >= self.mapa.height:
+            return 0
+        return self.componentes[tile_y * self.mapa.width + tile_x]
+
+    def componentes_de_acceso(self, tile: Tuple[int, int]) -> FrozenSet[int]:
+        """
+        Componentes desde las que se llega al tile: la suya si es caminable y las de
+        sus vecinos caminables (los pedidos se recogen/entregan estando al lado).
+        """
+        x, y = tile
+        vecinos = ((x, y), (x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+        return frozenset(c for c in (self.componente(vx, vy) for vx, vy in vecinos) if c)
+
+    def alcanzable(self, origen: Tuple[int, int], destino: Tuple[int, int]) -> bool:
+        """Si desde `origen` se puede llegar a `destino` (o a su lado); O(1)"""
+        return not self.componentes_de_acceso(origen).isdisjoint(self.componentes_de_acceso(destino))
+
+    def pedido_alcanzable(self, pedido, origen: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Si el pedido se puede completar: recogida y entrega en una misma componente y,
+        si se indica `origen`, que sea la componente de ese tile.
+        """
+        comunes = self.componentes_de_acceso(pedido.pickup) & self.componentes_de_acceso(pedido.dropoff)
+        if origen is None:
+            return bool(comunes)
+        return not comunes.isdisjoint(self.componentes_de_acceso(origen))
+
     def get_tile_info(self, tile_x: int, tile_y: int) -> Optional[TileInfo]:
         # Verificar límites
-        if tile_x < 0 or tile_y < 0 or tile_x >= self.city_map.width or tile_y >= self.city_map.height:
-            return None
-            
-        try:
-            # Usar cache para optimizar consultas repetidas
-            cache_key = (tile_x, tile_y)
-            if cache_key in self._tile_cache:
-                return self._tile_cache[cache_key]
-            
-            # Obtener código del tile y su información
-            tile_code = self.city_map.tiles[tile_y][tile_x]
-            tile_info = self.city_map.legend.get(tile_code)
-            
-            # Guardar en cache
-            self._tile_cache[cache_key] = tile_info
-            
-            return tile_info
-            
-        except (IndexError, KeyError):
+        if tile_x < 0 or tile_y < 0 or tile_x >= self.mapa.width or tile_y >= self.mapa.height:
             return None
+        return self.mapa.info(tile_x, tile_y)
 
-    
     def pixels_to_tiles(self, pixel_x: float, pixel_y: float) -> Tuple[int, int]:
 
         tile_x = int(pixel_x // self.tile_width)
@@ -88,3 +134,40 @@ class MapLogic:
         return self.pixels_to_tiles(center_x, center_y)
     
 
+
+def _construir_transitable(mapa: MapaCompilado) -> bytes:
+    """Un byte por tile: 1 si se puede caminar (mismas reglas que is_blocked)"""
+    tabla = bytes(0 if MapLogic._codigo_bloqueado(info) else 1 for info in mapa.infos)
+    return bytes(mapa.grilla).translate(tabla.ljust(256, b"\x00"))
+
+
+PreprocesadorMapa.registrar("transitable", 1, _construir_transitable)
+
+
+def _construir_componentes(mapa: MapaCompilado, transitable: bytes) -> bytes:
+    """
+    Etiquetado de componentes conexas (4 vecinos) sobre los tiles caminables
+    (el artefacto "transitable"): uint32 por tile, 0 para bloqueados y 1..n
+    para cada componente.
+    """
+    ancho, total = mapa.width, mapa.width * mapa.height
+    etiquetas = array("I", bytes(total * array("I").itemsize))
+    actual = 0
+    inicio = transitable.find(1)
+    while inicio != -1:
+        if not etiquetas[inicio]:
+            actual += 1
+            etiquetas[inicio] = actual
+            pendientes = [inicio]
+            while pendientes:
+                i = pendientes.pop()
+                x = i % ancho
+                for j in (i - ancho, i + ancho, i - 1 if x > 0 else -1, i + 1 if x < ancho - 1 else -1):
+                    if 0 <= j < total and transitable[j] and not etiquetas[j]:
+                        etiquetas[j] = actual
+                        pendientes.append(j)
+        inicio = transitable.find(1, inicio + 1)
+    return etiquetas.tobytes()
+
+
+PreprocesadorMapa.registrar("componentes", 1, _construir_componentes, requiere=("transitable",))
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import shutil
+import struct
+from pathlib import Path
+from typing import Callable, Dict, Sequence, Tuple
+
+from src.models.MapaCompilado import MapaCompilado
+
+
+class PreprocesadorMapa:
+    """
+    Estructuras derivadas de un mapa, calculadas una vez y guardadas entre partidas.
+
+    Cada mapa se identifica por un hash de su contenido (dimensiones, tabla de
+    códigos con su leyenda y grilla), así que los artefactos viven en
+    cache/derived/<hash>/ y un mapa distinto usa otra carpeta sin invalidar nada
+    a mano. Al descargar un mapa nuevo, ManejadorAPI borra las carpetas de
+    mapas anteriores (limpiar_otros).
+
+    Los artefactos se registran con PreprocesadorMapa.registrar(nombre, version,
+    construir, requiere), donde construir(mapa, *requeridos) devuelve bytes y
+    recibe los bytes de los artefactos nombrados en `requiere`, obtenidos por
+    este mismo preprocesador. Se construyen recién la primera vez que alguien
+    los pide; subir `version` fuerza a recalcularlos (si cambia un requerido,
+    hay que subir también la de quienes dependen de él).
+    """
+
+    SUBDIRECTORIO = "derived"
+
+    # nombre -> (versión, función que construye los bytes, artefactos que recibe)
+    _artefactos: Dict[str, Tuple[int, Callable[..., bytes], Tuple[str, ...]]] = {}
+
+    def __init__(self, mapa: MapaCompilado, cache_dir: Path):
+        self.mapa = mapa
+        self.hash = self.hash_contenido(mapa)
+        self.raiz = Path(cache_dir) / self.SUBDIRECTORIO
+        self.directorio = self.raiz / self.hash
+        self._cargados: Dict[str, bytes] = {}
+
+    @classmethod
+    def registrar(cls, nombre: str, version: int, construir: Callable[..., bytes],
+                  requiere: Sequence[str] = ()) -> None:
+        cls._artefactos[nombre] = (version, construir, tuple(requiere))
+
+    @staticmethod
+    def hash_contenido(mapa: MapaCompilado) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(struct.pack("<II", mapa.width, mapa.height))
+        for codigo, info in zip(mapa.codigos, mapa.infos):
+            h.update(repr((codigo, None if info is None else (info.name, info.surface_weight, info.blocked))).encode("utf-8"))
+        h.update(mapa.grilla)
+        return h.hexdigest()
+
+    def ruta(self, nombre: str) -> Path:
+        version = self._artefactos[nombre][0]
+        return self.directorio / f"{nombre}.v{version}.bin"
+
+    def obtener(self, nombre: str) -> bytes:
+        """Bytes del artefacto: de memoria, del disco o construyéndolo (y guardándolo)"""
+        if nombre in self._cargados:
+            return self._cargados[nombre]
+        ruta = self.ruta(nombre)
+        try:
+            datos = ruta.read_bytes()
+        except FileNotFoundError:
+            _, construir, requiere = self._artefactos[nombre]
+            datos = bytes(construir(self.mapa, *(self.obtener(r) for r in requiere)))
+            self._guardar(ruta, datos)
+        self._cargados[nombre] = datos
+        return datos
+
+    def _guardar(self, ruta: Path, datos: bytes) -> None:
+        try:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            tmp_path = ruta.with_name(ruta.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(datos)
+            os.replace(tmp_path, ruta)
+        except OSError as e:
+            # Sin caché en disco el artefacto igual sirve en esta partida
+            print(f"[WARNING] No se pudo guardar {ruta}: {e}")
+
+    @classmethod
+    def limpiar_otros(cls, cache_dir: Path, hash_actual: str) -> None:
+        """Borra los derivados de mapas que ya no son el actual"""
+        raiz = Path(cache_dir) / cls.SUBDIRECTORIO
+        if not raiz.exists():
+            return
+        for carpeta in raiz.iterdir():
+            if carpeta.is_dir() and carpeta.name != hash_actual:
+                shutil.rmtree(carpeta, ignore_errors=True)
+
@@ -1,9 +1,11 @@
 # map_rend.py
 import pygame
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from src.models.CityMap import CityMap
+from src.models.MapaCompilado import MapaCompilado
+from src.game.asset_manager import AssetManager
 
 
 class MapRenderer:
@@ -16,13 +18,14 @@ class MapRenderer:
 
     def __init__(
         self,
-        city_map: CityMap,
+        city_map: Union[CityMap, MapaCompilado],
         sprites_dir: Path,
         tile_width: int = 40,
         tile_height: int = 44,
         viewport_size: Optional[Tuple[int, int]] = None, #Dupla para el viewport, el cual da la ubicación en x y y con ints.
     ):
         self.city_map = city_map
+        self.mapa = MapaCompilado.desde(city_map)
         self.sprites_dir = Path(sprites_dir)
         self.tile_width = int(tile_width)
         self.tile_height = int(tile_height)
@@ -31,26 +34,20 @@ class MapRenderer:
 
         self.viewport_size = viewport_size
 
+        self.assets = AssetManager.para_directorio(self.sprites_dir)
         self.sprites: dict[str, Optional[pygame.Surface]] = {}
         self._cargar_sprites()
 
-    def _cargar_sprite(self, filename: str) -> Optional[pygame.Surface]:
-        ruta = self.sprites_dir / filename
-        try:
-            surf = pygame.image.load(str(ruta)).convert_alpha()
-            return pygame.transform.scale(surf, (self.tile_width, self.tile_height))
-        except Exception as e:
-            print(f"[MapRenderer] Warning: no se pudo cargar sprite '{ruta}': {e}")
-            return None
-
     def _cargar_sprites(self):
-        self.sprites["B"] = self._cargar_sprite("Spr_edificio1.png")
-        self.sprites["C"] = self._cargar_sprite("Spr_acera.png")
-        self.sprites["P"] = self._cargar_sprite("Spr_parque.png")
-        
-        # Cargar sprites para paquetes y puntos de entrega
-        self.sprites["package"] = self._cargar_sprite("package.png")
-        self.sprites["delivery_point"] = self._cargar_sprite("delivery_point.png")
+        # Los sprites se obtienen de la caché compartida (un solo atlas por tamaño de tile)
+        self.sprites.update(self.assets.obtener_varios({
+            "B": "Spr_edificio1.png",
+            "C": "Spr_acera.png",
+            "P": "Spr_parque.png",
+            # Sprites para paquetes y puntos de entrega
+            "package": "package.png",
+            "delivery_point": "delivery_point.png",
+        }, (self.tile_width, self.tile_height)))
 
     def set_camera_pos(self, px: int, py: int) -> None:
         self.camera_x = int(px)
@@ -69,8 +66,8 @@ class MapRenderer:
         self._clamp_camera()
 
     def _clamp_camera(self):
-        max_px = max(0, self.city_map.width * self.tile_width - 1)
-        max_py = max(0, self.city_map.height * self.tile_height - 1)
+        max_px = max(0, self.mapa.width * self.tile_width - 1)
+        max_py = max(0, self.mapa.height * self.tile_height - 1)
         self.camera_x = max(0, min(self.camera_x, max_px))
         self.camera_y = max(0, min(self.camera_y, max_py))
 
@@ -92,13 +89,14 @@ class MapRenderer:
         # rango visible en tiles (clamped al mapa)
         start_x = max(0, self.camera_x // self.tile_width)
         start_y = max(0, self.camera_y // self.tile_height)
-        end_x = min(self.city_map.width, (self.camera_x + viewport_w) // self.tile_width + 1)
-        end_y = min(self.city_map.height, (self.camera_y + viewport_h) // self.tile_height + 1)
+        end_x = min(self.mapa.width, (self.camera_x + viewport_w) // self.tile_width + 1)
+        end_y = min(self.mapa.height, (self.camera_y + viewport_h) // self.tile_height + 1)
 
+        codigos = self.mapa.codigos
         for y in range(start_y, end_y): #dibuja los tiles de x y y, usando los sprites que corresponden.
-            fila = self.city_map.tiles[y]
+            fila = self.mapa.fila(y)
             for x in range(start_x, end_x):
-                code = fila[x]
+                code = codigos[fila[x]]
                 sx, sy = self.tile_to_screen(x, y)
                 rect = pygame.Rect(sx, sy, self.tile_width, self.tile_height)
                 sprite = self.sprites.get(code)
@@ -157,7 +155,7 @@ class MapRenderer:
         
         start_x = max(0, self.camera_x // self.tile_width)
         start_y = max(0, self.camera_y // self.tile_height)
-        end_x = min(self.city_map.width, (self.camera_x + viewport_w) // self.tile_width + 1)
-        end_y = min(self.city_map.height, (self.camera_y + viewport_h) // self.tile_height + 1)
+        end_x = min(self.mapa.width, (self.camera_x + viewport_w) // self.tile_width + 1)
+        end_y = min(self.mapa.height, (self.camera_y + viewport_h) // self.tile_height + 1)
         
         return start_x <= tx < end_x and start_y <= ty < end_y
@@ -0,0 +1,162 @@
+import atexit
+import struct
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class RegistroMovimiento(NamedTuple):
+    """Registro compacto de un movimiento (23 bytes en disco)"""
+    tiempo: int
+    x: float
+    y: float
+    direccion: str
+    resistencia: float
+    reputacion: int
+    peso_total: float
+
+
+class MoveJournal:
+    """
+    Bitácora binaria append-only de movimientos del jugador.
+
+    Se escriben dos archivos:
+    - <nombre>.journal: registros de tamaño fijo, uno por movimiento.
+    - <nombre>.ckpt: cada `checkpoint_interval` registros se agrega un checkpoint
+      (índice del registro + estado completo), ordenado por tiempo.
+
+    Para obtener el estado en un tiempo T se busca (búsqueda binaria sobre el archivo)
+    el último checkpoint con tiempo <= T y se recorren hacia adelante los registros
+    siguientes. Nada se mantiene en memoria, así que el uso de memoria es constante
+    sin importar lo larga que sea la jornada.
+    """
+
+    MAGIC_JOURNAL = b"CQMJ"
+    MAGIC_CHECKPOINT = b"CQCK"
+    VERSION = 1
+
+    DIRECCIONES = ("up", "down", "izq", "der")
+
+    _HEADER = struct.Struct("<4sH")
+    _REGISTRO = struct.Struct("<IffBfhf")  # tiempo, x, y, dirección, resistencia, reputación, peso
+    _CHECKPOINT = struct.Struct("<IIffBfhf")  # índice del registro + mismo estado que _REGISTRO
+
+    def __init__(self, ruta: Path, checkpoint_interval: int = 64, flush_interval: int = 32):
+        self.ruta = Path(ruta)
+        self.ruta_checkpoints = self.ruta.with_suffix(".ckpt")
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.flush_interval = max(1, flush_interval)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+
+        self._journal = self._abrir(self.ruta, self.MAGIC_JOURNAL)
+        self._checkpoints = self._abrir(self.ruta_checkpoints, self.MAGIC_CHECKPOINT)
+        self.total = (self.ruta.stat().st_size - self._HEADER.size) // self._REGISTRO.size
+        self._pendientes = 0  # Registros escritos desde el último flush
+        # Red de seguridad para salidas con sys.exit desde menús: lo normal es llamar a cerrar()
+        atexit.register(self.cerrar)
+
+    def _abrir(self, ruta: Path, magic: bytes):
+        """Abre en modo append y escribe el header si el archivo es nuevo"""
+        nuevo = not ruta.exists() or ruta.stat().st_size == 0
+        archivo = open(ruta, "ab")
+        if nuevo:
+            archivo.write(self._HEADER.pack(magic, self.VERSION))
+            archivo.flush()
+        return archivo
+
+    def __len__(self) -> int:
+        return self.total
+
+    # ---------------- Escritura ----------------
+    def registrar(self, tiempo: int, x: float, y: float, direccion: str,
+                  resistencia: float, reputacion: int, peso_total: float) -> None:
+        """Agrega un movimiento al final de la bitácora"""
+        campos = (
+            max(0, int(tiempo)),
+            float(x),
+            float(y),
+            self.DIRECCIONES.index(direccion) if direccion in self.DIRECCIONES else 1,
+            float(resistencia),
+            int(reputacion),
+            float(peso_total),
+        )
+
+        if self.total % self.checkpoint_interval == 0:
+            self._checkpoints.write(self._CHECKPOINT.pack(self.total, *campos))
+
+        self._journal.write(self._REGISTRO.pack(*campos))
+        self.total += 1
+
+        self._pendientes += 1
+        if self._pendientes >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._journal.flush()
+        self._checkpoints.flush()
+        self._pendientes = 0
+
+    def cerrar(self) -> None:
+        atexit.unregister(self.cerrar)
+        if not self._journal.closed:
+            self.flush()
+            self._journal.close()
+            self._checkpoints.close()
+
+    # ---------------- Lectura ----------------
+    def _desempaquetar(self, campos) -> RegistroMovimiento:
+        tiempo, x, y, dir_idx, resistencia, reputacion, peso = campos
+        direccion = self.DIRECCIONES[dir_idx] if dir_idx < len(self.DIRECCIONES) else "down"
+        return RegistroMovimiento(tiempo, x, y, direccion, resistencia, reputacion, peso)
+
+    def _buscar_checkpoint(self, f, tiempo: int) -> Optional[tuple]:
+        """Búsqueda binaria del último checkpoint con tiempo <= tiempo. Devuelve (índice, registro)"""
+        total = (self.ruta_checkpoints.stat().st_size - self._HEADER.size) // self._CHECKPOINT.size
+        bajo, alto = 0, total - 1
+        encontrado = None
+        while bajo <= alto:
+            medio = (bajo + alto) // 2
+            f.seek(self._HEADER.size + medio * self._CHECKPOINT.size)
+            indice, *campos = self._CHECKPOINT.unpack(f.read(self._CHECKPOINT.size))
+            if campos[0] <= tiempo:
+                encontrado = (indice, self._desempaquetar(campos))
+                bajo = medio + 1
+            else:
+                alto = medio - 1
+        return encontrado
+
+    def estado_en(self, tiempo: int) -> Optional[RegistroMovimiento]:
+        """Devuelve el último estado registrado con tiempo <= tiempo (None si no hay)"""
+        self.flush()
+
+        with open(self.ruta_checkpoints, "rb") as f:
+            checkpoint = self._buscar_checkpoint(f, tiempo)
+        if checkpoint is None:
+            return None
+
+        indice, estado = checkpoint
+        with open(self.ruta, "rb") as f:
+            # Reproducir hacia adelante desde el registro siguiente al checkpoint
+            f.seek(self._HEADER.size + (indice + 1) * self._REGISTRO.size)
+            for _ in range(indice + 1, self.total):
+                datos = f.read(self._REGISTRO.size)
+                if len(datos) < self._REGISTRO.size:
+                    break
+                registro = self._desempaquetar(self._REGISTRO.unpack(datos))
+                if registro.tiempo > tiempo:
+                    break
+                estado = registro
+        return estado
+
+    @classmethod
+    def limpiar_antiguas(cls, directorio: Path, conservar: int = 5) -> None:
+        """Borra las bitácoras más viejas del directorio, dejando las `conservar` más recientes"""
+        directorio = Path(directorio)
+        if not directorio.exists():
+            return
+        journals = sorted(directorio.glob("*.journal"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for viejo in journals[conservar:]:
+            try:
+                viejo.unlink()
+                viejo.with_suffix(".ckpt").unlink(missing_ok=True)
+            except OSError as e:
+                print(f"[WARNING] No se pudo borrar {viejo}: {e}")
@@ -1,12 +1,12 @@
 import pygame
-from typing import List, Optional
-from src.models.Pedido import PedidoSolicitud
+from typing import List, Optional, Tuple
+from src.models.Pedido import Pedido
 from src.game.job_manager import GestorPedidos
 
 class NotificadorPedidos:
     def __init__(self, screen_width: int, screen_height: int):
         self.activo = False
-        self.pedido_actual: Optional[PedidoSolicitud] = None
+        self.pedido_actual: Optional[Pedido] = None
         self.screen_width = screen_width
         self.screen_height = screen_height
         
@@ -16,14 +16,27 @@ class NotificadorPedidos:
         self.fuente_opciones = pygame.font.Font("./sprites/font.ttf", 10)
         
         # Gestión de pedidos pendientes por tiempo
-        self.pedidos_pendientes: List[PedidoSolicitud] = []
+        self.pedidos_pendientes: List[Pedido] = []
         self.pedidos_mostrados = set()  # IDs de pedidos ya notificados al jugador
+
+        # Para marcar pedidos inalcanzables al liberarlos (ver configurar_mapa)
+        self.map_logic = None
+        self.origen = None
         
-    def agregar_pedidos_iniciales(self, pedidos: List[PedidoSolicitud]):
+    def agregar_pedidos_iniciales(self, pedidos: List[Pedido]):
         """Agrega todos los pedidos iniciales a la lista de pendientes"""
         self.pedidos_pendientes.extend(pedidos)
 
         
+    def configurar_mapa(self, map_logic, origen: Optional[Tuple[int, int]] = None):
+        """
+        Con un MapLogic, cada pedido se marca al liberarse como alcanzable o no
+        (pedido.alcanzable). `origen` es un tile del jugador: nadie sale de su
+        componente del mapa, así que alcanza con el tile inicial.
+        """
+        self.map_logic = map_logic
+        self.origen = origen
+
     def actualizar(self, tiempo_actual_segundos: int):
         """Verifica si hay pedidos que deben mostrarse según su release_time"""
         if self.activo:
@@ -33,14 +46,18 @@ class NotificadorPedidos:
         for pedido in self.pedidos_pendientes[:]:
             if (pedido.release_time <= tiempo_actual_segundos and 
                 pedido.id not in self.pedidos_mostrados):
-                
+
+                if self.map_logic is not None:
+                    pedido.alcanzable = self.map_logic.pedido_alcanzable(pedido, self.origen)
+                    if not pedido.alcanzable:
+                        print(f"[WARNING] Pedido {pedido.id} inalcanzable: {pedido.pickup} -> {pedido.dropoff}")
                 self.mostrar_pedido(pedido)
                 self.pedidos_mostrados.add(pedido.id)
                 self.pedidos_pendientes.remove(pedido)
                 return True
         return False
         
-    def mostrar_pedido(self, pedido: PedidoSolicitud):
+    def mostrar_pedido(self, pedido: Pedido):
         """Activa la notificación para un pedido específico"""
         self.activo = True
         self.pedido_actual = pedido
@@ -78,6 +95,9 @@ class NotificadorPedidos:
         # Centrar y dibujar textos
         screen.blit(titulo, (x + (ancho_cuadro - titulo.get_width()) // 2, y + 20))
         screen.blit(detalles, (x + (ancho_cuadro - detalles.get_width()) // 2, y + 80))
+        if self.pedido_actual.alcanzable is False:
+            aviso = self.fuente_detalles.render("No se puede llegar a este pedido", True, (200, 0, 0))
+            screen.blit(aviso, (x + (ancho_cuadro - aviso.get_width()) // 2, y + 105))
         screen.blit(opciones, (x + (ancho_cuadro - opciones.get_width()) // 2, y + 130))
         
     def manejar_eventos(self, event: pygame.event.Event, gestor_pedidos: GestorPedidos) -> bool:
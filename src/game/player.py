@@ -5,10 +5,18 @@ from src.game.stats_module import Stats
 from src.game.reputation import Reputation
 from src.game.save import Save
 from src.game.score import Score
+from src.game.asset_manager import AssetManager
 
 
 class Player(pygame.sprite.Sprite):
 
+    # Sprites por dirección (asegúrate que los nombres coincidan en la carpeta /sprites)
+    SPRITE_FILES = {
+        "up": "Spr_delivery_up.png",
+        "down": "Spr_delivery_down.png",
+        "izq": "Spr_delivery_izq.png",
+        "der": "Spr_delivery_der.png",
+    }
 
     def __init__(self, sprites_dir: Path, stats: Stats, reputation: Reputation, tile_width: int, tile_height: int, start_x: int = 0, start_y: int = 0, save_data: Save = None, player_name: str = None):
         super().__init__()
@@ -51,16 +59,9 @@ class Player(pygame.sprite.Sprite):
         # dirección inicial
         self.direccion = "down"
 
-        # cargar sprites (asegúrate que los nombres coincidan en la carpeta /sprites)
-        self.sprites = {
-            "up": pygame.image.load(sprites_dir / "Spr_delivery_up.png").convert_alpha(),
-            "down": pygame.image.load(sprites_dir / "Spr_delivery_down.png").convert_alpha(),
-            "izq": pygame.image.load(sprites_dir / "Spr_delivery_izq.png").convert_alpha(),
-            "der": pygame.image.load(sprites_dir / "Spr_delivery_der.png").convert_alpha(),
-        }
-
-        # scale sprites to tile size
-        self.sprites = {k: pygame.transform.scale(v, (tile_width, tile_height)) for k, v in self.sprites.items()}
+        # cargar sprites desde la caché compartida (ya escalados al tamaño del tile)
+        assets = AssetManager.para_directorio(sprites_dir)
+        self.sprites = assets.obtener_varios(self.SPRITE_FILES, (tile_width, tile_height))
 
         self.tile_width = tile_width
         self.tile_height = tile_height
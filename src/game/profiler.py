@@ -0,0 +1,154 @@
+import csv
+import math
+import time
+import pygame
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class FrameProfiler:
+    """
+    Perfilador de tiempo por frame.
+    Cada subsistema del loop se mide con un scope con nombre; las últimas
+    `capacidad` muestras de cada scope se guardan en un buffer circular
+    (deque con maxlen) para calcular percentiles p50/p95/p99.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, capacidad: int = 600, out_dir: Optional[Path] = None, intervalo_resumen: int = 30):
+        self.capacidad = capacidad
+        self.out_dir = Path(out_dir) if out_dir else Path("profiling")
+        self.intervalo_resumen = intervalo_resumen  # Frames entre recálculos del resumen del overlay
+
+        self.muestras: Dict[str, deque] = {}  # nombre -> deque de tiempos en ms
+        self.overlay_activo = False
+        self.frames = 0
+
+        self._inicio_frame: Optional[float] = None
+        self._resumen_cache: Dict[str, Dict[str, float]] = {}
+        self._fuente = None
+
+    # ---------------- Medición ----------------
+    def registrar(self, nombre: str, ms: float) -> None:
+        """Agrega una muestra (en milisegundos) al buffer circular del scope"""
+        buffer = self.muestras.get(nombre)
+        if buffer is None:
+            buffer = deque(maxlen=self.capacidad)
+            self.muestras[nombre] = buffer
+        buffer.append(ms)
+
+    @contextmanager
+    def medir(self, nombre: str):
+        """Scope de tiempo: `with profiler.medir("mapa"): ...`"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, (time.perf_counter() - inicio) * 1000.0)
+
+    @contextmanager
+    def frame(self):
+        """Scope del frame completo; se cierra aunque el loop salga con return o una excepción"""
+        self.inicio_frame()
+        try:
+            yield
+        finally:
+            self.fin_frame()
+
+    def inicio_frame(self) -> None:
+        self._inicio_frame = time.perf_counter()
+
+    def fin_frame(self) -> None:
+        if self._inicio_frame is None:
+            return
+        self.registrar("frame", (time.perf_counter() - self._inicio_frame) * 1000.0)
+        self._inicio_frame = None
+        self.frames += 1
+        if self.overlay_activo and self.frames % self.intervalo_resumen == 0:
+            self._resumen_cache = self.resumen()
+
+    # ---------------- Estadísticas ----------------
+    @staticmethod
+    def _percentil(ordenadas: List[float], p: float) -> float:
+        """Percentil por rango más cercano sobre una lista ya ordenada: el elemento ceil(p/100 * n)"""
+        if not ordenadas:
+            return 0.0
+        # p * n antes de dividir: p / 100 * n da 7.000000000000001 con p=7, n=100 y ceil saltaría un lugar
+        indice = max(0, min(len(ordenadas) - 1, math.ceil(p * len(ordenadas) / 100.0) - 1))
+        return ordenadas[indice]
+
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """Devuelve por scope: muestras, promedio, p50, p95, p99 y máximo (ms)"""
+        datos = {}
+        for nombre, buffer in self.muestras.items():
+            ordenadas = sorted(buffer)
+            if not ordenadas:
+                continue
+            fila = {
+                "muestras": len(ordenadas),
+                "promedio": sum(ordenadas) / len(ordenadas),
+                "max": ordenadas[-1],
+            }
+            for p in self.PERCENTILES:
+                fila[f"p{p}"] = self._percentil(ordenadas, p)
+            datos[nombre] = fila
+        return datos
+
+    # ---------------- Overlay ----------------
+    def toggle_overlay(self) -> None:
+        """Alterna el overlay en pantalla (tecla F3)"""
+        self.overlay_activo = not self.overlay_activo
+        if self.overlay_activo:
+            self._resumen_cache = self.resumen()
+
+    def dibujar(self, screen: pygame.Surface) -> None:
+        """Dibuja la tabla de tiempos por subsistema sobre el mapa"""
+        if not self.overlay_activo:
+            return
+
+        if self._fuente is None:
+            self._fuente = pygame.font.Font("./sprites/font.ttf", 8)
+
+        lineas = ["SCOPE         p50    p95    p99 (ms)"]
+        for nombre, fila in self._resumen_cache.items():
+            lineas.append(f"{nombre[:12]:<12} {fila['p50']:6.2f} {fila['p95']:6.2f} {fila['p99']:6.2f}")
+
+        alto = 10 + len(lineas) * 14
+        fondo = pygame.Surface((330, alto), pygame.SRCALPHA)
+        fondo.fill((0, 0, 0, 180))
+        screen.blit(fondo, (5, 5))
+
+        for i, linea in enumerate(lineas):
+            texto = self._fuente.render(linea, True, (0, 255, 0))
+            screen.blit(texto, (10, 10 + i * 14))
+
+    # ---------------- Exportación ----------------
+    def exportar_csv(self, out_path: Optional[Path] = None) -> Optional[Path]:
+        """Escribe el resumen de percentiles en un CSV. No hace nada si no hay muestras."""
+        datos = self.resumen()
+        if not datos:
+            return None
+
+        p = Path(out_path) if out_path else (
+            self.out_dir / f"frame_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with open(p, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["scope", "muestras", "promedio_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+            for nombre, fila in datos.items():
+                writer.writerow([
+                    nombre,
+                    fila["muestras"],
+                    round(fila["promedio"], 4),
+                    round(fila["p50"], 4),
+                    round(fila["p95"], 4),
+                    round(fila["p99"], 4),
+                    round(fila["max"], 4),
+                ])
+        print(f"Perfil de frames guardado en {p}")
+        return p
@@ -1,12 +1,17 @@
 from pydantic import BaseModel 
 from typing import Optional, Tuple, List, Dict 
 import json 
+import os
 from pathlib import Path 
 import uuid # Para generar IDs únicos 
 
+from src.game.scoreboard import ScoreBoard
+
 SAVE_DIR = Path(__file__).resolve().parent / "saves" 
 SAVE_FILE = SAVE_DIR / "save.json" 
 
+# Último score de cada jugador guardado desde la pausa (partidas sin terminar).
+# No es un resultado final: no entra al ScoreBoard ni a los rankings.
 SAVE_SCORES = SAVE_DIR / "saveScores.json"
 
 class Save(BaseModel): 
@@ -37,7 +42,7 @@ class Save(BaseModel):
         for f in SAVE_DIR.glob("*.json"):
             try:
                 # Ignorar el archivo de scores ya que tiene un formato diferente
-                if f.name == "savedScores.json":
+                if f.name in ("savedScores.json", SAVE_SCORES.name):
                     continue
                     
                 if f.stat().st_size == 0:
@@ -50,29 +55,25 @@ class Save(BaseModel):
                 print(f"[WARNING] No se pudo cargar {f}: {e}")
         return saves
     
-    @classmethod
-    def save_score_only_global(self):
-        """Guarda o actualiza el score del jugador en savedScores.json"""
-        self.SAVE_SCORES.mkdir(exist_ok=True)
-        
-        # Cargar scores existentes
+    def save_score_only_global(self) -> str:
+        """Guarda o actualiza el último score del jugador en saveScores.json (fuera del scoreboard)"""
+        SAVE_DIR.mkdir(exist_ok=True)
         scores = {}
-        if self.SAVE_SCORES.exists():
+        if SAVE_SCORES.exists():
             try:
-                with open(self.SAVE_SCORES, "r", encoding="utf-8") as f:
+                with open(SAVE_SCORES, "r", encoding="utf-8") as f:
                     scores = json.load(f)
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, OSError):
                 scores = {}
-        
-        # Actualizar o agregar el score del jugador
+
         if self.player_name:
-            scores[self.player_name] = self.score
-        
-        # Guardar nuevamente
-        with open(self.SAVE_SCORES, "w", encoding="utf-8") as f:
+            scores[self.player_name] = self.score or 0
+
+        tmp_path = SAVE_SCORES.with_name(SAVE_SCORES.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(scores, f, indent=4, ensure_ascii=False)
-        
-        return str(self.SAVE_SCORES)
+        os.replace(tmp_path, SAVE_SCORES)
+        return str(SAVE_SCORES)
     
     @classmethod
     def get_ranking(cls, top_n: int = 10) -> list[tuple[str, int]]:
@@ -84,15 +85,7 @@ class Save(BaseModel):
         Returns:
             Lista de tuplas (nombre, score) ordenadas de mayor a menor score.
         """
-        if not cls.SAVE_SCORES.exists():
-            return []
-
-        try:
-            with open(cls.SAVE_SCORE, "r", encoding="utf-8") as f:
-                scores = json.load(f)
-        except json.JSONDecodeError:
-            return []
-
-        # Ordenar por score descendente
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_scores[:top_n]
\ No newline at end of file
+        return [
+            (entrada["player_name"], entrada["puntaje_final"])
+            for entrada in ScoreBoard.para_directorio(SAVE_DIR).top(n=top_n)
+        ]
@@ -0,0 +1,228 @@
+import io
+import json
+import lzma
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class SaveFormatError(Exception):
+    """El archivo no es un snapshot binario válido"""
+
+
+class _LectorComprimido:
+    """Lee un flujo comprimido por partes, descomprimiendo solo lo que se pide"""
+
+    TAM_BLOQUE = 64 * 1024
+
+    def __init__(self, archivo, descompresor):
+        self.archivo = archivo
+        self.descompresor = descompresor
+        self._buffer = bytearray()
+        self._pos = 0  # Bytes ya consumidos del buffer (se compacta solo al recargar)
+
+    def leer(self, n: int) -> bytes:
+        while len(self._buffer) - self._pos < n:
+            bloque = self.archivo.read(self.TAM_BLOQUE)
+            if not bloque:
+                raise SaveFormatError("Snapshot truncado")
+            del self._buffer[:self._pos]
+            self._pos = 0
+            self._buffer += self.descompresor.decompress(bloque)
+        datos = bytes(self._buffer[self._pos:self._pos + n])
+        self._pos += n
+        return datos
+
+    def leer_struct(self, formato: struct.Struct) -> tuple:
+        return formato.unpack(self.leer(formato.size))
+
+    def verificar_fin(self) -> None:
+        """
+        Exige que el flujo comprimido haya terminado: si el archivo se cortó justo
+        en el trailer (checksum de zlib, fin de lzma), los datos salen completos
+        pero el snapshot igual está truncado.
+        """
+        while not self.descompresor.eof:
+            bloque = self.archivo.read(self.TAM_BLOQUE)
+            if not bloque:
+                raise SaveFormatError("Snapshot truncado")
+            self.descompresor.decompress(bloque)
+
+
+class _SinCompresion:
+    eof = True  # Sin trailer: cualquier corte ya falla al leer los pedidos
+
+    def decompress(self, datos: bytes) -> bytes:
+        return datos
+
+
+class SnapshotBinario:
+    """
+    Formato binario versionado para los guardados completos (.cqsave).
+
+    Estructura:
+    - Header sin comprimir: magic, versión y método de compresión.
+    - Resto comprimido (zlib o lzma):
+        1. meta: JSON compacto con todos los campos que no son listas de pedidos.
+        2. tabla de pedidos: cada pedido se guarda una sola vez (id + 9 enteros).
+        3. listas de pedidos: por cada lista, los índices (uint32) en la tabla.
+
+    El meta va primero para que el menú pueda leer nombre/día/score sin
+    descomprimir los pedidos.
+    """
+
+    MAGIC = b"CQSV"
+    VERSION = 1
+    EXTENSION = ".cqsave"
+
+    COMPRESIONES = {"ninguna": 0, "zlib": 1, "lzma": 2}
+
+    # Campos del GameState que son listas de pedidos (se guardan como índices)
+    LISTAS_PEDIDOS = ("active_orders", "inventory_orders", "available_orders", "pedidos_pendientes")
+
+    _HEADER = struct.Struct("<4sBB")
+    _U32 = struct.Struct("<I")
+    _U16 = struct.Struct("<H")
+    _PEDIDO = struct.Struct("<9i")  # priority, weight, payout, duration, release_time, pickup x/y, dropoff x/y
+
+    # ---------------- Escritura ----------------
+    @classmethod
+    def _compresor(cls, compresion: str):
+        if compresion == "zlib":
+            return zlib.compressobj(6)
+        if compresion == "lzma":
+            return lzma.LZMACompressor()
+        if compresion == "ninguna":
+            return None
+        raise ValueError(f"Compresión desconocida: {compresion}")
+
+    @classmethod
+    def _empaquetar_pedido(cls, pedido: Dict[str, Any]) -> bytes:
+        id_bytes = str(pedido["id"]).encode("utf-8")
+        return cls._U16.pack(len(id_bytes)) + id_bytes + cls._PEDIDO.pack(
+            int(pedido["priority"]),
+            int(pedido["weight"]),
+            int(pedido["payout"]),
+            int(pedido["duration"]),
+            int(pedido["release_time"]),
+            int(pedido["pickup"][0]), int(pedido["pickup"][1]),
+            int(pedido["dropoff"][0]), int(pedido["dropoff"][1]),
+        )
+
+    @classmethod
+    def serializar(cls, data: Dict[str, Any], compresion: str = "zlib") -> bytes:
+        """Convierte el dict de un GameState (model_dump) en bytes del formato binario"""
+        meta = {k: v for k, v in data.items() if k not in cls.LISTAS_PEDIDOS}
+
+        # Tabla de pedidos sin duplicados: id -> índice
+        indices: Dict[str, int] = {}
+        tabla: List[bytes] = []
+        listas: List[List[int]] = []
+        for nombre in cls.LISTAS_PEDIDOS:
+            lista = []
+            for pedido in data.get(nombre, []):
+                pedido_id = str(pedido["id"])
+                if pedido_id not in indices:
+                    indices[pedido_id] = len(tabla)
+                    tabla.append(cls._empaquetar_pedido(pedido))
+                lista.append(indices[pedido_id])
+            listas.append(lista)
+
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        partes = [cls._U32.pack(len(meta_bytes)), meta_bytes, cls._U32.pack(len(tabla))]
+        partes.extend(tabla)
+        for lista in listas:
+            partes.append(cls._U32.pack(len(lista)))
+            partes.append(struct.pack(f"<{len(lista)}I", *lista))
+        cuerpo = b"".join(partes)
+
+        compresor = cls._compresor(compresion)
+        if compresor is not None:
+            cuerpo = compresor.compress(cuerpo) + compresor.flush()
+        return cls._HEADER.pack(cls.MAGIC, cls.VERSION, cls.COMPRESIONES[compresion]) + cuerpo
+
+    @classmethod
+    def escribir(cls, ruta: Path, data: Dict[str, Any], compresion: str = "zlib") -> None:
+        with open(ruta, "wb") as f:
+            f.write(cls.serializar(data, compresion))
+
+    # ---------------- Lectura ----------------
+    @classmethod
+    def _abrir_lector(cls, f) -> _LectorComprimido:
+        header = f.read(cls._HEADER.size)
+        if len(header) < cls._HEADER.size:
+            raise SaveFormatError("Header incompleto")
+        magic, version, compresion = cls._HEADER.unpack(header)
+        if magic != cls.MAGIC:
+            raise SaveFormatError("No es un snapshot de Courier Quest")
+        if version != cls.VERSION:
+            raise SaveFormatError(f"Versión de snapshot no soportada: {version}")
+
+        if compresion == cls.COMPRESIONES["zlib"]:
+            descompresor = zlib.decompressobj()
+        elif compresion == cls.COMPRESIONES["lzma"]:
+            descompresor = lzma.LZMADecompressor()
+        elif compresion == cls.COMPRESIONES["ninguna"]:
+            descompresor = _SinCompresion()
+        else:
+            raise SaveFormatError(f"Compresión desconocida: {compresion}")
+        return _LectorComprimido(f, descompresor)
+
+    @classmethod
+    def _leer_meta(cls, lector: _LectorComprimido) -> Dict[str, Any]:
+        (largo,) = lector.leer_struct(cls._U32)
+        return json.loads(lector.leer(largo).decode("utf-8"))
+
+    @classmethod
+    def _leer_pedido(cls, lector: _LectorComprimido) -> Dict[str, Any]:
+        (largo_id,) = lector.leer_struct(cls._U16)
+        pedido_id = lector.leer(largo_id).decode("utf-8")
+        priority, weight, payout, duration, release_time, px, py, dx, dy = lector.leer_struct(cls._PEDIDO)
+        return {
+            "id": pedido_id,
+            "priority": priority,
+            "weight": weight,
+            "payout": payout,
+            "duration": duration,
+            "release_time": release_time,
+            "pickup": [px, py],
+            "dropoff": [dx, dy],
+        }
+
+    @classmethod
+    def leer_meta(cls, ruta: Path) -> Dict[str, Any]:
+        """Lee solo los campos generales (sin pedidos). Descomprime únicamente el inicio del archivo."""
+        with open(ruta, "rb") as f:
+            return cls._leer_meta(cls._abrir_lector(f))
+
+    @classmethod
+    def leer(cls, ruta: Path) -> Dict[str, Any]:
+        """Lee el snapshot completo y devuelve un dict compatible con GameState(**data)"""
+        with open(ruta, "rb") as f:
+            return cls._leer_de(f)
+
+    @classmethod
+    def desde_bytes(cls, datos: bytes) -> Dict[str, Any]:
+        """Igual que leer(), pero desde bytes en memoria (por ejemplo, un BLOB de SQLite)"""
+        return cls._leer_de(io.BytesIO(datos))
+
+    @classmethod
+    def _leer_de(cls, f) -> Dict[str, Any]:
+        lector = cls._abrir_lector(f)
+        data = cls._leer_meta(lector)
+
+        (total,) = lector.leer_struct(cls._U32)
+        tabla = [cls._leer_pedido(lector) for _ in range(total)]
+
+        for nombre in cls.LISTAS_PEDIDOS:
+            (cantidad,) = lector.leer_struct(cls._U32)
+            indices = struct.unpack(f"<{cantidad}I", lector.leer(4 * cantidad))
+            # Cada lista recibe su propia copia para que modificar una no afecte a las demás
+            data[nombre] = [dict(tabla[i]) for i in indices]
+        lector.verificar_fin()
+        return data
+
+    @classmethod
+    def es_snapshot(cls, ruta: Path) -> bool:
+        return Path(ruta).suffix == cls.EXTENSION
@@ -1,7 +1,12 @@
 import json
+import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
+
+from src.game.scoreboard import ScoreBoard
+from src.game.sqlite_store import SQLiteStore
+from src.game.score_events import ScoreEventLog
 
 
 class Score:
@@ -14,12 +19,16 @@ class Score:
         self.ingresos: float = 0.0
         self.bonus_time: float = 0.0
         self.penalizacion: float = 0.0
-        self.events: List[Dict[str, Any]] = []
+        self.sesion = uuid.uuid4().hex  # Identifica los eventos de esta partida (archivo de eventos y SQLite)
 
         if score_file is None: #crea el archivo en caso de que no exista
             score_file = Path("data") / "puntajes.json"
         self.score_file: Path = Path(score_file)
 
+        # Los eventos se escriben por bloques en disco; en memoria solo quedan los agregados
+        self.events = ScoreEventLog(self.score_file.parent / "events" / f"{self.sesion}.jsonl",
+                                    al_escribir=self._registrar_en_sqlite)
+
         self.reputation_threshold = reputation_threshold
         self.reputation_pct = reputation_pct
 
@@ -36,14 +45,13 @@ class Score:
         ganado = float(payout) * multiplicador_pago
         self.ingresos += ganado
 
-        self.events.append({ #Se muestran los datos para guardar en el archivo.
+        self.events.agregar({ #Se muestran los datos para guardar en el archivo.
             "type": "income",
             "base": float(payout),
             "reputation": reputation,
             "multiplier": multiplicador_pago,
             "amount": ganado,
             "meta": meta or {},
-            "ts": datetime.utcnow().isoformat(),
         })
         return ganado
 
@@ -51,74 +59,57 @@ class Score:
         self, ganado: float, motive: str, meta: Optional[Dict[str, Any]] = None
     ) -> None: #en el caso que cumpla con los plazos, se agrega el bono.
         self.bonus_time += float(ganado)
-        self.events.append({
+        self.events.agregar({
             "type": "bonus",
             "amount": float(ganado),
             "reason": motive,
             "meta": meta or {},
-            "ts": datetime.utcnow().isoformat(),
         })
 
     def agregar_penalizacion(
         self, perdido: float, motive: str, meta: Optional[Dict[str, Any]] = None
     ) -> None: #En caso de no cumplir con plazos, se agrega la penalización con sus datos
         self.penalizacion += float(perdido)
-        self.events.append({
+        self.events.agregar({
             "type": "penalty",
             "amount": float(perdido),
             "reason": motive,
             "meta": meta or {},
-            "ts": datetime.utcnow().isoformat(),
         })
 
     def calcular_total(self) -> int: #calcula el puntaje, según bonos y penalizaciones
         total = self.ingresos + self.bonus_time - self.penalizacion
         return int(round(total))
 
-    def save_scoreboard(self, player_name: str) -> None: #guarda solo el nombre del jugador y puntaje final
-        self.score_file.parent.mkdir(parents=True, exist_ok=True)
-
-        if self.score_file.exists(): #si existe, se carga la información en tabla. En el caso que no o se produzca un error, se da una tabla vacía
-            try:
-                with open(self.score_file, "r", encoding="utf-8") as f:
-                    tabla = json.load(f)
-                    if not isinstance(tabla, list):
-                        tabla = []
-            except Exception:
-                tabla = []
-        else:
-            tabla = []
-
-        # Solo guardar nombre del jugador y puntaje final
-        resumen = {
-            "player_name": player_name,
-            "puntaje_final": self.calcular_total()
-        }
-
-        tabla.append(resumen)
-        tabla.sort(key=lambda x: x.get("puntaje_final", 0), reverse=True) #usa un sort de python base para acomodar los scores de los jugadores.
-
-        with open(self.score_file, "w", encoding="utf-8") as f: #se envia la información a JSON
-            json.dump(tabla, f, indent=2, ensure_ascii=False)
+    def save_scoreboard(self, player_name: str, ciudad: Optional[str] = None, dificultad: Optional[str] = None) -> None: #guarda solo el nombre del jugador y puntaje final
+        # El ScoreBoard agrega la partida a la bitácora y actualiza los top-K (global, por ciudad y por dificultad)
+        ScoreBoard.para_directorio(self.score_file.parent).registrar(
+            player_name, self.calcular_total(), ciudad=ciudad, dificultad=dificultad
+        )
 
     def exportar_reporte(self, out_path: Optional[Path] = None) -> None: #Se exporta la información en formato JSON
         p = Path(out_path) if out_path else (
             self.score_file.parent / f"puntaje_full_{datetime.utcnow().isoformat()}.json"
         )
         p.parent.mkdir(parents=True, exist_ok=True)
-        report = {
-            "summary": {
-                "income": self.ingresos,
-                "bonus": self.bonus_time,
-                "penalizations": self.penalizacion,
-                "puntaje_final": self.calcular_total(),
-            },
-            "entries": self.events,
+        summary = {
+            "income": self.ingresos,
+            "bonus": self.bonus_time,
+            "penalizations": self.penalizacion,
+            "puntaje_final": self.calcular_total(),
         }
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-
-
-
-
-
+        with open(p, "w", encoding="utf-8") as f: #las entradas se copian una a una desde la bitácora, sin cargarlas todas
+            f.write('{\n  "summary": ')
+            json.dump(summary, f, ensure_ascii=False)
+            f.write(',\n  "aggregates": ')
+            json.dump(self.events.agregados, f, ensure_ascii=False)
+            f.write(',\n  "entries": [')
+            for i, evento in enumerate(self.events):
+                f.write(",\n    " if i else "\n    ")
+                json.dump(evento, f, ensure_ascii=False)
+            f.write("\n  ]\n}\n")
+
+    def _registrar_en_sqlite(self, eventos) -> None:
+        # Con el backend SQLite cada bloque que se escribe en la bitácora también queda en score_events
+        if SQLiteStore.activo is not None:
+            SQLiteStore.activo.registrar_eventos(self.sesion, map(ScoreEventLog.con_ts_iso, eventos))
@@ -0,0 +1,96 @@
+import atexit
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class ScoreEventLog:
+    """
+    Bitácora append-only (JSONL) de los eventos de score de una partida.
+
+    Los eventos se acumulan en un buffer pequeño y se escriben en bloque cada
+    `tam_buffer` eventos, así que la memoria no crece con la duración de la
+    partida. En memoria solo quedan agregados por tipo (cantidad, suma, mín, máx).
+    El archivo se crea recién en la primera escritura.
+
+    `al_escribir`, si se indica, recibe cada bloque recién escrito (ej. para
+    copiarlo a SQLite): cada evento pasa por ahí una sola vez.
+    """
+
+    def __init__(self, ruta: Path, tam_buffer: int = 64,
+                 al_escribir: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        self.ruta = Path(ruta)
+        self.tam_buffer = max(1, tam_buffer)
+        self.al_escribir = al_escribir
+        self.total = 0  # Eventos registrados (escritos + en buffer)
+        self.agregados: Dict[str, Dict[str, float]] = {}  # tipo -> {count, amount, min, max}
+        self._buffer: List[Dict[str, Any]] = []
+
+    def agregar(self, evento: Dict[str, Any]) -> None:
+        """Registra un evento. Si no trae 'ts' se usa la hora actual (epoch, más barato que isoformat)."""
+        evento.setdefault("ts", time.time())
+        if not self._buffer:
+            # Red de seguridad si el proceso termina sin pasar por flush (ej. sys.exit desde un menú)
+            atexit.register(self.flush)
+        self._buffer.append(evento)
+        self.total += 1
+
+        amount = float(evento.get("amount", 0.0))
+        agregado = self.agregados.get(evento["type"])
+        if agregado is None:
+            self.agregados[evento["type"]] = {"count": 1, "amount": amount, "min": amount, "max": amount}
+        else:
+            agregado["count"] += 1
+            agregado["amount"] += amount
+            agregado["min"] = min(agregado["min"], amount)
+            agregado["max"] = max(agregado["max"], amount)
+
+        if len(self._buffer) >= self.tam_buffer:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        atexit.unregister(self.flush)
+        bloque, self._buffer = self._buffer, []
+        with open(self.ruta, "a", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(evento, ensure_ascii=False) for evento in bloque) + "\n")
+        if self.al_escribir is not None:
+            self.al_escribir(bloque)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Recorre los eventos desde disco, uno a la vez, con 'ts' en formato ISO (UTC)"""
+        self.flush()
+        if not self.ruta.exists():
+            return
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            for linea in f:
+                if not linea.strip():
+                    continue
+                yield self.con_ts_iso(json.loads(linea))
+
+    @staticmethod
+    def con_ts_iso(evento: Dict[str, Any]) -> Dict[str, Any]:
+        """Copia del evento con 'ts' (epoch) pasado a ISO (UTC)"""
+        if isinstance(evento.get("ts"), (int, float)):
+            evento = {**evento, "ts": datetime.fromtimestamp(evento["ts"], tz=timezone.utc).replace(tzinfo=None).isoformat()}
+        return evento
+
+    @staticmethod
+    def limpiar_antiguas(directorio: Path, conservar: int = 20) -> None:
+        """Borra las bitácoras más viejas del directorio, dejando las `conservar` más recientes"""
+        directorio = Path(directorio)
+        if not directorio.exists():
+            return
+        logs = sorted(directorio.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for viejo in logs[conservar:]:
+            try:
+                viejo.unlink()
+            except OSError as e:
+                print(f"[WARNING] No se pudo borrar {viejo}: {e}")
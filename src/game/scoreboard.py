@@ -0,0 +1,229 @@
+import heapq
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.game.sqlite_store import SQLiteStore
+
+
+class ScoreBoard:
+    """
+    Almacén único de puntuaciones.
+
+    - scores.log: bitácora append-only (una línea JSON por partida terminada).
+    - scores_top.index: por cada tablero, un min-heap con los K mejores puntajes.
+
+    Los tableros son global, por ciudad, por dificultad y por ciudad+dificultad.
+    Registrar una partida cuesta O(log K) por tablero y leer un top cuesta O(K),
+    sin recorrer todo el historial. Si el índice falta o quedó atrasado respecto
+    al log, se reconstruye leyendo la bitácora.
+
+    Si hay un SQLiteStore activo, las mismas operaciones van a la tabla `scores`.
+    """
+
+    LOG_FILE = "scores.log"
+    INDEX_FILE = "scores_top.index"
+    LEGACY_FILE = "savedScores.json"  # Formato anterior: lista ordenada de {player_name, puntaje_final}
+    INDEX_VERSION = 1
+
+    TODOS = "*"
+
+    # Una instancia compartida por carpeta
+    _instancias: Dict[Path, "ScoreBoard"] = {}
+
+    def __init__(self, directorio: Path, k: int = 10):
+        self.directorio = Path(directorio)
+        self.k = k
+        self.log_path = self.directorio / self.LOG_FILE
+        self.index_path = self.directorio / self.INDEX_FILE
+
+        self._tableros: Dict[str, List[list]] = {}  # clave -> heap de [puntaje, -secuencia, nombre, ciudad, dificultad]
+        self._secuencia = 0  # Cantidad de entradas en el log
+        self._cargado = False
+
+    @classmethod
+    def para_directorio(cls, directorio: Path) -> "ScoreBoard":
+        """Devuelve el scoreboard compartido de una carpeta"""
+        clave = Path(directorio).resolve()
+        if clave not in cls._instancias:
+            cls._instancias[clave] = cls(clave)
+        return cls._instancias[clave]
+
+    @classmethod
+    def clave(cls, ciudad: Optional[str] = None, dificultad: Optional[str] = None) -> str:
+        return f"{ciudad or cls.TODOS}|{dificultad or cls.TODOS}"
+
+    def _claves_de(self, ciudad: Optional[str], dificultad: Optional[str]) -> List[str]:
+        """Tableros en los que participa una entrada"""
+        claves = [self.clave()]
+        if ciudad:
+            claves.append(self.clave(ciudad))
+        if dificultad:
+            claves.append(self.clave(None, dificultad))
+        if ciudad and dificultad:
+            claves.append(self.clave(ciudad, dificultad))
+        return claves
+
+    # ---------------- Escritura ----------------
+    def registrar(self, player_name: str, puntaje: int, ciudad: Optional[str] = None,
+                  dificultad: Optional[str] = None) -> None:
+        """Agrega el resultado de una partida al log y actualiza los top-K"""
+        if SQLiteStore.activo is not None:
+            SQLiteStore.activo.registrar_score(player_name, puntaje, ciudad, dificultad)
+            return
+        self._cargar()
+        entrada = {
+            "player_name": player_name,
+            "puntaje_final": int(puntaje),
+            "city": ciudad,
+            "difficulty": dificultad,
+            "ts": datetime.now().isoformat(),
+        }
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+        self._insertar(entrada)
+        self._escribir_indice()
+
+    def _insertar(self, entrada: Dict[str, Any]) -> None:
+        item = [
+            int(entrada.get("puntaje_final", 0)),
+            -self._secuencia,  # Ante empate queda primero el más antiguo
+            entrada.get("player_name") or "Unknown",
+            entrada.get("city"),
+            entrada.get("difficulty"),
+        ]
+        self._secuencia += 1
+        for clave in self._claves_de(entrada.get("city"), entrada.get("difficulty")):
+            heap = self._tableros.setdefault(clave, [])
+            if len(heap) < self.k:
+                heapq.heappush(heap, list(item))
+            elif item > heap[0]:
+                heapq.heapreplace(heap, list(item))
+
+    # ---------------- Lectura ----------------
+    def top(self, ciudad: Optional[str] = None, dificultad: Optional[str] = None,
+            n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Mejores puntajes de un tablero, de mayor a menor"""
+        if SQLiteStore.activo is not None:
+            return SQLiteStore.activo.top(ciudad, dificultad, min(n or self.k, self.k))
+        self._cargar()
+        heap = self._tableros.get(self.clave(ciudad, dificultad), [])
+        ordenados = sorted(heap, reverse=True)[:n]
+        return [
+            {"player_name": nombre, "puntaje_final": puntaje, "city": c, "difficulty": d}
+            for puntaje, _, nombre, c, d in ordenados
+        ]
+
+    def tableros(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        """(ciudad, dificultad) de cada tablero disponible; None significa 'todas'"""
+        if SQLiteStore.activo is not None:
+            return SQLiteStore.activo.tableros()
+        self._cargar()
+        resultado = []
+        for clave in sorted(self._tableros):
+            ciudad, dificultad = clave.split("|", 1)
+            resultado.append((
+                None if ciudad == self.TODOS else ciudad,
+                None if dificultad == self.TODOS else dificultad,
+            ))
+        # El tablero global siempre primero
+        resultado.sort(key=lambda t: (t != (None, None), t[0] or "", t[1] or ""))
+        return resultado
+
+    # ---------------- Persistencia del índice ----------------
+    def _cargar(self) -> None:
+        if self._cargado:
+            return
+        self._cargado = True
+
+        if not self.log_path.exists():
+            self._migrar_legacy()
+            return
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.INDEX_VERSION or data.get("k") != self.k:
+                raise ValueError("índice de otra versión")
+            self._tableros = data["tableros"]
+            self._secuencia = data["secuencia"]
+            offset = data["log_bytes"]
+        except FileNotFoundError:
+            self.reconstruir_indice()
+            return
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+            print(f"[WARNING] Índice de puntajes inválido ({e}), se reconstruirá")
+            self.reconstruir_indice()
+            return
+
+        # Entradas agregadas al log después de la última escritura del índice
+        if self.log_path.stat().st_size > offset:
+            for entrada in self._leer_log(offset):
+                self._insertar(entrada)
+            self._escribir_indice()
+
+    def _leer_log(self, offset: int = 0):
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for linea in f:
+                try:
+                    yield json.loads(linea.decode("utf-8"))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    print(f"[WARNING] Línea inválida en {self.log_path}, se ignora")
+
+    def reconstruir_indice(self) -> None:
+        """Recalcula todos los top-K leyendo la bitácora completa"""
+        self._tableros = {}
+        self._secuencia = 0
+        if self.log_path.exists():
+            for entrada in self._leer_log():
+                self._insertar(entrada)
+        self._escribir_indice()
+
+    def _migrar_legacy(self) -> None:
+        """Importa savedScores.json (formato anterior) a la bitácora la primera vez"""
+        legacy = self.directorio / self.LEGACY_FILE
+        entradas = []
+        if legacy.exists():
+            try:
+                with open(legacy, "r", encoding="utf-8") as f:
+                    tabla = json.load(f)
+                if isinstance(tabla, list):
+                    entradas = [e for e in tabla if isinstance(e, dict)]
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"[WARNING] No se pudo migrar {legacy}: {e}")
+
+        if not entradas:
+            return
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            for entrada in entradas:
+                registro = {
+                    "player_name": entrada.get("player_name"),
+                    "puntaje_final": int(entrada.get("puntaje_final", 0)),
+                    "city": None,
+                    "difficulty": None,
+                    "ts": None,
+                }
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                self._insertar(registro)
+        self._escribir_indice()
+
+    def _escribir_indice(self) -> None:
+        """Escribe los heaps junto con el tamaño del log que reflejan (temporal + os.replace)"""
+        data = {
+            "version": self.INDEX_VERSION,
+            "k": self.k,
+            "secuencia": self._secuencia,
+            "log_bytes": self.log_path.stat().st_size if self.log_path.exists() else 0,
+            "tableros": self._tableros,
+        }
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
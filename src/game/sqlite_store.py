@@ -0,0 +1,230 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class SQLiteStore:
+    """
+    Persistencia opcional en SQLite (stdlib) para partidas, puntajes y eventos de score.
+
+    Se activa una sola vez con SQLiteStore.activar(ruta); mientras no se active,
+    GameStateManager y ScoreBoard siguen usando los archivos de la carpeta saves.
+    La base usa WAL (lectores no bloquean al escritor) y todas las consultas son
+    sentencias parametrizadas fijas, que sqlite3 mantiene preparadas en su caché.
+    """
+
+    # Instancia activa (None = backend de archivos)
+    activo: Optional["SQLiteStore"] = None
+
+    ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS saves (
+        save_id TEXT PRIMARY KEY,
+        player_name TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        city TEXT NOT NULL,
+        reputation REAL NOT NULL,
+        score INTEGER NOT NULL,
+        save_timestamp TEXT NOT NULL,
+        datos BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_saves_timestamp ON saves (save_timestamp DESC);
+    CREATE INDEX IF NOT EXISTS idx_saves_player ON saves (player_name, day);
+
+    CREATE TABLE IF NOT EXISTS scores (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_name TEXT NOT NULL,
+        puntaje_final INTEGER NOT NULL,
+        city TEXT,
+        difficulty TEXT,
+        ts TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_scores_puntaje ON scores (puntaje_final DESC);
+    CREATE INDEX IF NOT EXISTS idx_scores_ciudad ON scores (city, puntaje_final DESC);
+    CREATE INDEX IF NOT EXISTS idx_scores_dificultad ON scores (difficulty, puntaje_final DESC);
+    CREATE INDEX IF NOT EXISTS idx_scores_tablero ON scores (city, difficulty, puntaje_final DESC);
+    CREATE INDEX IF NOT EXISTS idx_scores_jugador ON scores (ts, player_name, puntaje_final);
+
+    CREATE TABLE IF NOT EXISTS score_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sesion TEXT NOT NULL,
+        type TEXT NOT NULL,
+        amount REAL NOT NULL,
+        reason TEXT,
+        meta TEXT,
+        ts TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_sesion ON score_events (sesion, id);
+    """
+
+    # ---------------- Sentencias ----------------
+    SQL_GUARDAR_PARTIDA = """
+        INSERT OR REPLACE INTO saves (save_id, player_name, day, city, reputation, score, save_timestamp, datos)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    SQL_LEER_PARTIDA = "SELECT datos FROM saves WHERE save_id = ?"
+    SQL_BORRAR_PARTIDA = "DELETE FROM saves WHERE save_id = ?"
+    SQL_CONTAR_PARTIDAS = "SELECT COUNT(*) FROM saves"
+    SQL_LISTAR_PARTIDAS = """
+        SELECT save_id, player_name, day, reputation, city, save_timestamp, score
+        FROM saves ORDER BY save_timestamp DESC LIMIT ? OFFSET ?
+    """
+    SQL_AUTOSAVES_VIEJOS = """
+        SELECT save_id FROM saves WHERE save_id LIKE ? ORDER BY save_timestamp DESC LIMIT -1 OFFSET ?
+    """
+
+    SQL_REGISTRAR_SCORE = """
+        INSERT INTO scores (player_name, puntaje_final, city, difficulty, ts) VALUES (?, ?, ?, ?, ?)
+    """
+    # Una sentencia por tipo de tablero para que cada una use su índice
+    _SELECT_TOP = "SELECT player_name, puntaje_final, city, difficulty FROM scores "
+    _ORDEN_TOP = " ORDER BY puntaje_final DESC, id ASC LIMIT ?"
+    SQL_TOP = {
+        (False, False): _SELECT_TOP + _ORDEN_TOP,
+        (True, False): _SELECT_TOP + "WHERE city = ?" + _ORDEN_TOP,
+        (False, True): _SELECT_TOP + "WHERE difficulty = ?" + _ORDEN_TOP,
+        (True, True): _SELECT_TOP + "WHERE city = ? AND difficulty = ?" + _ORDEN_TOP,
+    }
+    SQL_TABLEROS = "SELECT DISTINCT city, difficulty FROM scores"
+    SQL_MEJOR_POR_JUGADOR = """
+        SELECT player_name, MAX(puntaje_final) AS mejor FROM scores
+        WHERE ts >= ? GROUP BY player_name ORDER BY mejor DESC LIMIT ?
+    """
+
+    SQL_REGISTRAR_EVENTO = """
+        INSERT INTO score_events (sesion, type, amount, reason, meta, ts) VALUES (?, ?, ?, ?, ?, ?)
+    """
+    SQL_EVENTOS_SESION = """
+        SELECT type, amount, reason, meta, ts FROM score_events WHERE sesion = ? ORDER BY id
+    """
+
+    def __init__(self, ruta: Path):
+        self.ruta = Path(ruta)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        # Una conexión compartida; el lock serializa el acceso desde el hilo de autosave
+        self._conn = sqlite3.connect(str(self.ruta), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.ESQUEMA)
+            self._conn.commit()
+
+    @classmethod
+    def activar(cls, ruta: Path) -> "SQLiteStore":
+        """Usa SQLite como backend de partidas y puntajes desde ahora"""
+        if cls.activo is None or cls.activo.ruta != Path(ruta):
+            cls.activo = cls(ruta)
+        return cls.activo
+
+    @classmethod
+    def desactivar(cls) -> None:
+        if cls.activo is not None:
+            cls.activo.cerrar()
+        cls.activo = None
+
+    def cerrar(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _ejecutar(self, sql: str, parametros: Iterable = ()) -> List[tuple]:
+        with self._lock:
+            filas = self._conn.execute(sql, tuple(parametros)).fetchall()
+            self._conn.commit()
+        return filas
+
+    # ---------------- Partidas ----------------
+    def guardar_partida(self, save_id: str, resumen: Dict[str, Any], datos: bytes) -> None:
+        self._ejecutar(self.SQL_GUARDAR_PARTIDA, (
+            save_id,
+            resumen['player_name'],
+            resumen['day'],
+            resumen['city'],
+            resumen['reputation'],
+            resumen['score'],
+            resumen['save_timestamp'],
+            sqlite3.Binary(datos),
+        ))
+
+    def leer_partida(self, save_id: str) -> Optional[bytes]:
+        filas = self._ejecutar(self.SQL_LEER_PARTIDA, (save_id,))
+        return bytes(filas[0][0]) if filas else None
+
+    def eliminar_partida(self, save_id: str) -> None:
+        self._ejecutar(self.SQL_BORRAR_PARTIDA, (save_id,))
+
+    def contar_partidas(self) -> int:
+        return self._ejecutar(self.SQL_CONTAR_PARTIDAS)[0][0]
+
+    def listar_partidas(self, inicio: int = 0, cantidad: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Página de resúmenes ordenados de la más reciente a la más antigua (usa idx_saves_timestamp)"""
+        filas = self._ejecutar(self.SQL_LISTAR_PARTIDAS, (-1 if cantidad is None else cantidad, inicio))
+        return [
+            {
+                'file': save_id,
+                'player_name': player_name,
+                'day': day,
+                'reputation': reputation,
+                'city': city,
+                'save_timestamp': save_timestamp,
+                'score': score,
+            }
+            for save_id, player_name, day, reputation, city, save_timestamp, score in filas
+        ]
+
+    def rotar_autosaves(self, prefijo: str, conservar: int) -> None:
+        with self._lock:
+            viejos = self._conn.execute(self.SQL_AUTOSAVES_VIEJOS, (f"{prefijo}%", max(0, conservar))).fetchall()
+            self._conn.executemany(self.SQL_BORRAR_PARTIDA, viejos)
+            self._conn.commit()
+
+    # ---------------- Puntajes ----------------
+    def registrar_score(self, player_name: str, puntaje: int, ciudad: Optional[str], dificultad: Optional[str]) -> None:
+        self._ejecutar(self.SQL_REGISTRAR_SCORE, (player_name, int(puntaje), ciudad, dificultad, datetime.now().isoformat()))
+
+    def top(self, ciudad: Optional[str] = None, dificultad: Optional[str] = None, n: int = 10) -> List[Dict[str, Any]]:
+        parametros = [v for v in (ciudad, dificultad) if v] + [n]
+        filas = self._ejecutar(self.SQL_TOP[(bool(ciudad), bool(dificultad))], parametros)
+        return [
+            {"player_name": nombre, "puntaje_final": puntaje, "city": c, "difficulty": d}
+            for nombre, puntaje, c, d in filas
+        ]
+
+    def tableros(self) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Mismos tableros que el ScoreBoard de archivos: global, ciudad, dificultad y ciudad+dificultad"""
+        claves = {(None, None)}
+        for ciudad, dificultad in self._ejecutar(self.SQL_TABLEROS):
+            claves.add((ciudad, None))
+            claves.add((None, dificultad))
+            claves.add((ciudad, dificultad))
+        return sorted(claves, key=lambda t: (t != (None, None), t[0] or "", t[1] or ""))
+
+    def mejores_por_jugador(self, desde: datetime, n: int = 10) -> List[Tuple[str, int]]:
+        """Mejor puntaje de cada jugador desde una fecha (ej. 'esta semana')"""
+        return [(nombre, mejor) for nombre, mejor in self._ejecutar(self.SQL_MEJOR_POR_JUGADOR, (desde.isoformat(), n))]
+
+    # ---------------- Eventos de score ----------------
+    def registrar_eventos(self, sesion: str, eventos: Iterable[Dict[str, Any]]) -> None:
+        filas = (  # Generador: executemany consume los eventos de a uno (el log puede ser largo)
+            (
+                sesion,
+                evento["type"],
+                float(evento.get("amount", 0.0)),
+                evento.get("reason"),
+                json.dumps({k: v for k, v in evento.items() if k not in ("type", "amount", "reason", "ts")}, ensure_ascii=False),
+                evento.get("ts") or datetime.now().isoformat(),
+            )
+            for evento in eventos
+        )
+        with self._lock:
+            self._conn.executemany(self.SQL_REGISTRAR_EVENTO, filas)
+            self._conn.commit()
+
+    def eventos_de_sesion(self, sesion: str) -> Iterable[Dict[str, Any]]:
+        for tipo, amount, reason, meta, ts in self._ejecutar(self.SQL_EVENTOS_SESION, (sesion,)):
+            evento = {"type": tipo, "amount": amount, **json.loads(meta or "{}"), "ts": ts}
+            if reason is not None:
+                evento["reason"] = reason
+            yield evento
@@ -1,5 +1,7 @@
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union, Dict, Any
+from collections import deque
+from dataclasses import dataclass, fields, replace
+from src.game.move_journal import MoveJournal
 
 
 @dataclass
@@ -16,20 +18,35 @@ class GameState:
     pedidos_activos_ids: List[str] # IDs de pedidos activos en ese instante
 
 
+_CAMPOS = tuple(f.name for f in fields(GameState))
+
+# Cada entrada del historial es (es_keyframe, datos):
+# - keyframe: datos es un GameState completo
+# - delta: datos es un dict solo con los campos que cambiaron respecto a la entrada anterior
+Entrada = Tuple[bool, Union[GameState, Dict[str, Any]]]
+
+
 class UndoSystem:
-    
-    def __init__(self, max_undo_steps: int = 20):
+
+    def __init__(self, max_undo_steps: int = 20, keyframe_interval: int = 32, journal: Optional[MoveJournal] = None):
         self.max_undo_steps = max_undo_steps # Máximo de estados que se pueden guardar
-        self.states_stack: List[GameState] = []
+        self.keyframe_interval = max(1, keyframe_interval) # Cada cuántas entradas se guarda un estado completo
+        self.states_stack: deque[Entrada] = deque(maxlen=max_undo_steps) # Buffer circular: al llenarse descarta el más antiguo en O(1)
         self.enabled = True # Permite activar/desactivar el sistema de undo
-    
+
+        self._tope: Optional[GameState] = None # Estado completo de la cima (evita reconstruirlo en cada save)
+        self._desde_keyframe = 0 # Deltas guardados desde el último keyframe
+
+        self.journal = journal # Bitácora en disco para rebobinar toda la jornada (opcional)
+        self._ultimo_tiempo = 0 # Último tiempo de juego visto, para registrar undos en la bitácora
+
     def save_state(self, player, tiempo_actual: int, pedidos_activos_ids: List[str] = None):
-        if not self.enabled:
+        if not self.enabled or self.max_undo_steps <= 0:
             return
-            
+
         tile_x = int(player.x // player.tile_width ) # Se calculan las coordenadas del jugador en la cuadrícula (tiles)
         tile_y = int(player.y // player.tile_height)
-        
+
         new_state = GameState(  # Se crea un nuevo estado con los datos correspondientes
             player_x=player.x,
             player_y=player.y,
@@ -42,55 +59,142 @@ class UndoSystem:
             tiempo_actual=tiempo_actual,
             pedidos_activos_ids=pedidos_activos_ids or []
         )
-        
-        self.states_stack.append(new_state) # Se añade el estado a la pila
-        
-        if len(self.states_stack) > self.max_undo_steps: # Si se supera el máximo permitido, se elimina el más antiguo
-            self.states_stack.pop(0)
-    
+
+        if len(self.states_stack) == self.states_stack.maxlen: # Antes de que el deque descarte la entrada más antigua, la siguiente pasa a ser keyframe
+            self._promover_keyframe()
+
+        if self._tope is None or self._desde_keyframe + 1 >= self.keyframe_interval:
+            self.states_stack.append((True, new_state)) # Keyframe periódico con el estado completo
+            self._desde_keyframe = 0
+        else:
+            delta = {c: getattr(new_state, c) for c in _CAMPOS if getattr(new_state, c) != getattr(self._tope, c)}
+            self.states_stack.append((False, delta)) # Solo los campos que cambiaron
+            self._desde_keyframe += 1
+
+        self._tope = new_state
+        self._ultimo_tiempo = max(self._ultimo_tiempo, tiempo_actual)
+
+        if self.journal is not None:
+            self._registrar_en_journal(new_state, self._ultimo_tiempo)
+
+    def _registrar_en_journal(self, state: GameState, tiempo: int):
+        self.journal.registrar(
+            tiempo, state.player_x, state.player_y, state.direccion,
+            state.resistencia, state.reputacion, state.peso_total
+        )
+
+    def _promover_keyframe(self):
+        """Convierte la segunda entrada en keyframe para que la primera se pueda descartar"""
+        if len(self.states_stack) < 2:
+            return
+        es_keyframe, datos = self.states_stack[1]
+        if es_keyframe:
+            return
+        _, base = self.states_stack[0] # La primera entrada siempre es un keyframe
+        self.states_stack[1] = (True, replace(base, **datos))
+        if self._desde_keyframe == len(self.states_stack) - 1: # El keyframe promovido es ahora el más reciente
+            self._desde_keyframe -= 1
+
+    def _reconstruir_tope(self) -> Optional[GameState]:
+        """Reconstruye el estado de la cima desde el keyframe más cercano aplicando los deltas"""
+        if not self.states_stack:
+            self._desde_keyframe = 0
+            return None
+
+        deltas = []
+        for es_keyframe, datos in reversed(self.states_stack): # Como máximo keyframe_interval pasos
+            if es_keyframe:
+                estado = datos
+                break
+            deltas.append(datos)
+
+        self._desde_keyframe = len(deltas)
+        for delta in reversed(deltas):
+            estado = replace(estado, **delta)
+        return estado
+
     def undo_last_move(self, player, gestor_pedidos=None) -> Optional[GameState]: #Devuelve el estado restaurado o None si no hay nada que deshacer.
         if not self.can_undo():
             print("Undo: No hay movimientos para deshacer")
             return None
-        
-        previous_state = self.states_stack.pop() # Se obtiene el último estado y se elimina de la pila
-        
-        player.x = previous_state.player_x # Se restauran las propiedades del jugador
-        player.y = previous_state.player_y
-        player.direccion = previous_state.direccion
-        
+
+        previous_state = self._tope # Se obtiene el último estado y se elimina de la pila
+        self.states_stack.pop()
+        self._tope = self._reconstruir_tope()
+
+        self._aplicar_estado(player, previous_state)
+
+        if self.journal is not None: # El undo también queda en la bitácora para que rebobinar refleje la línea de tiempo real
+            self._registrar_en_journal(previous_state, self._ultimo_tiempo)
+
+        return previous_state
+
+    def _aplicar_estado(self, player, state):
+        player.x = state.player_x # Se restauran las propiedades del jugador
+        player.y = state.player_y
+        player.direccion = state.direccion
+
         center_x = player.x + player.tile_width // 2 # Se actualiza la posición gráfica del jugador en pantalla
         center_y = player.y + player.tile_height // 2
         player.rect.center = (center_x, center_y)
         player.image = player.sprites[player.direccion]
-        
-        player.stats.resistencia = previous_state.resistencia # Se restauran estadísticas y atributos
-        player.reputation.valor = previous_state.reputacion
-        player.peso_total = previous_state.peso_total
-        
-        return previous_state
-    
+
+        player.stats.resistencia = state.resistencia # Se restauran estadísticas y atributos
+        player.reputation.valor = state.reputacion
+        player.peso_total = state.peso_total
+
+    def rebobinar(self, player, tiempo_objetivo: int, tiempo_actual: int) -> Optional[GameState]:
+        """
+        Regresa al jugador al estado que tenía en tiempo_objetivo usando la bitácora en disco.
+        El historial en memoria se reinicia a partir del estado restaurado.
+        """
+        if self.journal is None:
+            print("Undo: No hay bitácora para rebobinar")
+            return None
+
+        registro = self.journal.estado_en(max(0, tiempo_objetivo))
+        if registro is None:
+            print("Undo: No hay movimientos registrados antes de ese tiempo")
+            return None
+
+        self._aplicar_estado(player, GameState(
+            player_x=registro.x,
+            player_y=registro.y,
+            player_tile_x=int(registro.x // player.tile_width),
+            player_tile_y=int(registro.y // player.tile_height),
+            resistencia=registro.resistencia,
+            reputacion=registro.reputacion,
+            peso_total=registro.peso_total,
+            direccion=registro.direccion,
+            tiempo_actual=registro.tiempo,
+            pedidos_activos_ids=[]
+        ))
+
+        self.states_stack.clear() # Los estados posteriores ya no aplican
+        self._tope = None
+        self._desde_keyframe = 0
+        self.save_state(player, tiempo_actual) # El estado restaurado es la nueva base (y queda en la bitácora)
+        return self._tope
+
     def undo_n_moves(self, player, n: int, gestor_pedidos=None) -> Optional[GameState]:
         if n <= 0:
             return None
-            
+
         last_state = None
         undone_count = 0
-        
+
         for i in range(n): #Se repite el proceso de undo hasta 'n' veces o hasta que no haya más estados
             if not self.can_undo():
                 break
             last_state = self.undo_last_move(player, gestor_pedidos)
             undone_count += 1
-        
+
         # Operación completada silenciosamente
-            
+
         return last_state
-    
+
     def can_undo(self) -> bool: #Devuelve True si hay estados disponibles para deshacer.
         return self.enabled and len(self.states_stack) > 0
-    
+
     def get_undo_count(self) -> int: #Devuelve cuántos estados hay actualmente en la pila de undo.
         return len(self.states_stack)
-    
-
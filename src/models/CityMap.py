@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Tuple
 from pydantic import BaseModel
 from .TileInfo import TileInfo
 
@@ -12,18 +12,21 @@ class CityMap(BaseModel): #Se construyen con el basemodel de pydantic
     tiles: List[List[str]] #Matriz del mapa
     legend: Dict[str, TileInfo]  #Mapea con TileInfo
 
-    def iterar_elementos(self) -> List[TileInfo]:
-        objetos = []
+    def iterar_tiles(self) -> Iterator[Tuple[int, int, str, str, Optional[float], Optional[bool]]]:
+        """
+        Recorre el mapa sin crear modelos: una tupla (x, y, codigo, name, surface_weight, blocked)
+        por tile cuyo código está en la leyenda. Los datos de la leyenda se resuelven una vez por código.
+        """
+        datos = {code: (code, info.name, info.surface_weight, info.blocked) for code, info in self.legend.items()}
         for y, fila in enumerate(self.tiles): #y devuelve la coordenada vertical y fila las letras
             for x, code in enumerate(fila): #recorre cada elemento de la fila, siendo code el nombre
-                info = self.legend.get(code) #self.legend mapea el codigo con la info que corresponde
-                if info: 
-                    objetos.append(TileInfo( #si no está vacío entonces se agrega el objeto de tipo TileInfo
-                        name=info.name,
-                        surface_weight=info.surface_weight,
-                        blocked=info.blocked,
-                        x=x,
-                        y=y,
-                        codigo=code
-                    ))
-        return objetos
+                info = datos.get(code)
+                if info:
+                    yield (x, y) + info
+
+    def iterar_elementos(self) -> List[TileInfo]:
+        """Lista de TileInfo por tile. Para recorrer mapas grandes conviene iterar_tiles."""
+        return [
+            TileInfo(name=name, surface_weight=surface_weight, blocked=blocked, x=x, y=y, codigo=code)
+            for x, y, code, name, surface_weight, blocked in self.iterar_tiles()
+        ]
@@ -0,0 +1,229 @@
+import math
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from src.api.cache_confiable import CacheConfiable
+from .CityMap import CityMap
+from .TileInfo import TileInfo
+
+
+class MapaCompilado:
+    """
+    Mapa compilado (.cqmap): la grilla de tiles como un byte por tile.
+
+    Layout:
+    - header: magic, versión, ancho, alto, goal, max_time y tamaño/mtime del
+      map.json del que salió (si el JSON cambió, el binario se ignora);
+    - city_name y version del mapa;
+    - tabla de códigos: por cada código su info de leyenda (o ninguna);
+    - grilla uint8 de ancho * alto con el índice del código de cada tile.
+
+    Al abrir se mapea el archivo: la grilla no se lee hasta que se consulta.
+    MapLogic y MapRenderer trabajan sobre esta grilla; si reciben un CityMap
+    lo compilan en memoria.
+    """
+
+    EXTENSION = ".cqmap"
+    MAGIC = b"CQMP"
+    VERSION = 1
+    MAX_CODIGOS = 256
+
+    _HEADER = struct.Struct("<4sBIIiiqq")  # magic, versión, ancho, alto, goal, max_time, tamaño y mtime_ns del JSON
+    _LARGO = struct.Struct("<H")  # largo de cada string
+    _TILE = struct.Struct("<Bdb")  # tiene info, surface_weight (NaN = None), blocked (-1 = None)
+
+    def __init__(self, width: int, height: int, goal: int, max_time: int, city_name: str, version: str,
+                 codigos: List[str], infos: List[Optional[TileInfo]], grilla: Union[bytes, bytearray, memoryview],
+                 mapa: Optional[mmap.mmap] = None):
+        self.width = width
+        self.height = height
+        self.goal = goal
+        self.max_time = max_time
+        self.city_name = city_name
+        self.version = version
+        self.codigos = codigos  # índice -> código ("" = fuera de las filas del JSON)
+        self.infos = infos  # índice -> TileInfo de la leyenda, o None si el código no está en ella
+        self.grilla = memoryview(grilla)
+        self._mapa = mapa
+
+    @property
+    def legend(self) -> Dict[str, TileInfo]:
+        return {codigo: info for codigo, info in zip(self.codigos, self.infos) if info is not None}
+
+    def indice(self, x: int, y: int) -> int:
+        """Índice en `codigos`/`infos` del tile (x, y); no verifica límites"""
+        return self.grilla[y * self.width + x]
+
+    def codigo(self, x: int, y: int) -> str:
+        return self.codigos[self.grilla[y * self.width + x]]
+
+    def info(self, x: int, y: int) -> Optional[TileInfo]:
+        return self.infos[self.grilla[y * self.width + x]]
+
+    def fila(self, y: int) -> memoryview:
+        """Índices de una fila completa (sin copiar)"""
+        inicio = y * self.width
+        return self.grilla[inicio:inicio + self.width]
+
+    def cerrar(self) -> None:
+        """Libera el .cqmap mapeado (si lo hay); después la grilla ya no se puede leer"""
+        self.grilla.release()
+        if self._mapa is not None:
+            try:
+                self._mapa.close()
+            except BufferError:
+                # Queda viva alguna vista de la grilla: el mapa se libera cuando el GC la recoja
+                print("[WARNING] El mapa compilado sigue en uso, no se pudo cerrar")
+            self._mapa = None
+
+    # ---------------- Compilación ----------------
+    @classmethod
+    def desde(cls, mapa: Union[CityMap, "MapaCompilado"]) -> "MapaCompilado":
+        return mapa if isinstance(mapa, MapaCompilado) else cls.compilar(mapa)
+
+    @classmethod
+    def compilar(cls, city_map: CityMap) -> "MapaCompilado":
+        """Convierte un CityMap a grilla uint8. Tiles fuera de las filas del JSON quedan con código ''."""
+        codigos: List[str] = []
+        posiciones: Dict[str, int] = {}
+
+        def posicion(codigo: str) -> int:
+            if codigo not in posiciones:
+                if len(codigos) >= cls.MAX_CODIGOS:
+                    raise ValueError(f"El mapa usa más de {cls.MAX_CODIGOS} códigos de tile distintos")
+                posiciones[codigo] = len(codigos)
+                codigos.append(codigo)
+            return posiciones[codigo]
+
+        for codigo in city_map.legend:
+            posicion(codigo)
+        ancho, alto = city_map.width, city_map.height
+        grilla = bytearray(ancho * alto)
+        for y in range(alto):
+            fila = city_map.tiles[y][:ancho] if y < len(city_map.tiles) else []
+            for codigo in set(fila):
+                posicion(codigo)
+            base = y * ancho
+            grilla[base:base + len(fila)] = bytes(map(posiciones.__getitem__, fila))
+            if len(fila) < ancho:
+                grilla[base + len(fila):base + ancho] = bytes([posicion("")]) * (ancho - len(fila))
+
+        infos = [city_map.legend.get(codigo) for codigo in codigos]
+        return cls(ancho, alto, city_map.goal, city_map.max_time, city_map.city_name, city_map.version,
+                   codigos, infos, grilla)
+
+    # ---------------- Archivo ----------------
+    @classmethod
+    def ruta_para(cls, json_path: Path) -> Path:
+        return Path(json_path).with_suffix(cls.EXTENSION)
+
+    def _string(self, texto: str) -> bytes:
+        datos = texto.encode("utf-8")
+        return self._LARGO.pack(len(datos)) + datos
+
+    def escribir(self, json_path: Path) -> Path:
+        """Escribe el .cqmap correspondiente a `json_path` (temporal + os.replace)"""
+        json_path = Path(json_path)
+        ruta = self.ruta_para(json_path)
+        estado = json_path.stat()
+        partes = [
+            self._HEADER.pack(self.MAGIC, self.VERSION, self.width, self.height, self.goal, self.max_time,
+                              estado.st_size, estado.st_mtime_ns),
+            self._string(self.city_name),
+            self._string(self.version),
+            struct.pack("<H", len(self.codigos)),
+        ]
+        for codigo, info in zip(self.codigos, self.infos):
+            partes.append(self._string(codigo))
+            if info is None:
+                partes.append(self._TILE.pack(0, math.nan, -1))
+                continue
+            partes.append(self._TILE.pack(
+                1,
+                math.nan if info.surface_weight is None else info.surface_weight,
+                -1 if info.blocked is None else int(info.blocked),
+            ))
+            partes.append(self._string(info.name))
+
+        tmp_path = ruta.with_name(ruta.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(partes))
+            f.write(self.grilla)
+        os.replace(tmp_path, ruta)
+        return ruta
+
+    @classmethod
+    def abrir(cls, json_path: Path) -> Optional["MapaCompilado"]:
+        """Mapea el .cqmap si corresponde al map.json actual; None si falta o quedó viejo"""
+        json_path = Path(json_path)
+        try:
+            estado = json_path.stat()
+            with open(cls.ruta_para(json_path), "rb") as f:
+                if os.fstat(f.fileno()).st_size < cls._HEADER.size:
+                    return None
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        try:
+            magic, version, ancho, alto, goal, max_time, tam_json, mtime_json = cls._HEADER.unpack_from(mapa, 0)
+            if magic != cls.MAGIC or version != cls.VERSION or (tam_json, mtime_json) != (estado.st_size, estado.st_mtime_ns):
+                mapa.close()
+                return None
+            pos = cls._HEADER.size
+
+            def leer_string() -> str:
+                nonlocal pos
+                (largo,) = cls._LARGO.unpack_from(mapa, pos)
+                pos += cls._LARGO.size
+                texto = mapa[pos:pos + largo].decode("utf-8")
+                pos += largo
+                return texto
+
+            city_name = leer_string()
+            version_mapa = leer_string()
+            (cantidad,) = struct.unpack_from("<H", mapa, pos)
+            pos += 2
+            codigos: List[str] = []
+            infos: List[Optional[TileInfo]] = []
+            for _ in range(cantidad):
+                codigo = leer_string()
+                tiene_info, surface_weight, blocked = cls._TILE.unpack_from(mapa, pos)
+                pos += cls._TILE.size
+                codigos.append(codigo)
+                if not tiene_info:
+                    infos.append(None)
+                    continue
+                # model_construct: la leyenda ya se validó al compilar
+                infos.append(TileInfo.model_construct(
+                    name=leer_string(),
+                    surface_weight=None if math.isnan(surface_weight) else surface_weight,
+                    blocked=None if blocked < 0 else bool(blocked),
+                ))
+            if len(mapa) - pos < ancho * alto:
+                raise ValueError("grilla incompleta")
+        except (struct.error, UnicodeDecodeError, ValueError):
+            mapa.close()
+            return None
+
+        grilla = memoryview(mapa)[pos:pos + ancho * alto]
+        return cls(ancho, alto, goal, max_time, city_name, version_mapa, codigos, infos, grilla, mapa)
+
+    @classmethod
+    def cargar(cls, json_path: Path) -> "MapaCompilado":
+        """
+        Carga el mapa de la caché: el .cqmap si está al día; si no, lee map.json
+        (CacheConfiable) y deja compilado el .cqmap para el próximo inicio.
+        """
+        compilado = cls.abrir(json_path)
+        if compilado is not None:
+            return compilado
+        compilado = cls.compilar(CacheConfiable.cargar(json_path, CityMap))
+        try:
+            compilado.escribir(json_path)
+        except OSError as e:
+            print(f"[WARNING] No se pudo escribir el mapa compilado: {e}")
+        return compilado
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Tuple
 from pydantic import BaseModel
 
 
@@ -12,3 +12,55 @@ class PedidoSolicitud(BaseModel):
     priority: int           # prioridad del pedido (0 normal, 1 urgente, etc.)
     release_time: int       # tiempo de liberación en segundos desde el inicio del juego
 
+
+
+class Pedido:
+    """
+    Pedido en tiempo de juego. PedidoSolicitud (pydantic) solo se usa al leer la
+    API o la caché; durante la partida se usa este registro liviano:
+    coordenadas como tuplas (sin convertir en cada chequeo de adyacencia) y
+    el tiempo límite ya calculado (release_time + duration).
+
+    `alcanzable` lo marca el notificador al liberar el pedido (MapLogic.pedido_alcanzable);
+    None mientras no se haya revisado.
+    """
+
+    __slots__ = ("id", "pickup", "dropoff", "payout", "duration", "weight", "priority", "release_time", "deadline",
+                 "alcanzable")
+
+    def __init__(self, id: str, pickup: Tuple[int, int], dropoff: Tuple[int, int], payout: int, duration: int,
+                 weight: int, priority: int, release_time: int):
+        self.id = id
+        self.pickup = (pickup[0], pickup[1])
+        self.dropoff = (dropoff[0], dropoff[1])
+        self.payout = payout
+        self.duration = duration
+        self.weight = weight
+        self.priority = priority
+        self.release_time = release_time
+        self.deadline = release_time + duration
+        self.alcanzable: Optional[bool] = None
+
+    @classmethod
+    def desde_solicitud(cls, solicitud: PedidoSolicitud) -> "Pedido":
+        return cls(solicitud.id, solicitud.pickup, solicitud.dropoff, solicitud.payout, solicitud.duration,
+                   solicitud.weight, solicitud.priority, solicitud.release_time)
+
+    def _campos(self) -> tuple:
+        return (self.id, self.pickup, self.dropoff, self.payout, self.duration,
+                self.weight, self.priority, self.release_time)
+
+    # Igualdad por valor, como los modelos pydantic (un pedido cargado de un guardado
+    # es igual al mismo pedido en otra lista)
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Pedido):
+            return NotImplemented
+        return self is other or self._campos() == other._campos()
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return (f"Pedido(id={self.id!r}, pickup={self.pickup}, dropoff={self.dropoff}, payout={self.payout}, "
+                f"duration={self.duration}, weight={self.weight}, priority={self.priority}, "
+                f"release_time={self.release_time})")
@@ -1,8 +1,9 @@
-import json
 from pathlib import Path
-from typing import List
-from src.models.Pedido import PedidoSolicitud
+from typing import List, Optional
+from src.models.Pedido import Pedido, PedidoSolicitud
 from src.api.ManejadorAPI import ManejadorAPI
+from src.api.cache_confiable import CacheConfiable
+from src.api.job_cache import JobsColumnar
 
 
 class ServicioPedidos:
@@ -13,20 +14,35 @@ class ServicioPedidos:
         self.api = ManejadorAPI(cache_dir=self.cache_dir)
         self.default_duration = default_duration
 
-    def cargar_pedidos(self, force_update: bool = True) -> List[PedidoSolicitud]:
+    def cargar_pedidos(self, force_update: bool = True) -> List[Pedido]:
+        """Pedidos para la partida (registros livianos; pydantic solo valida la caché JSON)"""
 
         jobs_file = self.cache_dir / "jobs.json"
 
         if force_update or not jobs_file.exists():
-            print("jobs.json no encontrado. Descargando desde API...")
-            self.api.get_jobs(save=True)
+            # Con force_update solo se revalida (If-None-Match); si no cambió la API responde 304
+            self.api.descargar_jobs(forzar=force_update)
 
-        with open(jobs_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # Camino rápido: caché columnar mapeada en memoria, sin parsear JSON ni validar
+        columnas = JobsColumnar.abrir(jobs_file)
+        if columnas is not None:
+            try:
+                return list(columnas.pedidos(duration=self.default_duration))
+            finally:
+                columnas.cerrar()
 
-        pedidos: List[PedidoSolicitud] = []
+        data, confiable = CacheConfiable.leer(jobs_file, PedidoSolicitud.__name__)
+        if confiable:
+            # jobs.json lo escribimos nosotros y no cambió: se arma el registro sin validar
+            return [
+                Pedido(job["id"], job["pickup"], job["dropoff"], job["payout"], self.default_duration,
+                       job["weight"], job["priority"], job["release_time"])
+                for job in data
+            ]
+
+        pedidos: List[Pedido] = []
         for job in data:
-            pedido = PedidoSolicitud(
+            solicitud = PedidoSolicitud(
                 id=job.get("id"),
                 pickup=job.get("pickup"),
                 dropoff=job.get("dropoff"),
@@ -36,8 +52,16 @@ class ServicioPedidos:
                 priority=job.get("priority"),
                 release_time=job.get("release_time"),
             )
-            pedidos.append(pedido) #Se agregan los pedidos al cache
+            pedidos.append(Pedido.desde_solicitud(solicitud)) #Se agregan los pedidos al cache
 
         return pedidos
 
+    def abrir_columnas(self) -> Optional[JobsColumnar]:
+        """
+        Acceso columnar a los pedidos en caché (ej. solo release_time o payout),
+        sin construir los objetos. None si jobs.bin no existe o quedó viejo.
+        El llamador debe cerrarlo con cerrar().
+        """
+        return JobsColumnar.abrir(self.cache_dir / "jobs.json")
+
 
@@ -0,0 +1,60 @@
+"""
+Nodos expandidos y tiempo por camino: BuscadorJPS contra Bot._dijkstra_path.
+
+No corre con la suite (no empieza con test_). Uso:
+    python -m tests.bench_jps [pares]
+"""
+import heapq
+import random
+import sys
+import time
+from unittest import mock
+
+from tests.mapas import bot_hard, caminables, mapa_aleatorio, mapa_ciudad
+
+
+def medir(nombre: str, map_logic, pares: int, rng: random.Random) -> None:
+    tiles = caminables(map_logic)
+    buscador = map_logic.buscador_jps
+    bot = bot_hard(map_logic, tiles[0], tarea="pickup")
+
+    # _dijkstra_path no cuenta sus nodos: se cuentan sus heappop (las iteraciones que corta en 1000)
+    expansiones_dijkstra = 0
+    heappop = heapq.heappop
+
+    def contar_heappop(heap):
+        nonlocal expansiones_dijkstra
+        expansiones_dijkstra += 1
+        return heappop(heap)
+
+    expansiones_jps = llegadas = 0
+    t_jps = t_dijkstra = 0.0
+    for _ in range(pares):
+        inicio, meta = rng.sample(tiles, 2)
+        t = time.perf_counter()
+        buscador.buscar(inicio, meta)
+        t_jps += time.perf_counter() - t
+        expansiones_jps += buscador.expandidos
+
+        with mock.patch.object(heapq, "heappop", contar_heappop):
+            t = time.perf_counter()
+            camino = bot._dijkstra_path(inicio, meta)
+            t_dijkstra += time.perf_counter() - t
+        llegadas += bool(camino) and camino[-1] == meta
+
+    print(f"{nombre:<28} JPS {expansiones_jps / pares:8.1f} nodos {t_jps / pares * 1000:7.2f} ms | "
+          f"_dijkstra_path {expansiones_dijkstra / pares:8.1f} nodos {t_dijkstra / pares * 1000:7.2f} ms "
+          f"(llegó {llegadas}/{pares}, corta en 1000)")
+
+
+def main() -> None:
+    pares = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    rng = random.Random(50)
+    for lado in (30, 100, 300):
+        medir(f"ciudad {lado}x{lado}", mapa_ciudad(rng, lado, lado), pares, rng)
+    for lado in (30, 100):
+        medir(f"ruido {lado}x{lado}", mapa_aleatorio(rng, lado, lado), pares, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Mapas de prueba y un Dijkstra de referencia para comparar los buscadores de caminos"""
+import heapq
+import math
+import random
+from typing import Dict, Sequence, Tuple
+
+from src.game.bot import Bot
+from src.game.map_logic import MapLogic
+from src.models.CityMap import CityMap
+
+# Pesos que float32 no representa exacto, además del de las calles
+PESOS = (1.0, 0.95, 0.9, 1.2, 1.1)
+
+LEYENDA_CIUDAD = {
+    "C": {"name": "calle", "surface_weight": 1.0},
+    "P": {"name": "parque", "surface_weight": 0.95},
+    "B": {"name": "edificio", "blocked": True},
+}
+
+
+def mapa_aleatorio(rng: random.Random, ancho: int, alto: int, pesos: Sequence[float] = PESOS,
+                   prob_edificio: float = 0.2) -> MapLogic:
+    """Un código por peso ("calle" el primero, "parque" el resto) más "B" para edificios"""
+    codigos = [chr(ord("C") + i) if i else "C" for i in range(len(pesos))]
+    leyenda = {
+        codigo: {"name": "calle" if i == 0 else "parque", "surface_weight": peso}
+        for i, (codigo, peso) in enumerate(zip(codigos, pesos))
+    }
+    leyenda["B"] = {"name": "edificio", "blocked": True}
+    tiles = [
+        ["B" if rng.random() < prob_edificio else rng.choice(codigos) for _ in range(ancho)]
+        for _ in range(alto)
+    ]
+    return _map_logic(tiles, leyenda)
+
+
+def mapa_ciudad(rng: random.Random, ancho: int, alto: int, cuadra: int = 4, prob_parque: float = 0.15) -> MapLogic:
+    """Calles cada `cuadra` tiles; cada manzana es de edificios o, a veces, un parque"""
+    parques = {(mx, my) for mx in range(ancho // cuadra + 1) for my in range(alto // cuadra + 1)
+               if rng.random() < prob_parque}
+    tiles = [
+        ["C" if x % cuadra == 0 or y % cuadra == 0 else ("P" if (x // cuadra, y // cuadra) in parques else "B")
+         for x in range(ancho)]
+        for y in range(alto)
+    ]
+    return _map_logic(tiles, LEYENDA_CIUDAD)
+
+
+def mapa_de_texto(*filas: str) -> MapLogic:
+    """Mapa con una fila por string: C calle, P parque, B edificio"""
+    return _map_logic([list(fila) for fila in filas], LEYENDA_CIUDAD)
+
+
+def _map_logic(tiles, leyenda) -> MapLogic:
+    city_map = CityMap(version="1", city_name="Prueba", width=len(tiles[0]), height=len(tiles), goal=100,
+                       max_time=600, tiles=tiles, legend=leyenda)
+    return MapLogic(city_map, 20, 20)
+
+
+def dijkstra(map_logic: MapLogic, inicio: Tuple[int, int]) -> Dict[Tuple[int, int], float]:
+    """Costo mínimo desde `inicio` a cada tile alcanzable; entrar a un tile cuesta su peso"""
+    distancias = {inicio: 0.0}
+    heap = [(0.0, inicio)]
+    while heap:
+        dist, (x, y) = heapq.heappop(heap)
+        if dist > distancias[(x, y)]:
+            continue
+        for vecino in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if map_logic.is_blocked(*vecino):
+                continue
+            nueva = dist + costo(map_logic, vecino)
+            if nueva < distancias.get(vecino, math.inf):
+                distancias[vecino] = nueva
+                heapq.heappush(heap, (nueva, vecino))
+    return distancias
+
+
+def costo(map_logic: MapLogic, tile: Tuple[int, int]) -> float:
+    return map_logic._costos[map_logic.mapa.indice(*tile)]
+
+
+def costo_camino(map_logic: MapLogic, camino: Sequence[Tuple[int, int]]) -> float:
+    return sum(costo(map_logic, tile) for tile in camino)
+
+
+def caminables(map_logic: MapLogic):
+    return [(x, y) for y in range(map_logic.mapa.height) for x in range(map_logic.mapa.width)
+            if not map_logic.is_blocked(x, y)]
+
+
+def bot_hard(map_logic: MapLogic, tile: Tuple[int, int], tarea: str = "deliver") -> Bot:
+    """Bot HARD sin sprites ni archivos: solo lo que usa _plan_path_to"""
+    bot = Bot.__new__(Bot)
+    bot.map_logic = map_logic
+    bot.difficulty = Bot.HARD
+    bot.current_task = tarea
+    bot.current_path = []
+    bot.tile_width = bot.tile_height = 20
+    bot.x, bot.y = tile[0] * 20, tile[1] * 20
+    return bot
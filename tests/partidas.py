@@ -0,0 +1,57 @@
+"""Estados de partida, un jugador falso y un GameStateManager sobre una carpeta temporal, para los tests"""
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from src.game.game_state_manager import GameStateManager, GameState
+from src.game.sqlite_store import SQLiteStore
+
+
+def pedido(id: str, **cambios) -> Dict[str, Any]:
+    return {"id": id, "priority": 0, "weight": 1, "payout": 100, "duration": 60, "release_time": 0,
+            "pickup": [1, 1], "dropoff": [5, 5], **cambios}
+
+
+def estado(**cambios) -> Dict[str, Any]:
+    """Dict válido para GameState; `cambios` pisa cualquier campo"""
+    datos = dict(
+        player_name="Ana", day=1, save_timestamp="2026-01-01T10:00:00",
+        position=(40.0, 60.0), direccion="down", peso_total=0.0,
+        resistencia=100.0, resistencia_max=100.0, exhaust_lock=False, score=0, reputation=70.0,
+        tiempo_actual_segundos=0, tiempo_total_pausado=0, tiempo_inicio=0,
+        current_weather="clear", weather_intensity=0.0,
+        weather_transition_state={"condicion_actual": "clear", "en_transicion": False},
+        active_orders=[pedido("P1")], inventory_orders=[], available_orders=[pedido("P2"), pedido("P3")],
+        completed_jobs=[], pedidos_mostrados=["P1"], selected_inventory_index=0,
+        pedidos_pendientes=[], notificacion_activa=False,
+    )
+    datos.update(cambios)
+    return datos
+
+
+def game_state(**cambios) -> GameState:
+    return GameState(**estado(**cambios))
+
+
+def jugador_falso() -> SimpleNamespace:
+    """Lo que UndoSystem lee y restaura del Player, sin sprites ni pygame"""
+    return SimpleNamespace(
+        x=0.0, y=0.0, tile_width=20, tile_height=20, direccion="down", peso_total=0.0,
+        stats=SimpleNamespace(resistencia=100.0), reputation=SimpleNamespace(valor=70),
+        rect=SimpleNamespace(center=(0, 0)), image=None,
+        sprites={"up": "up", "down": "down", "izq": "izq", "der": "der"},
+    )
+
+
+def gestor_temporal(test) -> GameStateManager:
+    """GameStateManager que guarda en una carpeta temporal (sin tocar src/game/saves) y sin SQLite"""
+    anterior = SQLiteStore.activo
+    SQLiteStore.activo = None
+    test.addCleanup(setattr, SQLiteStore, "activo", anterior)
+    gestor = GameStateManager()
+    carpeta = tempfile.TemporaryDirectory()
+    test.addCleanup(carpeta.cleanup)
+    gestor.save_dir = Path(carpeta.name)
+    gestor.index_path = gestor.save_dir / GameStateManager.INDEX_FILE
+    return gestor
@@ -0,0 +1,59 @@
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from src.game.asset_manager import AssetManager
+
+SPRITES = Path(__file__).resolve().parent.parent / "sprites"
+
+
+class AssetManagerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        cls.addClassCleanup(pygame.display.quit)
+
+    def setUp(self):
+        self.assets = AssetManager(SPRITES)
+
+    def test_sprite_faltante_es_un_damero_visible(self):
+        salida = StringIO()
+        with redirect_stdout(salida):
+            sprite = self.assets.obtener("no_existe.png", (20, 20))
+            self.assertIs(self.assets.obtener("no_existe.png", (20, 20)), sprite)
+        self.assertEqual(sprite.get_size(), (20, 20))
+        magenta, negro = AssetManager.COLORES_FALTANTE
+        self.assertEqual(sprite.get_at((0, 0))[:3], magenta)
+        self.assertEqual(sprite.get_at((15, 0))[:3], negro)
+        self.assertEqual(sprite.get_at((15, 15))[:3], magenta)
+        # Un solo aviso, con la ruta, y la ruta queda registrada
+        avisos = [linea for linea in salida.getvalue().splitlines() if linea.startswith("[AssetManager]")]
+        self.assertEqual(len(avisos), 1)
+        self.assertIn(str(SPRITES / "no_existe.png"), avisos[0])
+        self.assertEqual(self.assets.faltantes, {"no_existe.png": SPRITES / "no_existe.png"})
+
+    def test_faltante_junto_a_sprites_validos(self):
+        with redirect_stdout(StringIO()):
+            sprites = self.assets.obtener_varios({"C": "Spr_acera.png", "X": "no_existe.png", "P": "package.png"},
+                                                 (16, 12))
+        for clave, sprite in sprites.items():
+            self.assertIsNotNone(sprite, clave)
+            self.assertEqual(sprite.get_size(), (16, 12))
+        # Todos comparten la misma página del atlas
+        self.assertEqual(len({id(sprite.get_parent()) for sprite in sprites.values()}), 1)
+        self.assertEqual(list(self.assets.faltantes), ["no_existe.png"])
+
+    def test_sprites_existentes_no_se_marcan_como_faltantes(self):
+        sprite = self.assets.obtener("Spr_acera.png", (20, 20))
+        self.assertIs(self.assets.obtener("Spr_acera.png", (20, 20)), sprite)
+        self.assertEqual(self.assets.faltantes, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.game.autosave import AutoSaveService
+from tests.partidas import estado, game_state, gestor_temporal
+
+
+class AutoSaveReinicioTest(unittest.TestCase):
+    def test_snapshot_encolado_de_la_partida_anterior_se_descarta(self):
+        gestor = gestor_temporal(self)
+        guardar = gestor.guardar_incremental
+        escribiendo, seguir = threading.Event(), threading.Event()
+        guardados = []
+
+        def guardar_lento(game_state, save_id, checkpoint_cada):
+            guardados.append((game_state.player_name, save_id))
+            escribiendo.set()
+            seguir.wait(5)
+            return guardar(game_state, save_id, checkpoint_cada)
+
+        gestor.guardar_incremental = guardar_lento
+        servicio = AutoSaveService(gestor, checkpoint_cada=5)
+        self.addCleanup(servicio.detener)
+
+        servicio.solicitar(estado(player_name="vieja-1"))
+        self.assertTrue(escribiendo.wait(5))  # El worker quedó escribiendo este
+        servicio.solicitar(estado(player_name="vieja-2"))  # Queda encolado
+        servicio.reiniciar()
+        seguir.set()
+        servicio.detener()  # Procesa lo que quede en la cola
+
+        self.assertEqual([nombre for nombre, _ in guardados], ["vieja-1"])
+
+    def test_partida_nueva_usa_otra_cadena(self):
+        gestor = gestor_temporal(self)
+        servicio = AutoSaveService(gestor, checkpoint_cada=5)
+        self.addCleanup(servicio.detener)
+        servicio.solicitar(estado(player_name="vieja"))
+        limite = time.monotonic() + 5
+        while servicio.ultimo_guardado is None and time.monotonic() < limite:
+            time.sleep(0.01)
+        cadena_vieja = servicio.ultimo_guardado
+        self.assertIsNotNone(cadena_vieja)
+
+        servicio.reiniciar()
+        servicio.solicitar(estado(player_name="nueva"))
+        servicio.detener()
+        self.assertNotEqual(servicio.ultimo_guardado, cadena_vieja)
+        self.assertEqual({p["player_name"] for p in gestor.listar_partidas()}, {"vieja", "nueva"})
+
+
+class EscrituraAtomicaTest(unittest.TestCase):
+    def test_fallo_a_mitad_deja_el_guardado_anterior(self):
+        gestor = gestor_temporal(self)
+        gestor.save_game_state(game_state(score=10), save_id="partida")
+        ruta = gestor.save_dir / "partida.cqsave"
+        antes = ruta.read_bytes()
+
+        with mock.patch.object(os, "fsync", side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                gestor.save_game_state(game_state(score=99), save_id="partida")
+
+        self.assertEqual(ruta.read_bytes(), antes)
+        self.assertEqual(gestor.load_game_state(ruta).score, 10)
+        self.assertEqual([p.name for p in gestor.save_dir.iterdir() if p.suffix == ".tmp"], [])
+
+    def test_autosave_que_falla_no_pisa_el_anterior(self):
+        gestor = gestor_temporal(self)
+        servicio = AutoSaveService(gestor, checkpoint_cada=0)
+        servicio.solicitar(estado(score=10))
+        servicio.detener()
+        ruta = gestor.listar_partidas()[0]["file"]
+
+        servicio = AutoSaveService(gestor, checkpoint_cada=0)
+        with mock.patch.object(os, "replace", side_effect=OSError("sin permisos")):
+            servicio.solicitar(estado(score=99))
+            servicio.detener()
+        self.assertEqual(gestor.load_game_state(ruta).score, 10)
+        self.assertEqual(len(list(gestor.save_dir.glob("*.cqsave"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from src.api.ManejadorAPI import ManejadorAPI
+from src.api.circuit_breaker import CircuitBreaker, CircuitoAbierto
+
+
+class _ServidorConFallas(BaseHTTPRequestHandler):
+    """Stub de la API: `modo` decide cómo falla cada solicitud"""
+
+    modo = "ok"
+
+    def do_GET(self):
+        if self.modo == "error":
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.modo == "redireccion":
+            # Redirección a sí mismo: requests termina con TooManyRedirects
+            self.send_response(302)
+            self.send_header("Location", self.path)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            cuerpo = b'{"data": {"city": "TigerCity", "initial": {"condition": "clear", "intensity": 0.0}, "conditions": [], "transition": {}}}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class CircuitoSemiabiertoTest(unittest.TestCase):
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorConFallas)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.addCleanup(self.servidor.server_close)
+        self.addCleanup(self.servidor.shutdown)
+        _ServidorConFallas.modo = "ok"
+
+        self.ahora = 0.0
+        self.api = ManejadorAPI(cache_dir=Path(tempfile.mkdtemp()), ttl=0, reintentos=0)
+        self.api.BASE_URL = f"http://127.0.0.1:{self.servidor.server_port}"
+        self.circuito = CircuitBreaker(umbral=2, enfriamiento=30.0, reloj=lambda: self.ahora)
+        ManejadorAPI._circuitos[self.api.BASE_URL] = self.circuito
+        self.addCleanup(ManejadorAPI._circuitos.pop, self.api.BASE_URL, None)
+
+    def _abrir_circuito(self):
+        _ServidorConFallas.modo = "error"
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                self.api.get_weather("TigerCity", save=False)
+        self.assertEqual(self.circuito.estado, CircuitBreaker.ABIERTO)
+        with self.assertRaises(CircuitoAbierto):
+            self.api.get_weather("TigerCity", save=False)
+
+    def test_prueba_con_error_no_de_conexion_vuelve_a_abrir(self):
+        self._abrir_circuito()
+        self.ahora += 31
+        _ServidorConFallas.modo = "redireccion"
+        with self.assertRaises(requests.TooManyRedirects):
+            self.api.get_weather("TigerCity", save=False)
+        self.assertEqual(self.circuito.estado, CircuitBreaker.ABIERTO)
+        self.assertFalse(self.circuito._prueba_en_curso)
+
+        # La API se recupera: pasado otro enfriamiento la prueba cierra el circuito
+        self.ahora += 31
+        _ServidorConFallas.modo = "ok"
+        self.api.get_weather("TigerCity", save=False)
+        self.assertEqual(self.circuito.estado, CircuitBreaker.CERRADO)
+
+    def test_prueba_con_error_inesperado_libera_la_prueba(self):
+        self._abrir_circuito()
+        self.ahora += 31
+        original = self.api.session.get
+
+        def falla(*args, **kwargs):
+            raise ValueError("falla inyectada")
+
+        self.api.session.get = falla
+        with self.assertRaises(ValueError):
+            self.api.get_weather("TigerCity", save=False)
+        self.api.session.get = original
+        self.assertFalse(self.circuito._prueba_en_curso)
+
+        self.ahora += 31
+        _ServidorConFallas.modo = "ok"
+        self.api.get_weather("TigerCity", save=False)
+        self.assertEqual(self.circuito.estado, CircuitBreaker.CERRADO)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+from src.game.delta_save import DeltaSave
+from tests.partidas import game_state, gestor_temporal, pedido
+
+
+def _estados(n):
+    """Estados sucesivos de una partida: se mueve, suma score y los pedidos pasan de lista en lista"""
+    for i in range(n):
+        yield game_state(
+            save_timestamp=f"2026-01-01T10:{i:02d}:00",
+            position=(40.0 + i, 60.0),
+            score=10 * i,
+            tiempo_actual_segundos=5 * i,
+            active_orders=[pedido(f"P{j}") for j in range(i, i + 2)],
+            inventory_orders=[pedido(f"P{i - 1}")] if i else [],
+            pedidos_mostrados=[f"P{j}" for j in range(i + 2)],
+        )
+
+
+class CadenaDeltasTest(unittest.TestCase):
+    def setUp(self):
+        self.gestor = gestor_temporal(self)
+        self.checkpoint = self.gestor.save_dir / "cadena.cqsave"
+        self.deltas = DeltaSave.ruta_para(self.checkpoint)
+
+    def test_reconstruye_checkpoint_mas_n_deltas(self):
+        for n in (1, 2, 7):
+            with self.subTest(deltas=n - 1):
+                estados = list(_estados(n))
+                for estado in estados:
+                    self.gestor.guardar_incremental(estado, "cadena", checkpoint_cada=100)
+                self.assertEqual(self.gestor.load_game_state(self.checkpoint), estados[-1])
+                self.gestor.cerrar_cadena("cadena")
+
+    def test_checkpoint_cada_n_deltas(self):
+        nuevos = [self.gestor.guardar_incremental(e, "cadena", checkpoint_cada=3) for e in _estados(9)]
+        self.assertEqual(nuevos, [True, False, False, False, True, False, False, False, True])
+        self.assertEqual(self.gestor.load_game_state(self.checkpoint).score, 80)
+
+    def test_indice_solo_con_checkpoints_y_al_cerrar(self):
+        with mock.patch.object(self.gestor, "_actualizar_indice", wraps=self.gestor._actualizar_indice) as actualizar:
+            for estado in _estados(9):
+                self.gestor.guardar_incremental(estado, "cadena", checkpoint_cada=3)
+            self.assertEqual(actualizar.call_count, 3)  # Uno por checkpoint
+            self.gestor.cerrar_cadena("cadena")
+            self.assertEqual(actualizar.call_count, 3)  # El último guardado ya fue checkpoint
+
+            for estado in _estados(11):
+                self.gestor.guardar_incremental(estado, "otra", checkpoint_cada=100)
+            self.assertEqual(actualizar.call_count, 4)
+            self.gestor.cerrar_cadena("otra")
+            self.assertEqual(actualizar.call_count, 5)
+        info = {p["archivo"]: p for p in self.gestor.listar_partidas()}["otra.cqsave"]
+        self.assertEqual(info["score"], 100)
+
+    def _cadena_y_largo_sin_el_ultimo(self, n):
+        estados = list(_estados(n))
+        for estado in estados[:-1]:
+            self.gestor.guardar_incremental(estado, "cadena", checkpoint_cada=100)
+        largo = self.deltas.stat().st_size
+        self.gestor.guardar_incremental(estados[-1], "cadena", checkpoint_cada=100)
+        return estados, largo
+
+    def test_ultimo_delta_cortado_se_ignora(self):
+        estados, largo = self._cadena_y_largo_sin_el_ultimo(5)
+        for sobran in (1, 4, 6):  # Dentro del largo, justo tras el largo y dentro de los datos
+            with self.subTest(bytes_del_ultimo=sobran):
+                contenido = self.deltas.read_bytes()
+                self.deltas.write_bytes(contenido[:largo + sobran])
+                self.assertEqual(self.gestor.load_game_state(self.checkpoint), estados[-2])
+                self.deltas.write_bytes(contenido)
+
+    def test_ultimo_delta_corrupto_se_ignora(self):
+        estados, largo = self._cadena_y_largo_sin_el_ultimo(5)
+        contenido = bytearray(self.deltas.read_bytes())
+        for i in range(largo + 4, len(contenido)):
+            contenido[i] ^= 0xFF
+        self.deltas.write_bytes(bytes(contenido))
+        self.assertEqual(self.gestor.load_game_state(self.checkpoint), estados[-2])
+
+    def test_deltas_de_otro_checkpoint_se_ignoran(self):
+        estados = list(_estados(4))
+        for estado in estados:
+            self.gestor.guardar_incremental(estado, "cadena", checkpoint_cada=100)
+        # Checkpoint reescrito sin reiniciar los deltas (el proceso murió en el medio)
+        self.gestor.save_game_state(estados[1], save_id="cadena")
+        self.assertEqual(self.gestor.load_game_state(self.checkpoint), estados[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
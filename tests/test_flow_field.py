@@ -0,0 +1,101 @@
+import math
+import random
+import unittest
+
+from src.game.flow_field import CampoDeFlujo, ServicioCamposDeFlujo
+from tests.mapas import bot_hard, caminables, costo_camino, dijkstra, mapa_aleatorio
+
+
+class CampoDeFlujoTest(unittest.TestCase):
+    def _comparar(self, map_logic, destino):
+        campo = CampoDeFlujo.calcular(map_logic.mapa, map_logic._bloqueado, map_logic._costos, destino)
+        for tile in caminables(map_logic):
+            esperada = dijkstra(map_logic, tile).get(destino, math.inf)
+            self.assertAlmostEqual(campo.distancia(tile), esperada, places=9, msg=f"{tile} -> {destino}")
+            if tile != destino and esperada < math.inf:
+                camino = campo.camino(tile)
+                self.assertEqual(camino[-1], destino)
+                self.assertAlmostEqual(costo_camino(map_logic, camino), esperada, places=9)
+
+    def test_pesos_no_diadicos_sin_edificios(self):
+        # Con distancias en float32 regiones enteras quedaban en inf con peso 0.95
+        rng = random.Random(49)
+        for _ in range(20):
+            map_logic = mapa_aleatorio(rng, rng.randint(3, 14), rng.randint(3, 14), pesos=(0.95,), prob_edificio=0.0)
+            self._comparar(map_logic, rng.choice(caminables(map_logic)))
+
+    def test_pesos_mezclados_con_edificios(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            map_logic = mapa_aleatorio(rng, rng.randint(3, 14), rng.randint(3, 14))
+            tiles = caminables(map_logic)
+            if tiles:
+                self._comparar(map_logic, rng.choice(tiles))
+
+    def test_por_tramos_igual_que_de_una_vez(self):
+        rng = random.Random(3)
+        map_logic = mapa_aleatorio(rng, 30, 30)
+        destino = rng.choice(caminables(map_logic))
+        completo = CampoDeFlujo.calcular(map_logic.mapa, map_logic._bloqueado, map_logic._costos, destino)
+        campo = CampoDeFlujo.iniciar(map_logic.mapa, map_logic._bloqueado, map_logic._costos, destino)
+        tramos = 0
+        while not campo.avanzar(50):
+            tramos += 1
+            # Lo que ya está listo no cambia al seguir avanzando
+            for tile in caminables(map_logic):
+                if campo.listo(tile):
+                    self.assertEqual(campo.distancia(tile), completo.distancia(tile))
+        self.assertGreater(tramos, 3)
+        self.assertEqual(campo.distancias, completo.distancias)
+
+
+class ServicioCamposDeFlujoTest(unittest.TestCase):
+    def setUp(self):
+        self.map_logic = mapa_aleatorio(random.Random(11), 12, 12, prob_edificio=0.0)
+        self.tiles = caminables(self.map_logic)
+
+    def test_bots_con_el_mismo_destino_comparten_el_campo(self):
+        destino = self.tiles[-1]
+        bots = [bot_hard(self.map_logic, tile) for tile in self.tiles[:10]]
+        for bot in bots:
+            bot._plan_path_to(destino)
+        self.assertEqual(self.map_logic.campos_de_flujo.calculados, 1)
+        for bot in bots:
+            self.assertEqual(bot.current_path[-1], destino)
+
+    def test_presupuesto_acota_cada_pedido(self):
+        map_logic = mapa_aleatorio(random.Random(5), 60, 60, prob_edificio=0.0)
+        servicio = ServicioCamposDeFlujo(map_logic.mapa, map_logic._bloqueado, map_logic._costos)
+        campo = servicio.obtener((0, 0), presupuesto=100)
+        self.assertFalse(campo.completo)
+        self.assertLessEqual(sum(d != math.inf for d in campo.distancias), 100 * 5)
+        pedidos = 1
+        while not servicio.obtener((0, 0), presupuesto=100).completo:
+            pedidos += 1
+        self.assertGreaterEqual(pedidos, 60 * 60 // 100)
+        self.assertEqual(servicio.calculados, 1)
+
+    def test_limpiar(self):
+        servicio = self.map_logic.campos_de_flujo
+        servicio.obtener(self.tiles[0])
+        servicio.limpiar()
+        servicio.obtener(self.tiles[0])
+        self.assertEqual(servicio.calculados, 2)
+
+    def test_lru_descarta_el_menos_usado(self):
+        servicio = ServicioCamposDeFlujo(self.map_logic.mapa, self.map_logic._bloqueado, self.map_logic._costos,
+                                         capacidad=2)
+        a, b, c = self.tiles[:3]
+        servicio.obtener(a)
+        servicio.obtener(b)
+        servicio.obtener(a)  # `b` queda como el menos usado
+        servicio.obtener(c)
+        self.assertEqual(servicio.calculados, 3)
+        servicio.obtener(a)
+        self.assertEqual(servicio.calculados, 3)
+        servicio.obtener(b)
+        self.assertEqual(servicio.calculados, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.api.job_cache import JobsColumnar
+from src.models.Pedido import PedidoSolicitud
+
+
+def _solicitud(id: str, i: int = 0) -> PedidoSolicitud:
+    return PedidoSolicitud(id=id, pickup=[i, i + 1], dropoff=[i + 2, i + 3], payout=100 * i - 50, duration=60,
+                           weight=i % 4, priority=i % 2, release_time=10 * i)
+
+
+class JobsColumnarTest(unittest.TestCase):
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.json_path = Path(carpeta.name) / "jobs.json"
+
+    def _escribir(self, jobs):
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump([job.model_dump() for job in jobs], f, ensure_ascii=False)
+        columnas = JobsColumnar.nuevas_columnas()
+        for job in jobs:
+            JobsColumnar.agregar(columnas, job)
+        JobsColumnar.escribir(self.json_path, columnas)
+
+    def _abrir(self) -> JobsColumnar:
+        columnar = JobsColumnar.abrir(self.json_path)
+        self.assertIsNotNone(columnar)
+        self.addCleanup(columnar.cerrar)
+        return columnar
+
+    def _comparar(self, jobs):
+        self._escribir(jobs)
+        columnar = self._abrir()
+        self.assertEqual(len(columnar), len(jobs))
+        pedidos = list(columnar.pedidos())
+        self.assertEqual(len(pedidos), len(jobs))
+        for i, (pedido, job) in enumerate(zip(pedidos, jobs)):
+            self.assertEqual(pedido.id, job.id)
+            self.assertEqual(columnar.id(i), job.id)
+            self.assertEqual(pedido.pickup, tuple(job.pickup))
+            self.assertEqual(pedido.dropoff, tuple(job.dropoff))
+            self.assertEqual((pedido.payout, pedido.duration, pedido.weight, pedido.priority, pedido.release_time),
+                             (job.payout, job.duration, job.weight, job.priority, job.release_time))
+        self.assertEqual(list(columnar.columna("release_time")), [job.release_time for job in jobs])
+
+    def test_lista_vacia(self):
+        self._comparar([])
+
+    def test_ids_ascii(self):
+        self._comparar([_solicitud(f"J{i}", i) for i in range(20)])
+
+    def test_ids_no_ascii(self):
+        self._comparar([_solicitud(id, i) for i, id in enumerate(["Ñandú-1", "J2", "", "配送-3", "🚲", "é" * 40])])
+
+    def test_json_modificado_invalida_el_binario(self):
+        self._escribir([_solicitud("J1")])
+        with open(self.json_path, "a", encoding="utf-8") as f:
+            f.write(" ")
+        self.assertIsNone(JobsColumnar.abrir(self.json_path))
+
+    def test_cerrar_con_vistas_en_uso(self):
+        self._escribir([_solicitud(f"J{i}", i) for i in range(5)])
+        columnar = JobsColumnar.abrir(self.json_path)
+        exportada = memoryview(columnar.columna("payout"))
+        tramo = columnar.columna("release_time")[1:3]
+        columnar.cerrar()  # Antes: BufferError
+        self.assertEqual(list(tramo), [10, 20])
+        self.assertEqual(exportada[4], 350)
+        exportada.release()
+        tramo.release()
+        columnar.cerrar()
+        with self.assertRaises(ValueError):
+            columnar.columna("payout")[0]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import unittest
+
+from src.api.json_stream import iterar_arreglo
+
+_DOCUMENTO = {
+    "version": "1.2",
+    "meta": {"total": 3, "nota": "pedidos de la ciudad", "vacio": []},
+    "data": [
+        {"id": "J1", "pickup": [1, 2], "payout": 1234567, "weight": 0.125, "nota": "calle \"Ñandú\" #3"},
+        {"id": "Ж2", "pickup": [30, 40], "payout": -5, "weight": 1e-3, "nota": "🚲 entrega"},
+        {"id": "J3", "anidado": {"a": [True, False, None]}, "payout": 98765.4321},
+    ],
+    "despues": "se ignora",
+}
+
+
+def _partir(datos, tam):
+    return [datos[i:i + tam] for i in range(0, len(datos), tam)]
+
+
+class IterarArregloTest(unittest.TestCase):
+    TAMANOS = (1, 7, 4096)
+
+    def _comparar(self, documento, esperado, clave="data"):
+        texto = json.dumps(documento, ensure_ascii=False, indent=2)
+        for tam in self.TAMANOS:
+            for datos in (texto, texto.encode("utf-8")):
+                with self.subTest(tam=tam, tipo=type(datos).__name__):
+                    self.assertEqual(list(iterar_arreglo(_partir(datos, tam), clave)), esperado)
+
+    def test_bloques_de_1_7_y_4096(self):
+        self._comparar(_DOCUMENTO, _DOCUMENTO["data"])
+
+    def test_numeros_y_caracteres_cortados_en_el_borde(self):
+        # Elementos sueltos al final del arreglo: un número cortado parece completo
+        documento = {"data": [12345678901234567890, 3.14159e-10, "ñ€🚲", 0]}
+        self._comparar(documento, documento["data"])
+
+    def test_arreglo_vacio_y_objeto_vacio(self):
+        self._comparar({"otro": 1, "data": []}, [])
+        self._comparar({}, [])
+
+    def test_falta_la_clave(self):
+        for tam in self.TAMANOS:
+            with self.subTest(tam=tam), self.assertRaises(KeyError):
+                list(iterar_arreglo(_partir(json.dumps({"otro": [1, 2]}), tam)))
+
+    def test_documento_cortado(self):
+        texto = json.dumps(_DOCUMENTO, ensure_ascii=False)
+        cortado = texto[:texto.index('"Ж2"') + 10]
+        for tam in self.TAMANOS:
+            with self.subTest(tam=tam):
+                elementos = iterar_arreglo(_partir(cortado, tam))
+                self.assertEqual(next(elementos), _DOCUMENTO["data"][0])
+                with self.assertRaises(json.JSONDecodeError):
+                    next(elementos)
+
+
+if __name__ == "__main__":
+    unittest.main()
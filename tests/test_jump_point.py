@@ -0,0 +1,65 @@
+import math
+import random
+import unittest
+from unittest import mock
+
+from tests.mapas import (bot_hard, caminables, costo_camino, dijkstra, mapa_aleatorio, mapa_ciudad,
+                         mapa_de_texto)
+
+
+class BuscadorJPSTest(unittest.TestCase):
+    def _comparar(self, map_logic, rng, pares):
+        tiles = caminables(map_logic)
+        if not tiles:
+            return
+        buscador = map_logic.buscador_jps
+        for _ in range(pares):
+            inicio, meta = rng.choice(tiles), rng.choice(tiles)
+            esperado = dijkstra(map_logic, inicio).get(meta, math.inf)
+            camino = buscador.buscar(inicio, meta)
+            if inicio == meta or esperado == math.inf:
+                self.assertEqual(camino, [], f"{inicio} -> {meta}")
+                continue
+            # Camino válido: pasos de un tile, sin edificios, hasta la meta
+            for (ax, ay), (bx, by) in zip([inicio] + camino, camino):
+                self.assertEqual(abs(ax - bx) + abs(ay - by), 1)
+                self.assertFalse(map_logic.is_blocked(bx, by))
+            self.assertEqual(camino[-1], meta)
+            self.assertAlmostEqual(costo_camino(map_logic, camino), esperado, places=9, msg=f"{inicio} -> {meta}")
+
+    def test_costo_minimo_en_mapas_con_pesos(self):
+        rng = random.Random(50)
+        for _ in range(40):
+            self._comparar(mapa_aleatorio(rng, rng.randint(3, 16), rng.randint(3, 16)), rng, 20)
+
+    def test_costo_minimo_en_mapas_de_calles_y_parques(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            map_logic = mapa_aleatorio(rng, rng.randint(3, 16), rng.randint(3, 16), pesos=(1.0, 1.0, 1.0, 0.95))
+            self._comparar(map_logic, rng, 20)
+
+    def test_costo_minimo_en_cuadricula_de_ciudad(self):
+        rng = random.Random(1)
+        for _ in range(5):
+            self._comparar(mapa_ciudad(rng, 33, 25), rng, 30)
+
+
+class JpsPathTest(unittest.TestCase):
+    def test_sin_camino_no_repite_la_busqueda_con_dijkstra(self):
+        # Dos zonas separadas por una columna de edificios
+        map_logic = mapa_de_texto("CCBCC", "CPBPC", "CCBCC")
+        bot = bot_hard(map_logic, (0, 1), tarea="pickup")
+        with mock.patch.object(bot, "_dijkstra_path") as dijkstra_path:
+            self.assertEqual(bot._jps_path((0, 1), (4, 1)), [])
+        dijkstra_path.assert_not_called()
+
+    def test_meta_bloqueada_usa_dijkstra(self):
+        map_logic = mapa_ciudad(random.Random(0), 9, 9)
+        bot = bot_hard(map_logic, (0, 0), tarea="pickup")
+        with mock.patch.object(bot, "_dijkstra_path", return_value=[(1, 0)]) as dijkstra_path:
+            self.assertEqual(bot._jps_path((0, 0), (1, 1)), [(1, 0)])
+        dijkstra_path.assert_called_once_with((0, 0), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
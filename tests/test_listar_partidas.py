@@ -0,0 +1,34 @@
+import unittest
+
+from tests.partidas import game_state, gestor_temporal
+
+
+class ListarPartidasTest(unittest.TestCase):
+    def setUp(self):
+        self.gestor = gestor_temporal(self)
+        self.viejo = self.gestor.save_game_state(game_state(player_name="Ana", save_timestamp="2026-01-01T10:00:00"))
+        self.nuevo = self.gestor.save_game_state(game_state(player_name="Beto", save_timestamp="2026-01-02T10:00:00"))
+
+    def _nombres(self):
+        return [info["player_name"] for info in self.gestor.listar_partidas()]
+
+    def test_pagina_de_la_mas_reciente_a_la_mas_antigua(self):
+        self.assertEqual(self._nombres(), ["Beto", "Ana"])
+        self.assertEqual([info["player_name"] for info in self.gestor.listar_partidas(1, 5)], ["Ana"])
+        self.assertEqual(self.gestor.contar_partidas(), 2)
+
+    def test_no_se_rearma_entre_frames(self):
+        primera = self.gestor.listar_partidas()
+        for _ in range(3):
+            self.assertIs(self.gestor.listar_partidas()[0], primera[0])
+
+    def test_se_refresca_al_guardar_y_al_borrar(self):
+        self.gestor.listar_partidas()
+        self.gestor.save_game_state(game_state(player_name="Caro", save_timestamp="2026-01-03T10:00:00"))
+        self.assertEqual(self._nombres(), ["Caro", "Beto", "Ana"])
+        self.gestor.eliminar_partida(self.nuevo)
+        self.assertEqual(self._nombres(), ["Caro", "Ana"])
+
+
+if __name__ == "__main__":
+    unittest.main()
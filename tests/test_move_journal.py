@@ -0,0 +1,141 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import pygame
+
+from src.game.events import Events
+from src.game.move_journal import MoveJournal, RegistroMovimiento
+from src.game.undo import UndoSystem
+from tests.partidas import jugador_falso
+
+
+def _registros(rng, n):
+    """Movimientos con tiempos no decrecientes (varios por segundo) y valores exactos en float32"""
+    tiempo = 0
+    for _ in range(n):
+        tiempo += rng.choice((0, 0, 1, 1, 2, 7))
+        yield RegistroMovimiento(
+            tiempo, 20.0 * rng.randint(0, 50), 20.0 * rng.randint(0, 50),
+            rng.choice(MoveJournal.DIRECCIONES), rng.randint(0, 200) / 2, rng.randint(-100, 100),
+            float(rng.randint(0, 8)),
+        )
+
+
+class MoveJournalTest(unittest.TestCase):
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.ruta = Path(carpeta.name) / "jornada.journal"
+
+    def _abrir(self, **kwargs):
+        journal = MoveJournal(self.ruta, **kwargs)
+        self.addCleanup(journal.cerrar)
+        return journal
+
+    def _verificar(self, journal, registros):
+        """estado_en(T) es el último registro con tiempo <= T, para todo T"""
+        for tiempo in range(-1, registros[-1].tiempo + 3):
+            esperado = None
+            for registro in registros:
+                if registro.tiempo <= tiempo:
+                    esperado = registro
+            self.assertEqual(journal.estado_en(tiempo), esperado, f"T={tiempo}")
+
+    def test_ida_y_vuelta_con_distintos_checkpoints(self):
+        for intervalo in (1, 3, 64):
+            with self.subTest(checkpoint_interval=intervalo):
+                self.ruta.unlink(missing_ok=True)
+                self.ruta.with_suffix(".ckpt").unlink(missing_ok=True)
+                journal = self._abrir(checkpoint_interval=intervalo, flush_interval=5)
+                registros = list(_registros(random.Random(intervalo), 300))
+                for registro in registros:
+                    journal.registrar(*registro)
+                self.assertEqual(len(journal), 300)
+                self._verificar(journal, registros)
+                journal.cerrar()
+
+    def test_reabrir_conserva_y_sigue_agregando(self):
+        registros = list(_registros(random.Random(1), 150))
+        journal = self._abrir(checkpoint_interval=16)
+        for registro in registros[:100]:
+            journal.registrar(*registro)
+        journal.cerrar()
+
+        journal = self._abrir(checkpoint_interval=16)
+        self.assertEqual(len(journal), 100)
+        for registro in registros[100:]:
+            journal.registrar(*registro)
+        self._verificar(journal, registros)
+
+    def test_registros_sin_flush_se_leen(self):
+        journal = self._abrir(flush_interval=1000)
+        journal.registrar(5, 20.0, 40.0, "izq", 50.0, 10, 1.0)
+        self.assertEqual(journal.estado_en(5), RegistroMovimiento(5, 20.0, 40.0, "izq", 50.0, 10, 1.0))
+        self.assertIsNone(journal.estado_en(4))
+
+
+class RebobinarTest(unittest.TestCase):
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.journal = MoveJournal(Path(carpeta.name) / "jornada.journal", checkpoint_interval=8)
+        self.addCleanup(self.journal.cerrar)
+        self.undo = UndoSystem(max_undo_steps=20, keyframe_interval=4, journal=self.journal)
+        self.jugador = jugador_falso()
+        self.eventos = Events(self.jugador, gestor=None, notificador=SimpleNamespace(activo=False),
+                              undo_system=self.undo)
+
+    def _caminar(self, desde, hasta):
+        for t in range(desde, hasta + 1):
+            self.jugador.x = 20.0 * t
+            self.jugador.stats.resistencia = 100.0 - t / 2
+            self.undo.save_state(self.jugador, t)
+
+    def _tecla_t(self, tiempo):
+        self.eventos.actualizar(tiempo)
+        self.eventos.acciones[pygame.K_t]()
+
+    def test_tecla_t_vuelve_segundos_atras(self):
+        self._caminar(0, 100)
+        self._tecla_t(100)
+        atras = 100 - Events.SEGUNDOS_REBOBINAR
+        self.assertEqual((self.jugador.x, self.jugador.stats.resistencia), (20.0 * atras, 100.0 - atras / 2))
+        # El historial en memoria arranca de nuevo desde el estado restaurado
+        self.assertEqual(self.undo.get_undo_count(), 1)
+        # y la bitácora registra el salto: en T=100 el jugador está donde quedó tras rebobinar
+        self.assertEqual(self.journal.estado_en(100).x, 20.0 * atras)
+
+    def test_rebobinar_dos_veces_y_seguir(self):
+        self._caminar(0, 100)
+        self._tecla_t(100)
+        self._caminar(101, 110)
+        self._tecla_t(110)
+        self.assertEqual(self.jugador.x, 20.0 * 80)  # En T=80 todavía valía la línea original
+        self._tecla_t(110)
+        self.assertEqual(self.jugador.x, 20.0 * 80)
+
+    def test_rebobinar_refleja_los_undo(self):
+        self._caminar(0, 40)
+        self.undo.undo_n_moves(self.jugador, 3)  # Vuelve al estado guardado en T=38
+        self._caminar(41, 45)
+        self.undo.rebobinar(self.jugador, 40, 45)
+        self.assertEqual(self.jugador.x, 20.0 * 38)
+
+    def test_antes_del_primer_registro_no_se_mueve(self):
+        self._caminar(3, 10)
+        self._tecla_t(10)  # Apunta a T=-20: no hay nada registrado tan atrás
+        self.assertEqual(self.jugador.x, 20.0 * 10)
+        self.assertEqual(self.undo.get_undo_count(), 8)
+
+    def test_notificador_activo_bloquea_la_tecla(self):
+        self._caminar(0, 50)
+        self.eventos.notificador.activo = True
+        self._tecla_t(50)
+        self.assertEqual(self.jugador.x, 20.0 * 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
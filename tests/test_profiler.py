@@ -0,0 +1,55 @@
+import math
+import random
+import unittest
+
+from src.game.profiler import FrameProfiler
+
+
+class PercentilTest(unittest.TestCase):
+    def test_rango_mas_cercano(self):
+        # Rango ceil(p/100 * n): con n=10, p95 y p99 son el máximo y p50 el 5º elemento
+        ordenadas = [float(i) for i in range(1, 11)]
+        self.assertEqual(FrameProfiler._percentil(ordenadas, 50), 5.0)
+        self.assertEqual(FrameProfiler._percentil(ordenadas, 95), 10.0)
+        self.assertEqual(FrameProfiler._percentil(ordenadas, 99), 10.0)
+        self.assertEqual(FrameProfiler._percentil(ordenadas, 11), 2.0)  # round() daba el 1º
+        self.assertEqual(FrameProfiler._percentil([], 50), 0.0)
+        self.assertEqual(FrameProfiler._percentil([3.0], 99), 3.0)
+
+    def test_contra_la_definicion(self):
+        rng = random.Random(27)
+        for n in list(range(1, 30)) + [100, 600]:
+            ordenadas = sorted(rng.random() for _ in range(n))
+            for p in range(1, 101):
+                # El menor valor con al menos p% de las muestras <= él
+                esperado = next(v for i, v in enumerate(ordenadas) if (i + 1) * 100 >= p * n)
+                self.assertEqual(FrameProfiler._percentil(ordenadas, p), esperado, f"n={n} p={p}")
+
+
+class ScopesTest(unittest.TestCase):
+    def _loop(self, profiler, salir_en):
+        for i in range(5):
+            with profiler.frame():
+                with profiler.medir("hud"):
+                    if i == salir_en:
+                        return
+
+    def test_return_dentro_de_los_scopes_los_cierra(self):
+        profiler = FrameProfiler()
+        self._loop(profiler, salir_en=2)
+        self.assertEqual(len(profiler.muestras["frame"]), 3)
+        self.assertEqual(len(profiler.muestras["hud"]), 3)
+        self.assertEqual(profiler.frames, 3)
+        self.assertIsNone(profiler._inicio_frame)
+
+    def test_excepcion_dentro_del_frame(self):
+        profiler = FrameProfiler()
+        with self.assertRaises(RuntimeError):
+            with profiler.frame():
+                raise RuntimeError("fallo en el loop")
+        self.assertEqual(len(profiler.muestras["frame"]), 1)
+        self.assertTrue(all(math.isfinite(ms) and ms >= 0 for ms in profiler.muestras["frame"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.game.game_state_manager import GameState
+from src.game.save_format import SaveFormatError, SnapshotBinario
+from tests.partidas import estado, pedido
+
+
+def _datos():
+    # Un pedido en dos listas (va una sola vez a la tabla) e ids/nombres no ASCII
+    compartido = pedido("Ñ-7", payout=-5, pickup=[0, 2 ** 31 - 1])
+    return GameState(**estado(
+        player_name="Zoë 北京",
+        active_orders=[compartido, pedido("A")],
+        inventory_orders=[compartido],
+        available_orders=[pedido(f"D{i}", release_time=i) for i in range(50)],
+        pedidos_pendientes=[],
+    )).model_dump()
+
+
+class SnapshotBinarioTest(unittest.TestCase):
+    def test_ida_y_vuelta_por_compresion(self):
+        data = _datos()
+        for compresion in SnapshotBinario.COMPRESIONES:
+            with self.subTest(compresion=compresion):
+                leido = SnapshotBinario.desde_bytes(SnapshotBinario.serializar(data, compresion))
+                self.assertEqual(GameState(**leido), GameState(**data))
+
+    def test_archivo_y_meta(self):
+        data = _datos()
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = Path(carpeta) / f"partida{SnapshotBinario.EXTENSION}"
+            for compresion in SnapshotBinario.COMPRESIONES:
+                with self.subTest(compresion=compresion):
+                    SnapshotBinario.escribir(ruta, data, compresion)
+                    self.assertEqual(GameState(**SnapshotBinario.leer(ruta)), GameState(**data))
+                    meta = SnapshotBinario.leer_meta(ruta)
+                    self.assertEqual((meta["player_name"], meta["score"]), (data["player_name"], data["score"]))
+                    self.assertNotIn("active_orders", meta)
+
+    def test_listas_reciben_copias(self):
+        leido = SnapshotBinario.desde_bytes(SnapshotBinario.serializar(_datos()))
+        leido["active_orders"][0]["payout"] = 999
+        self.assertEqual(leido["inventory_orders"][0]["payout"], -5)
+
+    def test_comprime(self):
+        data = _datos()
+        tamaños = {c: len(SnapshotBinario.serializar(data, c)) for c in SnapshotBinario.COMPRESIONES}
+        self.assertLess(tamaños["zlib"], tamaños["ninguna"])
+        self.assertLess(tamaños["lzma"], tamaños["ninguna"])
+
+    def _header(self, magic=SnapshotBinario.MAGIC, version=SnapshotBinario.VERSION, compresion=1):
+        return struct.pack("<4sBB", magic, version, compresion)
+
+    def test_rechaza_magic_version_y_compresion_invalidos(self):
+        cuerpo = SnapshotBinario.serializar(_datos())[6:]
+        for header in (self._header(magic=b"CQSX"), self._header(version=SnapshotBinario.VERSION + 1),
+                       self._header(compresion=9), b"CQ"):
+            with self.subTest(header=header):
+                with self.assertRaises(SaveFormatError):
+                    SnapshotBinario.desde_bytes(header + cuerpo)
+        with self.assertRaises(ValueError):
+            SnapshotBinario.serializar(_datos(), "bz2")
+
+    def test_rechaza_archivo_truncado(self):
+        for compresion in SnapshotBinario.COMPRESIONES:
+            completo = SnapshotBinario.serializar(_datos(), compresion)
+            for largo in sorted({0, 3, 6, 7, 20, len(completo) // 2, len(completo) - 4, len(completo) - 1}):
+                with self.subTest(compresion=compresion, largo=largo):
+                    with self.assertRaises(SaveFormatError):
+                        SnapshotBinario.desde_bytes(completo[:largo])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.game import save
+from src.game.save import Save
+from src.game.scoreboard import ScoreBoard
+from src.game.sqlite_store import SQLiteStore
+
+
+class ScoreBoardTest(unittest.TestCase):
+    def setUp(self):
+        anterior = SQLiteStore.activo
+        SQLiteStore.activo = None
+        self.addCleanup(setattr, SQLiteStore, "activo", anterior)
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.directorio = Path(carpeta.name)
+
+    def _puntajes(self, tablero, **filtro):
+        return [(e["player_name"], e["puntaje_final"]) for e in tablero.top(**filtro)]
+
+    def test_empates_queda_primero_el_mas_antiguo(self):
+        tablero = ScoreBoard(self.directorio, k=3)
+        for nombre, puntaje in (("Ana", 50), ("Beto", 80), ("Caro", 50), ("Dani", 50)):
+            tablero.registrar(nombre, puntaje)
+        # Heap lleno: el empate con el último lugar no desplaza a la entrada más antigua
+        self.assertEqual(self._puntajes(tablero), [("Beto", 80), ("Ana", 50), ("Caro", 50)])
+
+    def test_k_mayor_que_las_entradas(self):
+        tablero = ScoreBoard(self.directorio, k=10)
+        for nombre, puntaje in (("Ana", 10), ("Beto", 30), ("Caro", 20)):
+            tablero.registrar(nombre, puntaje)
+        self.assertEqual(self._puntajes(tablero), [("Beto", 30), ("Caro", 20), ("Ana", 10)])
+        self.assertEqual(self._puntajes(tablero, n=2), [("Beto", 30), ("Caro", 20)])
+        self.assertEqual(tablero.top(ciudad="OtraCity"), [])
+
+    def test_se_queda_con_los_k_mejores(self):
+        tablero = ScoreBoard(self.directorio, k=5)
+        puntajes = [37, 5, 91, 12, 64, 28, 77, 3, 50, 91, 18]
+        for i, puntaje in enumerate(puntajes):
+            tablero.registrar(f"J{i}", puntaje)
+        self.assertEqual([p for _, p in self._puntajes(tablero)], sorted(puntajes, reverse=True)[:5])
+
+    def test_tableros_por_ciudad_y_dificultad(self):
+        tablero = ScoreBoard(self.directorio, k=5)
+        tablero.registrar("Ana", 10, "TigerCity", "easy")
+        tablero.registrar("Beto", 20, "TigerCity", "hard")
+        tablero.registrar("Caro", 30, "LionCity", "hard")
+        self.assertEqual(self._puntajes(tablero, ciudad="TigerCity"), [("Beto", 20), ("Ana", 10)])
+        self.assertEqual(self._puntajes(tablero, dificultad="hard"), [("Caro", 30), ("Beto", 20)])
+        self.assertEqual(self._puntajes(tablero, ciudad="TigerCity", dificultad="easy"), [("Ana", 10)])
+        self.assertEqual(tablero.tableros()[0], (None, None))
+
+    def test_indice_atrasado_o_borrado_se_reconstruye(self):
+        tablero = ScoreBoard(self.directorio, k=3)
+        tablero.registrar("Ana", 10)
+        tablero.registrar("Beto", 20)
+        # Otra instancia agrega al log sin que la primera lo vea; luego se borra el índice
+        ScoreBoard(self.directorio, k=3).registrar("Caro", 30)
+        esperado = [("Caro", 30), ("Beto", 20), ("Ana", 10)]
+        self.assertEqual(self._puntajes(ScoreBoard(self.directorio, k=3)), esperado)
+        (self.directorio / ScoreBoard.INDEX_FILE).unlink()
+        self.assertEqual(self._puntajes(ScoreBoard(self.directorio, k=3)), esperado)
+
+    def test_guardado_desde_la_pausa_no_entra_al_tablero(self):
+        scores = self.directorio / "saveScores.json"
+        with mock.patch.object(save, "SAVE_DIR", self.directorio), mock.patch.object(save, "SAVE_SCORES", scores):
+            Save(player_name="Ana", score=40).save_score_only_global()
+            Save(player_name="Ana", score=70).save_score_only_global()
+            Save(player_name="Beto", score=15).save_score_only_global()
+            self.assertEqual(Save.load_from_file(), [])
+        with open(scores, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"Ana": 70, "Beto": 15})
+        self.assertEqual(ScoreBoard(self.directorio).top(), [])
+        self.assertFalse((self.directorio / ScoreBoard.LOG_FILE).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import unittest
+from collections import deque
+
+from src.game.undo import UndoSystem
+from tests.partidas import jugador_falso
+
+
+def _mover(jugador, rng):
+    # Cambia algunos campos y deja otros igual, para que haya deltas de distinto tamaño
+    if rng.random() < 0.7:
+        jugador.x += rng.choice((-20, 20))
+    if rng.random() < 0.5:
+        jugador.y += rng.choice((-20, 20))
+    if rng.random() < 0.3:
+        jugador.direccion = rng.choice(("up", "down", "izq", "der"))
+    if rng.random() < 0.4:
+        jugador.stats.resistencia = round(rng.uniform(0, 100), 1)
+    if rng.random() < 0.1:
+        jugador.reputation.valor = rng.randint(0, 100)
+    if rng.random() < 0.1:
+        jugador.peso_total = float(rng.randint(0, 5))
+
+
+def _foto(jugador):
+    return (jugador.x, jugador.y, jugador.direccion, jugador.stats.resistencia,
+            jugador.reputation.valor, jugador.peso_total)
+
+
+class UndoContraPilaDeReferenciaTest(unittest.TestCase):
+    """Guardados y deshacer al azar, comparados con una pila de estados completos"""
+
+    def _recorrer(self, capacidad, keyframe_interval, semilla, pasos=400):
+        rng = random.Random(semilla)
+        undo = UndoSystem(max_undo_steps=capacidad, keyframe_interval=keyframe_interval)
+        referencia = deque(maxlen=capacidad)
+        jugador = jugador_falso()
+        tiempo = 0
+        for _ in range(pasos):
+            if rng.random() < 0.6:
+                _mover(jugador, rng)
+                tiempo += 1
+                undo.save_state(jugador, tiempo, [f"P{tiempo % 3}"])
+                if capacidad > 0:
+                    referencia.append((_foto(jugador), tiempo, [f"P{tiempo % 3}"]))
+            else:
+                # A veces varios seguidos, como undo_n_moves
+                for _ in range(rng.choice((1, 1, 2, 5))):
+                    estado = undo.undo_last_move(jugador)
+                    if not referencia:
+                        self.assertIsNone(estado)
+                        continue
+                    foto, t, pedidos = referencia.pop()
+                    self.assertEqual(_foto(jugador), foto)
+                    self.assertEqual((estado.tiempo_actual, estado.pedidos_activos_ids), (t, pedidos))
+                    self.assertEqual((estado.player_tile_x, estado.player_tile_y),
+                                     (int(foto[0] // 20), int(foto[1] // 20)))
+            self.assertEqual(undo.get_undo_count(), len(referencia))
+            self.assertEqual(undo.can_undo(), bool(referencia))
+
+    def test_combinaciones_de_capacidad_y_keyframes(self):
+        for capacidad in (0, 1, 2, 3, 5, 20):
+            for keyframe_interval in (1, 2, 3, 7, 32):
+                for semilla in range(3):
+                    with self.subTest(capacidad=capacidad, keyframe_interval=keyframe_interval, semilla=semilla):
+                        self._recorrer(capacidad, keyframe_interval, semilla)
+
+    def test_historial_lleno_solo_guarda_deltas_entre_keyframes(self):
+        undo = UndoSystem(max_undo_steps=10, keyframe_interval=4)
+        jugador = jugador_falso()
+        for t in range(25):
+            jugador.x += 20
+            undo.save_state(jugador, t)
+        keyframes = [es_keyframe for es_keyframe, _ in undo.states_stack]
+        self.assertTrue(keyframes[0])  # Lo más antiguo siempre se puede reconstruir
+        # Nunca hay más de keyframe_interval - 1 deltas seguidos
+        seguidos = 0
+        for es_keyframe in keyframes:
+            seguidos = 0 if es_keyframe else seguidos + 1
+            self.assertLess(seguidos, 4)
+        for _, datos in undo.states_stack:
+            if isinstance(datos, dict):
+                self.assertNotIn("resistencia", datos)  # Solo los campos que cambiaron
+
+    def test_undo_n_moves(self):
+        undo = UndoSystem(max_undo_steps=5, keyframe_interval=2)
+        jugador = jugador_falso()
+        for t in range(8):
+            jugador.x = 20.0 * t
+            undo.save_state(jugador, t)
+        estado = undo.undo_n_moves(jugador, 3)
+        self.assertEqual(estado.player_x, 100.0)
+        self.assertEqual(undo.get_undo_count(), 2)
+        self.assertEqual(undo.undo_n_moves(jugador, 10).player_x, 60.0)
+        self.assertIsNone(undo.undo_n_moves(jugador, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+from src.api.ManejadorAPI import ManejadorAPI
+
+_CUERPOS = {
+    "/city/weather": {"data": {"city": "TigerCity", "initial": {"condition": "clear", "intensity": 0.0},
+                               "conditions": [], "transition": {}}},
+    "/city/jobs": {"data": [{"id": "J1", "pickup": [1, 1], "dropoff": [2, 2], "payout": 100, "deadline": "",
+                             "weight": 1, "priority": 0, "release_time": 0}]},
+    "/city/map": {"data": {"version": "1", "city_name": "TigerCity", "width": 2, "height": 1, "goal": 100,
+                           "max_time": 600, "tiles": [["C", "C"]],
+                           "legend": {"C": {"name": "calle", "surface_weight": 1.0}}}},
+}
+
+
+class _ServidorLento(BaseHTTPRequestHandler):
+    """Stub de la API: cada endpoint tarda `latencias[ruta]` segundos en responder"""
+
+    latencias = {}
+
+    def do_GET(self):
+        ruta = self.path.split("?")[0]
+        time.sleep(self.latencias.get(ruta, 0.0))
+        cuerpo = json.dumps(_CUERPOS[ruta]).encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # El cliente ya se fue por timeout
+
+    def log_message(self, *args):
+        pass
+
+
+class UpdateDataConcurrenteTest(unittest.TestCase):
+    LATENCIA = 0.4
+
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorLento)
+        self.servidor.daemon_threads = True
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.addCleanup(self.servidor.server_close)
+        self.addCleanup(self.servidor.shutdown)
+        _ServidorLento.latencias = dict.fromkeys(_CUERPOS, self.LATENCIA)
+
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.api = ManejadorAPI(cache_dir=self.cache_dir, ttl=0, reintentos=0)
+        self.api.BASE_URL = f"http://127.0.0.1:{self.servidor.server_port}"
+        self.addCleanup(ManejadorAPI._circuitos.pop, self.api.BASE_URL, None)
+
+    def _medir(self, concurrente: bool) -> float:
+        inicio = time.perf_counter()
+        self.api.update_data(concurrente=concurrente, forzar=True)
+        return time.perf_counter() - inicio
+
+    def test_tarda_lo_de_la_mas_lenta_y_no_la_suma(self):
+        _ServidorLento.latencias["/city/map"] = 2 * self.LATENCIA
+        transcurrido = self._medir(concurrente=True)
+        self.assertGreaterEqual(transcurrido, 2 * self.LATENCIA)
+        self.assertLess(transcurrido, 3 * self.LATENCIA)  # La suma sería 4 * LATENCIA
+        for archivo in ("TigerCity_weather.json", "jobs.json", "map.json"):
+            self.assertTrue((self.cache_dir / archivo).exists(), archivo)
+
+    def test_secuencial_suma_las_latencias(self):
+        self.assertGreaterEqual(self._medir(concurrente=False), 3 * self.LATENCIA)
+
+    def test_endpoint_lento_vence_su_timeout_sin_perder_los_demas(self):
+        _ServidorLento.latencias["/city/jobs"] = 5.0
+        self.api.TIMEOUTS = {**ManejadorAPI.TIMEOUTS, "jobs": (1.0, 2 * self.LATENCIA)}
+        inicio = time.perf_counter()
+        with self.assertRaises(requests.Timeout):
+            self.api.update_data(concurrente=True, forzar=True)
+        self.assertLess(time.perf_counter() - inicio, 5.0)
+        self.assertTrue((self.cache_dir / "TigerCity_weather.json").exists())
+        self.assertTrue((self.cache_dir / "map.json").exists())
+        self.assertFalse((self.cache_dir / "jobs.json").exists())
+
+
+class ObtenerCierraLaRespuestaTest(unittest.TestCase):
+    def _respuesta(self, status: int) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.url = f"{ManejadorAPI.BASE_URL}/city/jobs"
+        response.raw = io.BytesIO(b'{"error": "no"}')
+        return response
+
+    def test_error_http_cierra_la_respuesta_en_stream(self):
+        api = ManejadorAPI(cache_dir=tempfile.mkdtemp(), ttl=0, reintentos=0)
+        self.addCleanup(ManejadorAPI._circuitos.pop, api.BASE_URL, None)
+        for status in (404, 503):
+            with self.subTest(status=status):
+                response = self._respuesta(status)
+                with mock.patch.object(api.session, "get", return_value=response), \
+                        mock.patch.object(response, "close", wraps=response.close) as close:
+                    with self.assertRaises(requests.HTTPError):
+                        api.get_jobs()
+                close.assert_called()
+                self.assertTrue(response.raw.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()